@@ -0,0 +1,223 @@
+"""Benchmark da geração completa com catálogos sintéticos de tamanho configurável.
+
+Cria, para cada tamanho, uma pasta de trabalho com produtos.xlsx, img_produtos/
+e o logo, roda `python -m gerador_catalogo` nela e acrescenta o resultado em
+benchmarks/resultados.jsonl (com o commit atual), comparando com a última
+medição de mesmos parâmetros feita em outro commit.
+
+Uso (na raiz do repositório):
+    python -m benchmarks.bench_catalogo --produtos 1000 10000 50000 --faltantes 0.1
+    python -m benchmarks.bench_catalogo --produtos 1000 10000 50000 --streaming
+"""
+import argparse
+import json
+import os
+import random
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+import pandas as pd
+from PIL import Image, ImageDraw
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+RESULTADOS = os.path.join(RAIZ, "benchmarks", "resultados.jsonl")
+
+CATEGORIAS = [
+    "Acessórios", "Bagageiros", "Câmaras", "Correntes", "Cubos", "Freios", "Guidões", "Iluminação",
+    "Pedais", "Pneus", "Quadros", "Raios", "Rodas", "Selins", "Suspensão", "Transmissão",
+]
+PALAVRAS = [
+    "ALAVANCA", "DUPLA", "SUNRACE", "SHIMANO", "ARO", "29", "26", "AÇO", "ALUMÍNIO", "PRETO", "VERMELHO",
+    "KIT", "CABO", "CONDUÍTE", "PASTILHA", "DISCO", "HIDRÁULICO", "CASSETE", "11V", "12V", "CORRENTE",
+    "PNEU", "CÂMARA", "VÁLVULA", "PRESTA", "SCHRADER", "SELIM", "GEL", "CANOTE", "MESA", "GUIDÃO",
+]
+
+
+def codigo_sintetico(i):
+    return f"{i // 10000:02d}.{i % 10000:04d}"
+
+
+def gerar_planilha(caminho, quantidade, aleatorio):
+    """Planilha com as colunas reais; cerca de um terço dos produtos sem preço promocional."""
+    linhas = []
+    for i in range(quantidade):
+        antigo = round(aleatorio.uniform(5, 2500), 2)
+        promocao = round(antigo * aleatorio.uniform(0.5, 0.95), 2) if aleatorio.random() < 0.66 else None
+        linhas.append({
+            "Código do Produto": codigo_sintetico(i),
+            "Descrição": " ".join(aleatorio.choices(PALAVRAS, k=aleatorio.randint(3, 14))),
+            "Categoria": aleatorio.choice(CATEGORIAS),
+            "Preço Antigo": antigo,
+            "Preço Promoção": promocao,
+        })
+    pd.DataFrame(linhas).to_excel(caminho, index=False)
+
+
+def gerar_imagens(pasta, quantidade, distintas, faltantes, tamanho, formatos, aleatorio):
+    """Uma imagem por código (menos a fração faltante), reaproveitando `distintas` conteúdos.
+
+    Cada código ganha seu próprio arquivo (hard link quando possível), então o
+    índice, o hash e o manifesto trabalham como com fotos reais; só a decodificação
+    e a redução ficam limitadas aos conteúdos distintos.
+    """
+    os.makedirs(pasta, exist_ok=True)
+    modelos = []
+    for n in range(min(distintas, quantidade)):
+        formato = formatos[n % len(formatos)]
+        img = Image.new("RGB", tamanho, tuple(aleatorio.randrange(256) for _ in range(3)))
+        desenho = ImageDraw.Draw(img)
+        for _ in range(12):
+            x0, y0 = aleatorio.randrange(tamanho[0]), aleatorio.randrange(tamanho[1])
+            desenho.ellipse((x0, y0, x0 + tamanho[0] // 4, y0 + tamanho[1] // 4),
+                            fill=tuple(aleatorio.randrange(256) for _ in range(3)))
+        if formato == "png":
+            img = img.convert("RGBA")
+        caminho = os.path.join(pasta, f".modelo_{n}.{formato}")
+        img.save(caminho)
+        modelos.append((caminho, formato))
+
+    criadas = 0
+    for i in range(quantidade):
+        if aleatorio.random() < faltantes:
+            continue
+        modelo, formato = modelos[i % len(modelos)]
+        destino = os.path.join(pasta, f"{codigo_sintetico(i)}.{formato}")
+        try:
+            os.link(modelo, destino)
+        except OSError:
+            shutil.copyfile(modelo, destino)
+        criadas += 1
+    for modelo, _ in modelos:
+        os.remove(modelo)
+    return criadas
+
+
+def commit_atual():
+    try:
+        commit = subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=RAIZ, capture_output=True,
+                                text=True, check=True).stdout.strip()
+        sujo = subprocess.run(["git", "status", "--porcelain", "--untracked-files=no"], cwd=RAIZ,
+                              capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "desconhecido"
+    return f"{commit}-sujo" if sujo else commit
+
+
+def rodar_gerador(pasta, variante, workers, extras=()):
+    """Roda o gerador na pasta de trabalho e devolve (segundos, relatório JSON)."""
+    relatorio = os.path.join(pasta, "relatorio.json")
+    comando = [sys.executable, "-m", "gerador_catalogo", "-v", variante, "--workers", str(workers),
+               "--relatorio", relatorio, *extras]
+    ambiente = dict(os.environ, PYTHONPATH=os.pathsep.join(filter(None, [RAIZ, os.environ.get("PYTHONPATH")])))
+    inicio = time.perf_counter()
+    subprocess.run(comando, cwd=pasta, env=ambiente, check=True, stdout=subprocess.DEVNULL)
+    segundos = time.perf_counter() - inicio
+    with open(relatorio, encoding="utf-8") as f:
+        return segundos, json.load(f)
+
+
+def resumir(parametros, rodada, segundos, relatorio):
+    variante = relatorio["variantes"][0]
+    paginas = variante["paginas"] or 0
+    etapas = dict(relatorio["etapas"], **variante["etapas"])
+    return {
+        "data": datetime.now().isoformat(timespec="seconds"),
+        "commit": commit_atual(),
+        "python": sys.version.split()[0],
+        **parametros,
+        "rodada": rodada,
+        "segundos": round(segundos, 3),
+        "produtos_por_s": round(parametros["produtos"] / segundos, 1),
+        "paginas_por_s": round(paginas / segundos, 2),
+        "paginas": paginas,
+        "pico_rss_mb": relatorio["memoria"]["pico_rss_mb"],
+        "pico_rss_processos_mb": relatorio["memoria"]["pico_rss_processos_mb"],
+        "pdf_bytes": variante.get("bytes"),
+        "etapas_s": {nome: round(etapa["parede_s"], 3) for nome, etapa in etapas.items()},
+    }
+
+
+def anterior_comparavel(resultado):
+    """Última medição com os mesmos parâmetros feita em outro commit."""
+    chaves = ("produtos", "faltantes", "distintas", "tamanho", "formatos", "variante", "workers", "streaming",
+              "rodada")
+    try:
+        with open(RESULTADOS, encoding="utf-8") as f:
+            anteriores = [json.loads(linha) for linha in f if linha.strip()]
+    except FileNotFoundError:
+        return None
+    for registro in reversed(anteriores):
+        if registro.get("commit") != resultado["commit"] and all(registro.get(c) == resultado[c] for c in chaves):
+            return registro
+    return None
+
+
+def imprimir(resultado, anterior):
+    def variacao(campo):
+        if anterior is None or not anterior.get(campo):
+            return ""
+        return f" ({(resultado[campo] / anterior[campo] - 1) * 100:+.1f}% vs {anterior['commit']})"
+
+    print(f"  {resultado['rodada']}: {resultado['segundos']:.2f} s{variacao('segundos')}, "
+          f"{resultado['produtos_por_s']:.0f} produtos/s, {resultado['paginas_por_s']:.1f} páginas/s, "
+          f"pico {resultado['pico_rss_mb']:.0f} MB{variacao('pico_rss_mb')}, "
+          f"PDF {resultado['pdf_bytes'] / 1024 / 1024:.1f} MB{variacao('pdf_bytes')}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--produtos", type=int, nargs="+", default=[1000, 10000, 50000],
+                        help="Quantidades de produtos a medir.")
+    parser.add_argument("--faltantes", type=float, default=0.1, help="Fração de produtos sem imagem.")
+    parser.add_argument("--distintas", type=int, default=500,
+                        help="Quantos conteúdos de imagem diferentes gerar (o resto são cópias).")
+    parser.add_argument("--tamanho", default="1200x900", help="Tamanho das imagens sintéticas (LxA).")
+    parser.add_argument("--formatos", default="jpg,png,webp", help="Formatos das imagens, em rodízio.")
+    parser.add_argument("--variante", default="black", help="Variante do catálogo a gerar.")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--streaming", action="store_true",
+                        help="Gera no modo --streaming do gerador (planilha em blocos, páginas em lotes).")
+    parser.add_argument("--quente", action="store_true",
+                        help="Roda uma segunda vez na mesma pasta, com os caches já preenchidos.")
+    parser.add_argument("--semente", type=int, default=42)
+    parser.add_argument("--manter", action="store_true", help="Não apaga as pastas de trabalho.")
+    args = parser.parse_args()
+
+    tamanho = tuple(int(v) for v in args.tamanho.lower().split("x"))
+    formatos = [f.strip().lower() for f in args.formatos.split(",") if f.strip()]
+
+    for quantidade in args.produtos:
+        parametros = {"produtos": quantidade, "faltantes": args.faltantes, "distintas": args.distintas,
+                      "tamanho": args.tamanho, "formatos": ",".join(formatos), "variante": args.variante,
+                      "workers": args.workers, "streaming": args.streaming}
+        aleatorio = random.Random(args.semente)
+        pasta = tempfile.mkdtemp(prefix=f"bench_{quantidade}_")
+        try:
+            inicio = time.perf_counter()
+            gerar_planilha(os.path.join(pasta, "produtos.xlsx"), quantidade, aleatorio)
+            criadas = gerar_imagens(os.path.join(pasta, "img_produtos"), quantidade, args.distintas,
+                                    args.faltantes, tamanho, formatos, aleatorio)
+            shutil.copyfile(os.path.join(RAIZ, "logo_amaisciclo.png"), os.path.join(pasta, "logo_amaisciclo.png"))
+            print(f"{quantidade} produtos, {criadas} imagens sintéticas "
+                  f"(preparado em {time.perf_counter() - inicio:.1f} s, {pasta})")
+
+            rodadas = ["fria", "quente"] if args.quente else ["fria"]
+            for rodada in rodadas:
+                segundos, relatorio = rodar_gerador(pasta, args.variante, args.workers,
+                                                    ["--streaming"] if args.streaming else [])
+                resultado = resumir(parametros, rodada, segundos, relatorio)
+                imprimir(resultado, anterior_comparavel(resultado))
+                with open(RESULTADOS, "a", encoding="utf-8") as f:
+                    f.write(json.dumps(resultado, ensure_ascii=False) + "\n")
+        finally:
+            if not args.manter:
+                shutil.rmtree(pasta, ignore_errors=True)
+    print(f"Resultados acrescentados em {RESULTADOS}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,63 @@
+"""Micro-benchmark: custo por produto de percorrer a planilha com iterrows x registros.
+
+Uso (na raiz do repositório):
+    python -m benchmarks.bench_registros --repeticoes 50
+"""
+import argparse
+import time
+
+import pandas as pd
+
+from gerador_catalogo.dados import preparar_produtos
+
+
+def caminho_iterrows(df):
+    """O que o laço de desenho fazia antes: Series por linha, row.get e formatação por card."""
+    for _, row in df.iterrows():
+        codigo = str(row.get("Código do Produto", "")).strip()
+        descricao = " ".join(str(row.get("Descrição", "")).strip().split())
+        preco_antigo = row.get("Preço Antigo", "")
+        preco_promocional = row.get("Preço Promoção", "")
+        if preco_promocional:
+            if preco_antigo:
+                f"R$ {preco_antigo:,.2f}".replace(",", "X").replace(".", ",").replace("X", ".")
+            f"R$ {preco_promocional:,.2f}".replace(",", "X").replace(".", ",").replace("X", ".")
+        codigo, descricao
+
+
+def caminho_registros(df):
+    """O caminho atual: normalização por coluna e laço sobre tuplas."""
+    for produto in preparar_produtos(df):
+        produto.codigo, produto.descricao, produto.preco_antigo_txt, produto.preco_promocao_txt
+
+
+def medir(funcao, df, rodadas):
+    melhor = float("inf")
+    for _ in range(rodadas):
+        inicio = time.perf_counter()
+        funcao(df)
+        melhor = min(melhor, time.perf_counter() - inicio)
+    return melhor
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--planilha", default="produtos.xlsx")
+    parser.add_argument("--repeticoes", type=int, default=20, help="Quantas vezes a planilha é replicada.")
+    parser.add_argument("--rodadas", type=int, default=5, help="Rodadas por caminho; vale a melhor.")
+    args = parser.parse_args()
+
+    base = pd.read_excel(args.planilha, dtype={"Código do Produto": str})
+    df = pd.concat([base] * args.repeticoes, ignore_index=True)
+    linhas = len(df)
+
+    antes = medir(caminho_iterrows, df, args.rodadas)
+    depois = medir(caminho_registros, df, args.rodadas)
+    print(f"{linhas} linhas")
+    print(f"iterrows + row.get: {antes * 1e6 / linhas:8.2f} µs/linha ({antes:.3f} s)")
+    print(f"registros (tuplas): {depois * 1e6 / linhas:8.2f} µs/linha ({depois:.3f} s)")
+    print(f"ganho: {antes / depois:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1 @@
+"""Módulos compartilhados pelos geradores de catálogo da A+Ciclo."""
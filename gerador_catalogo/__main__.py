@@ -0,0 +1,4 @@
+from gerador_catalogo.cli import main
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+import json
+import os
+import re
+import unicodedata
+
+from gerador_catalogo.navegacao import destino_produto, destinos_por_nome
+
+# === CONFIGURAÇÕES DO ÍNDICE DE BUSCA ===
+# Gravado ao lado do PDF: catalogo_amaisciclo.pdf -> catalogo_amaisciclo_busca.json
+SUFIXO_BUSCA = "_busca.json"
+# Palavras menores que isto ("de", "e") não entram no índice, a não ser números
+TAMANHO_MINIMO_TERMO = 3
+
+
+def caminho_indice_busca(pdf_path):
+    """Caminho do índice de busca de um PDF."""
+    return os.path.splitext(pdf_path)[0] + SUFIXO_BUSCA
+
+
+def termos(texto):
+    """Palavras de busca do texto: minúsculas, sem acentos e sem repetição, na ordem em que aparecem."""
+    texto = unicodedata.normalize("NFKD", str(texto)).encode("ascii", "ignore").decode("ascii").lower()
+    palavras = re.findall(r"[a-z0-9]+", texto)
+    return list(dict.fromkeys(p for p in palavras if len(p) >= TAMANHO_MINIMO_TERMO or p.isdigit()))
+
+
+class IndiceBusca:
+    """Índice invertido do catálogo, montado das mesmas páginas do layout que o PDF.
+
+    Cada código leva à página, à categoria e ao destino nomeado do card
+    (catalogo.pdf#nameddest=produto-01.0005); cada palavra das descrições leva
+    aos códigos que a têm. Com --dividir os produtos também dizem o arquivo.
+    """
+
+    def __init__(self):
+        self.produtos = {}
+        self.termos = {}
+        self.sumario = []
+
+    def adicionar(self, paginas_conteudo, navegacao, arquivo=None):
+        """Inclui as páginas (de agrupar_por_pagina) e o sumário da navegação do mesmo PDF."""
+        extra = {"arquivo": arquivo} if arquivo is not None else {}
+        for pagina, _, itens in paginas_conteudo:
+            for _, produto in itens:
+                if produto.codigo in self.produtos:
+                    continue
+                self.produtos[produto.codigo] = {"descricao": produto.descricao, "categoria": produto.categoria,
+                                                 "pagina": pagina, "destino": destino_produto(produto.codigo), **extra}
+                for termo in termos(produto.descricao):
+                    self.termos.setdefault(termo, []).append(produto.codigo)
+        destinos = destinos_por_nome(navegacao)
+        self.sumario += [{"titulo": entrada.titulo, "nivel": entrada.nivel, "pagina": destinos[entrada.destino].pagina,
+                          "destino": entrada.destino, **extra} for entrada in navegacao.sumario]
+
+    def gravar(self, caminho, pdf_path, paginas):
+        """Grava o índice em JSON (gravação atômica, o site pode estar lendo o anterior)."""
+        dados = {
+            "pdf": os.path.basename(pdf_path),
+            "paginas": paginas,
+            "sumario": self.sumario,
+            "produtos": self.produtos,
+            "termos": dict(sorted(self.termos.items())),
+        }
+        temporario = f"{caminho}.{os.getpid()}.tmp"
+        with open(temporario, "w", encoding="utf-8") as f:
+            json.dump(dados, f, ensure_ascii=False, separators=(",", ":"))
+        os.replace(temporario, caminho)
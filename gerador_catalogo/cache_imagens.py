@@ -0,0 +1,157 @@
+import hashlib
+import json
+import math
+import os
+
+from PIL import Image
+
+from gerador_catalogo.configuracao import DPI_PADRAO, QUALIDADE_JPEG
+
+# === CONFIGURAÇÕES DO CACHE DE DERIVADAS ===
+CACHE_DIR = ".cache_imagens"
+# Miniaturas das grades densas (gerador_catalogo.configuracao.DENSIDADES): consulta rápida, não impressão
+DPI_MINIATURA = 120
+MANIFESTO = "manifesto.json"
+# Originais que não puderam ser lidos, para não tentar de novo enquanto não mudarem
+INVALIDAS = "invalidas.json"
+
+
+def hash_arquivo(caminho, bloco=1024 * 1024):
+    """Calcula o SHA-1 do conteúdo do arquivo, lendo em blocos."""
+    h = hashlib.sha1()
+    with open(caminho, "rb") as f:
+        for parte in iter(lambda: f.read(bloco), b""):
+            h.update(parte)
+    return h.hexdigest()
+
+
+def pixels_para(largura_pt, altura_pt, dpi):
+    """Converte a área do card (em pontos) para o tamanho máximo em pixels no DPI alvo."""
+    return max(1, math.ceil(largura_pt / 72 * dpi)), max(1, math.ceil(altura_pt / 72 * dpi))
+
+
+def gerar_derivada(origem, destino, largura_px, altura_px, qualidade=QUALIDADE_JPEG):
+    """Reduz a imagem para caber em largura_px x altura_px e grava como JPEG."""
+    with Image.open(origem) as img:
+        # Em JPEG o draft deixa o decodificador já reduzir a escala, bem mais barato
+        img.draft("RGB", (largura_px, altura_px))
+        if img.mode in ("RGBA", "LA") or (img.mode == "P" and "transparency" in img.info):
+            # O card tem fundo branco, então a transparência vira branco
+            img = img.convert("RGBA")
+            fundo = Image.new("RGB", img.size, (255, 255, 255))
+            fundo.paste(img, mask=img.getchannel("A"))
+            img = fundo
+        elif img.mode.startswith("I;16"):
+            # Tons de cinza de 16 bits: o convert direto satura tudo acima de 255 em branco
+            img = img.convert("I").point(lambda v: v * (1 / 256)).convert("RGB")
+        elif img.mode != "RGB":
+            img = img.convert("RGB")
+        img.thumbnail((largura_px, altura_px), Image.LANCZOS)
+
+        temporario = f"{destino}.{os.getpid()}.tmp"
+        img.save(temporario, "JPEG", quality=qualidade, optimize=True)
+    os.replace(temporario, destino)
+
+
+def registro_origem(caminho, registro=None):
+    """Retorna [mtime_ns, tamanho, sha1] do original, reaproveitando o registro se o arquivo não mudou."""
+    info = os.stat(caminho)
+    if registro and registro[0] == info.st_mtime_ns and registro[1] == info.st_size:
+        return registro
+    return [info.st_mtime_ns, info.st_size, hash_arquivo(caminho)]
+
+
+def derivar_imagem(caminho, registro, cache_dir, largura_px, altura_px, qualidade=QUALIDADE_JPEG):
+    """Garante a derivada no cache e retorna (registro do original, caminho da derivada, se foi gerada agora).
+
+    Não depende de estado do processo, por isso pode rodar em processos de trabalho.
+    """
+    registro = registro_origem(caminho, registro)
+    destino = os.path.join(cache_dir, f"{registro[2]}_{largura_px}x{altura_px}_q{qualidade}.jpg")
+    if os.path.exists(destino):
+        return registro, destino, False
+    gerar_derivada(caminho, destino, largura_px, altura_px, qualidade)
+    return registro, destino, True
+
+
+class CacheDerivadas:
+    """Cache em disco das imagens reduzidas para o tamanho do card.
+
+    A derivada é identificada pelo hash do conteúdo da imagem original e pelo
+    tamanho alvo; o manifesto guarda o mtime e o tamanho de cada original para
+    que o hash só seja recalculado quando o arquivo mudar. Os originais que
+    falharam ficam registrados do mesmo jeito e só são tentados de novo quando
+    o arquivo for trocado.
+    """
+
+    def __init__(self, cache_dir=CACHE_DIR, dpi=DPI_PADRAO, qualidade=QUALIDADE_JPEG):
+        self.cache_dir = cache_dir
+        self.dpi = dpi
+        self.qualidade = qualidade
+        self.caminho_manifesto = os.path.join(cache_dir, MANIFESTO)
+        self.caminho_invalidas = os.path.join(cache_dir, INVALIDAS)
+        os.makedirs(cache_dir, exist_ok=True)
+        self.manifesto = self._ler(self.caminho_manifesto)
+        self.invalidas = self._ler(self.caminho_invalidas)
+        self.geradas = 0
+        self.reaproveitadas = 0
+
+    @staticmethod
+    def _ler(caminho):
+        try:
+            with open(caminho, encoding="utf-8") as f:
+                return json.load(f)
+        except (FileNotFoundError, ValueError):
+            return {}
+
+    @staticmethod
+    def _gravar(caminho, dados):
+        # Vários processos (servidor, trechos) podem gravar ao mesmo tempo
+        temporario = f"{caminho}.{os.getpid()}.tmp"
+        with open(temporario, "w", encoding="utf-8") as f:
+            json.dump(dados, f)
+        os.replace(temporario, caminho)
+
+    def falha_conhecida(self, caminho):
+        """Erro registrado para o original, se ele não mudou desde a falha; senão None."""
+        registro = self.invalidas.get(caminho)
+        if registro is None:
+            return None
+        try:
+            info = os.stat(caminho)
+        except OSError:
+            return None
+        if registro[0] == info.st_mtime_ns and registro[1] == info.st_size:
+            return registro[2]
+        return None
+
+    def registrar_falha(self, caminho, erro):
+        """Guarda a falha do original junto com o mtime e o tamanho do arquivo."""
+        try:
+            info = os.stat(caminho)
+        except OSError:
+            return
+        self.invalidas[caminho] = [info.st_mtime_ns, info.st_size, erro]
+        self.manifesto.pop(caminho, None)
+
+    def registrar(self, caminho, registro, gerada):
+        """Atualiza o manifesto e os contadores com o resultado de derivar_imagem."""
+        self.manifesto[caminho] = registro
+        self.invalidas.pop(caminho, None)
+        if gerada:
+            self.geradas += 1
+        else:
+            self.reaproveitadas += 1
+
+    def derivar(self, caminho, largura_pt, altura_pt):
+        """Retorna o caminho da derivada da imagem para a área informada, gerando se necessário."""
+        largura_px, altura_px = pixels_para(largura_pt, altura_pt, self.dpi)
+        registro, destino, gerada = derivar_imagem(caminho, self.manifesto.get(caminho), self.cache_dir,
+                                                   largura_px, altura_px, self.qualidade)
+        self.registrar(caminho, registro, gerada)
+        return destino
+
+    def salvar(self):
+        """Grava o manifesto de hashes e as falhas conhecidas no diretório do cache."""
+        self._gravar(self.caminho_manifesto, self.manifesto)
+        self._gravar(self.caminho_invalidas, self.invalidas)
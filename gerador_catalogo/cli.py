@@ -0,0 +1,170 @@
+import argparse
+import os
+import sys
+from datetime import date
+
+from gerador_catalogo.configuracao import (DENSIDADE_PADRAO, DENSIDADES, DPI_COMPACTO, DPI_PADRAO, ENDERECO,
+                                           OPCOES_COMPACTAS, OPCOES_PADRAO, PORTA, QUALIDADE_COMPACTA, QUALIDADE_JPEG,
+                                           VARIANTES, dpi_e_qualidade, excel_path, variante_na_densidade)
+from gerador_catalogo.incremental import ConstrucaoIncremental, impressao_variante, versao_incremental
+
+# Este módulo só importa o que é leve (configuracao, incremental): a geração em si
+# fica em gerador_catalogo.execucao, carregada depois de saber que há o que gerar
+
+
+def perguntar_variante():
+    """Pergunta no terminal o modo de organização do catálogo padrão (o antigo menu do catalogo.py)."""
+    while True:
+        print("\n------------------------------------------------------")
+        print("Selecione o modo de organização do Catálogo:")
+        print("  [C] - Por Categoria (Com Índice de Categorias)")
+        print("  [A] - Alfabética (Geral, sem Índice)")
+        escolha = input("Digite C ou A: ").strip().upper()
+        print("------------------------------------------------------")
+        if escolha in ['C', 'A']:
+            return "categoria" if escolha == 'C' else "alfabetica"
+        print("Opção inválida. Por favor, digite C para Categoria ou A para Alfabética.")
+
+
+def nada_mudou(args, variantes):
+    """Geração incremental em que nenhuma variante mudou: avisa como a geração e retorna True.
+
+    Olha só os manifestos e a data e o tamanho das entradas, com as mesmas chaves
+    de gerar_variante (as opções do reportlab são as que configurar_compactacao
+    aplicaria), sem importar pandas nem o desenho.
+    """
+    versao = versao_incremental(OPCOES_COMPACTAS if args.compacto else OPCOES_PADRAO,
+                                *dpi_e_qualidade(args.compacto, args.dpi, args.qualidade_jpeg))
+    data_geracao = date.today().isoformat()
+    pdfs = []
+    for variante in variantes:
+        pdf_path = os.path.join(args.saida, variante.pdf_path)
+        impressao = impressao_variante(variante, args.planilha, versao, data_geracao,
+                                       args.desconto_minimo, args.ordenar_desconto)
+        if not ConstrucaoIncremental(pdf_path, impressao).nada_mudou():
+            return False
+        pdfs.append((variante, pdf_path))
+    for variante, pdf_path in pdfs:
+        print(f"\n=== Catálogo '{variante.nome}' ===")
+        print(f"✅ Nada mudou desde a última geração: {pdf_path}")
+    return True
+
+
+def main(argv=None, padrao=tuple(VARIANTES), perguntar=False):
+    """Gera uma ou mais variantes do catálogo em um só processo.
+
+    padrao são as variantes geradas quando nenhuma --variante é informada; com
+    perguntar, e só em um terminal interativo, o modo é perguntado como antes.
+    """
+    parser = argparse.ArgumentParser(description="Gera os catálogos em PDF a partir da planilha de produtos.")
+    parser.add_argument("-v", "--variante", action="append", choices=list(VARIANTES),
+                        help=f"Catálogo a gerar; pode ser repetido (padrão: {', '.join(padrao)}).")
+    parser.add_argument("--saida", default=".",
+                        help="Pasta onde os PDFs são gravados (padrão: a pasta atual).")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1,
+                        help="Processos usados no pré-processamento das imagens (padrão: número de núcleos).")
+    parser.add_argument("--paginas", action="store_true",
+                        help="Só calcula a paginação e mostra as páginas de cada grupo, sem gerar o PDF.")
+    parser.add_argument("--incremental", action="store_true",
+                        help="Redesenha só as páginas que mudaram desde a última geração.")
+    parser.add_argument("--trechos", metavar="MODO",
+                        help="Desenha as páginas em paralelo (com --workers processos), em trechos: "
+                             "'categoria' ou o número de páginas por trecho.")
+    parser.add_argument("--observar", action="store_true",
+                        help="Fica rodando e regera o catálogo (de forma incremental) a cada alteração "
+                             "na planilha ou na pasta de imagens, com tudo já carregado na memória.")
+    parser.add_argument("--servir", metavar="PORTA", type=int, nargs="?", const=PORTA,
+                        help=f"Sobe um servidor HTTP local (porta padrão: {PORTA}) que gera sob demanda "
+                             "/catalog.pdf, /category/<nome>.pdf e /product/<código>, com cache dos PDFs.")
+    parser.add_argument("--endereco", default=ENDERECO,
+                        help=f"Endereço em que o servidor escuta (padrão: {ENDERECO}; use 0.0.0.0 para a rede local).")
+    parser.add_argument("--dividir", action="store_true",
+                        help="Nas variantes por categoria, grava um PDF por categoria (em paralelo, com "
+                             "--workers processos) e um PDF mestre leve com a capa e o índice com links para eles.")
+    parser.add_argument("--grade", choices=list(DENSIDADES), default=DENSIDADE_PADRAO,
+                        help=f"Cards por página, colunas x linhas (padrão: {DENSIDADE_PADRAO}). As grades densas são "
+                             "listas de preço de consulta rápida, com fotos em miniatura, gravadas em PDFs com a "
+                             "grade no nome (catalogo_amaisciclo_5x8.pdf).")
+    parser.add_argument("--planilha", default=excel_path,
+                        help=f"Planilha de produtos em .xlsx ou .csv (padrão: {excel_path}).")
+    parser.add_argument("--streaming", action="store_true",
+                        help="Lê a planilha bloco a bloco, sem DataFrame inteiro (cada bloco vira registros e é "
+                             "descartado), e grava as páginas no disco em lotes. O DataFrame e o PDF não ficam na "
+                             "memória, mas os registros, a paginação e as imagens preparadas de todos os "
+                             "produtos sim: a memória ainda cresce com o número de produtos.")
+    parser.add_argument("--desconto-minimo", metavar="PCT", type=float,
+                        help="Só inclui os produtos com pelo menos este desconto (%%) sobre o preço antigo.")
+    parser.add_argument("--ordenar-desconto", action="store_true",
+                        help="Ordena pelos maiores descontos (dentro de cada categoria, no modo por categoria).")
+    parser.add_argument("--compacto", action="store_true",
+                        help="PDF menor: streams binários em vez de ASCII85 e imagens a "
+                             f"{DPI_COMPACTO} DPI com qualidade JPEG {QUALIDADE_COMPACTA} (ajustáveis com --dpi e "
+                             "--qualidade-jpeg); mostra o tamanho de cada categoria com a compactação e, se já foi "
+                             "medido com --medir-sem-compactacao, sem ela.")
+    parser.add_argument("--medir-sem-compactacao", action="store_true",
+                        help="Com --compacto, desenha o catálogo também sem compactação para comparar os tamanhos "
+                             "(uma vez para cada planilha e conjunto de imagens; as próximas execuções reaproveitam "
+                             "a medição).")
+    parser.add_argument("--qualidade-jpeg", metavar="Q", type=int,
+                        help=f"Qualidade JPEG das imagens dos produtos, de 1 a 95 (padrão: {QUALIDADE_JPEG}; "
+                             f"{QUALIDADE_COMPACTA} com --compacto).")
+    parser.add_argument("--dpi", type=int,
+                        help=f"Resolução máxima das imagens dos produtos no card (padrão: {DPI_PADRAO}; "
+                             f"{DPI_COMPACTO} com --compacto).")
+    parser.add_argument("--linearizar", action="store_true",
+                        help="Lineariza o PDF final para exibir a primeira página antes do download terminar "
+                             "(precisa do pikepdf ou do qpdf).")
+    parser.add_argument("--cache-texto", action="store_true",
+                        help="Guarda em disco a quebra de linhas das descrições para as próximas execuções.")
+    parser.add_argument("--validar-imagens", metavar="ARQUIVO.csv|.json",
+                        help="Só valida todas as imagens da pasta em paralelo (falhas de leitura, dimensões "
+                             "excessivas, alfa desnecessário, modo de cor), já deixa as derivadas normalizadas "
+                             "no cache e grava o relatório em CSV ou JSON, sem gerar os PDFs.")
+    parser.add_argument("--relatorio", metavar="ARQUIVO.json",
+                        help="Grava um relatório em JSON: tempo e CPU por etapa, custo por imagem, "
+                             "pico de memória e tamanho de cada página.")
+    parser.add_argument("--profile", metavar="ARQUIVO.prof",
+                        help="Roda sob o cProfile e grava as estatísticas (só o processo principal; "
+                             "use --workers 1 para ver tudo).")
+    args = parser.parse_args(argv)
+    if args.trechos and args.incremental:
+        parser.error("use --incremental ou --trechos, não os dois")
+    if args.dividir and (args.trechos or args.incremental or args.observar):
+        parser.error("--dividir não combina com --trechos, --incremental nem --observar")
+    if args.observar and (args.trechos or args.paginas):
+        parser.error("--observar não combina com --trechos nem com --paginas")
+    if args.medir_sem_compactacao and not args.compacto:
+        parser.error("--medir-sem-compactacao só vale com --compacto")
+    if args.linearizar and (args.incremental or args.observar):
+        parser.error("--linearizar não combina com --incremental nem --observar")
+    if args.qualidade_jpeg is not None and not 1 <= args.qualidade_jpeg <= 95:
+        parser.error("--qualidade-jpeg deve estar entre 1 e 95")
+    if args.dpi is not None and args.dpi <= 0:
+        parser.error("--dpi deve ser maior que zero")
+    if args.trechos and args.trechos != "categoria" and not (args.trechos.isdigit() and int(args.trechos) > 0):
+        parser.error("--trechos deve ser 'categoria' ou um número de páginas maior que zero")
+
+    if args.servir is not None:
+        from gerador_catalogo.servidor import servir
+
+        servir(args.planilha, args.endereco, args.servir, args.workers)
+        return
+
+    if args.variante:
+        nomes = list(dict.fromkeys(args.variante))
+    elif perguntar and sys.stdin.isatty():
+        nomes = [perguntar_variante()]
+    else:
+        nomes = list(padrao)
+    variantes = [variante_na_densidade(VARIANTES[nome], args.grade) for nome in nomes]
+    os.makedirs(args.saida, exist_ok=True)
+
+    # Antes de carregar o resto do pacote: numa geração incremental em que nada mudou é só isso
+    if args.incremental and not (args.observar or args.validar_imagens) and nada_mudou(args, variantes):
+        return
+
+    # O resto do pacote só agora: pandas e o desenho do reportlab levam quase um
+    # segundo para carregar, mais que a geração incremental em que nada mudou
+    from gerador_catalogo.execucao import executar
+
+    executar(args, variantes)
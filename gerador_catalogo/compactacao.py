@@ -0,0 +1,152 @@
+import json
+import os
+import shutil
+import subprocess
+from contextlib import contextmanager
+
+from reportlab import rl_config
+
+from gerador_catalogo.configuracao import OPCOES_COMPACTAS, OPCOES_PADRAO
+from gerador_catalogo.instrumentacao import bytes_por_pagina
+
+try:
+    import pikepdf
+except ImportError:  # opcional: só a linearização usa (pip install pikepdf), com o qpdf como alternativa
+    pikepdf = None
+
+# === CONFIGURAÇÕES DO MODO COMPACTO ===
+# (DPI, qualidade e os valores das opções ficam em gerador_catalogo.configuracao)
+# Opções globais do reportlab que mudam os bytes gravados (e não o desenho)
+OPCOES_REPORTLAB = tuple(OPCOES_PADRAO)
+CAPA_E_INDICE = "Capa e índice"
+ESTRUTURA = "Fontes, catálogo e xref"
+# Tamanhos por categoria já medidos sem o modo compacto: PDF -> chave das entradas e tamanhos
+LINHA_DE_BASE = ".cache_tamanhos.json"
+
+
+def configurar_compactacao(ativo):
+    """Liga ou desliga o modo compacto do reportlab para todos os canvas criados depois.
+
+    As páginas já saem comprimidas (Flate), mas o reportlab ainda passa todo stream
+    (imagens, formulários e conteúdo) por ASCII85, que só serve para PDFs em texto
+    puro: são 25% a mais em cada JPEG embutido, além da CPU da codificação.
+    """
+    aplicar_opcoes_reportlab(OPCOES_COMPACTAS if ativo else OPCOES_PADRAO)
+
+
+def opcoes_reportlab():
+    """Valores atuais das OPCOES_REPORTLAB, para repassar aos processos e entrar nas chaves de cache."""
+    return {nome: getattr(rl_config, nome) for nome in OPCOES_REPORTLAB}
+
+
+def aplicar_opcoes_reportlab(opcoes):
+    """Inicializador dos processos de trabalho: as mesmas opções do processo principal."""
+    for nome, valor in opcoes.items():
+        setattr(rl_config, nome, valor)
+
+
+@contextmanager
+def opcoes_reportlab_temporarias(opcoes):
+    """Usa outras opções do reportlab só dentro do bloco (a medição sem compactação)."""
+    anteriores = opcoes_reportlab()
+    aplicar_opcoes_reportlab(opcoes)
+    try:
+        yield
+    finally:
+        aplicar_opcoes_reportlab(anteriores)
+
+
+def ler_linha_de_base(pdf_path, chave, caminho=LINHA_DE_BASE):
+    """Tamanhos sem compactação medidos antes para este PDF com as mesmas entradas (chave), ou None."""
+    try:
+        with open(caminho, encoding="utf-8") as f:
+            registro = json.load(f).get(os.path.abspath(pdf_path))
+    except (FileNotFoundError, ValueError):
+        return None
+    if registro is None or registro.get("chave") != chave:
+        return None
+    return registro["tamanhos"]
+
+
+def gravar_linha_de_base(pdf_path, chave, tamanhos, caminho=LINHA_DE_BASE):
+    """Guarda os tamanhos sem compactação do PDF; só a medição mais recente de cada PDF fica."""
+    try:
+        with open(caminho, encoding="utf-8") as f:
+            registros = json.load(f)
+    except (FileNotFoundError, ValueError):
+        registros = {}
+    registros[os.path.abspath(pdf_path)] = {"chave": chave, "tamanhos": tamanhos}
+    temporario = f"{caminho}.{os.getpid()}.tmp"
+    with open(temporario, "w", encoding="utf-8") as f:
+        json.dump(registros, f, ensure_ascii=False)
+    os.replace(temporario, caminho)
+
+
+def linearizar(pdf_path):
+    """Reescreve o PDF linearizado ("fast web view"), com a primeira página no início do arquivo.
+
+    Usa o pikepdf se estiver instalado, senão o qpdf da linha de comando. Retorna
+    False, sem mexer no arquivo, se nenhum dos dois estiver disponível.
+    """
+    temporario = f"{pdf_path}.{os.getpid()}.tmp"
+    if pikepdf is not None:
+        with pikepdf.open(pdf_path) as pdf:
+            pdf.save(temporario, linearize=True)
+    elif shutil.which("qpdf"):
+        # O qpdf sai com 3 quando só houve avisos
+        resultado = subprocess.run(["qpdf", "--linearize", pdf_path, temporario], capture_output=True, text=True)
+        if resultado.returncode not in (0, 3):
+            raise RuntimeError(f"qpdf falhou em {pdf_path}: {resultado.stderr.strip()}")
+    else:
+        return False
+    os.replace(temporario, pdf_path)
+    return True
+
+
+def tamanhos_por_grupo(pdf_path, layout):
+    """Bytes do PDF por categoria, pelas páginas de cada grupo no layout.
+
+    A capa e o índice (antes da primeira página de conteúdo) e o que não é de
+    nenhuma página (fontes, catálogo, xref) aparecem à parte. Retorna None se o PDF
+    não existe ou não tem as páginas do layout (outra planilha, por exemplo).
+    """
+    if not os.path.exists(pdf_path):
+        return None
+    por_pagina = bytes_por_pagina(pdf_path)
+    if len(por_pagina) != layout.ultima_pagina + 1:
+        return None
+    primeira_conteudo = min(layout.paginas_grupos.values(), default=len(por_pagina))
+    tamanhos = {CAPA_E_INDICE: sum(por_pagina[:primeira_conteudo])}
+    for nome, primeira in layout.paginas_grupos.items():
+        tamanhos[nome] = sum(por_pagina[primeira:primeira + layout.paginas_por_grupo[nome]])
+    tamanhos[ESTRUTURA] = os.path.getsize(pdf_path) - sum(por_pagina)
+    return tamanhos
+
+
+def tamanhos_arquivos(caminhos):
+    """Tamanho de cada arquivo existente: nome -> bytes (para os PDFs de --dividir)."""
+    return {nome: os.path.getsize(caminho) for nome, caminho in caminhos.items() if os.path.exists(caminho)}
+
+
+def _formatar(tamanho):
+    if tamanho is None:
+        return "-"
+    if tamanho >= 1024 * 1024:
+        return f"{tamanho / 1024 / 1024:.1f} MB"
+    return f"{tamanho / 1024:.0f} KB"
+
+
+def imprimir_tamanhos(antes, depois, titulo="sem compactação -> compacto"):
+    """Mostra o tamanho de cada categoria na linha de base (antes) e na saída gerada (depois)."""
+    antes = antes or {}
+    print(f"Tamanho por categoria ({titulo}):")
+    for nome, tamanho in depois.items():
+        linha = f"   {nome}: {_formatar(antes.get(nome))} -> {_formatar(tamanho)}"
+        if antes.get(nome):
+            linha += f" ({(tamanho - antes[nome]) / antes[nome]:+.0%})"
+        print(linha)
+    total_depois = sum(depois.values())
+    linha = f"   Total: {_formatar(sum(antes.values()) if antes else None)} -> {_formatar(total_depois)}"
+    if antes:
+        linha += f" ({(total_depois - sum(antes.values())) / sum(antes.values()):+.0%})"
+    print(linha)
@@ -0,0 +1,77 @@
+import os
+from collections import namedtuple
+
+from reportlab.lib.units import cm
+
+# O que a linha de comando (gerador_catalogo.cli) precisa antes de carregar o resto
+# do pacote: arquivos de entrada, variantes, grades e os padrões das opções. Nada
+# aqui importa pandas nem o desenho do reportlab, que levam quase um segundo, para
+# que a geração incremental em que nada mudou responda sem eles.
+
+# === CONFIGURAÇÕES GERAIS ===
+excel_path = "produtos.xlsx"
+logo_path = "logo_amaisciclo.png"
+img_dir = "img_produtos"
+
+# === IMAGENS E MODO COMPACTO ===
+DPI_PADRAO = 200
+QUALIDADE_JPEG = 85
+# Derivadas menores: 150 DPI ainda é nítido na tela e na impressão caseira do card
+DPI_COMPACTO = 150
+QUALIDADE_COMPACTA = 70
+# Opções globais do reportlab que mudam os bytes gravados (e não o desenho), fora e dentro do modo compacto.
+# A compressão Flate já é o padrão do reportlab; o ganho do modo compacto fora das
+# imagens é só tirar o ASCII85. As fontes são as Helvetica padrão do PDF, que não
+# são embutidas, então não há subconjunto de fonte a gerar.
+OPCOES_PADRAO = {"useA85": 1, "pageCompression": 1}
+OPCOES_COMPACTAS = {"useA85": 0, "pageCompression": 1}
+
+
+def dpi_e_qualidade(compacto, dpi=None, qualidade=None):
+    """DPI e qualidade JPEG das derivadas: os informados (--dpi, --qualidade-jpeg) ou os padrões do modo."""
+    if compacto:
+        return dpi or DPI_COMPACTO, qualidade or QUALIDADE_COMPACTA
+    return dpi or DPI_PADRAO, qualidade or QUALIDADE_JPEG
+
+
+# === SERVIDOR ===
+ENDERECO = "127.0.0.1"
+PORTA = 8000
+
+# === GRADES E VARIANTES ===
+# Densidade da grade de cards (colunas x linhas por página). A "3x4" é a de sempre;
+# as densas são listas de preço de consulta rápida: as medidas internas do card
+# (margens, botão, preços) são as da 3x4 vezes `escala`, as fontes vezes
+# `escala_texto`, e as fotos vêm das miniaturas, uma derivada própria de baixa
+# resolução. As linhas saem da altura do card (gerador_catalogo.layout).
+Densidade = namedtuple("Densidade", [
+    "colunas", "espacamento_horizontal", "altura_bloco", "intervalo_vertical", "altura_imagem",
+    "escala", "escala_texto", "miniatura",
+])
+
+DENSIDADES = {
+    "3x4": Densidade(3, 1 * cm, 5.5 * cm, 0.3 * cm, 3.5 * cm, 1.0, 1.0, False),
+    "4x6": Densidade(4, 0.6 * cm, 4.0 * cm, 0.25 * cm, 2.3 * cm, 0.75, 0.85, True),
+    "5x8": Densidade(5, 0.4 * cm, 3.0 * cm, 0.2 * cm, 1.6 * cm, 0.6, 0.75, True),
+}
+DENSIDADE_PADRAO = "3x4"
+
+# Um catálogo a gerar: tema (gerador_catalogo.temas), ordenação ('C' por categoria;
+# 'A' alfabética), PDF de saída, se tem a página de índice de categorias e a densidade
+# da grade de cards (DENSIDADES)
+Variante = namedtuple("Variante", ["nome", "tema", "tipo_ordenacao", "pdf_path", "indice", "densidade"],
+                      defaults=(DENSIDADE_PADRAO,))
+
+VARIANTES = {
+    "categoria": Variante("categoria", "padrao", "C", "catalogo_amaisciclo.pdf", True),
+    "alfabetica": Variante("alfabetica", "padrao", "A", "catalogo_amaisciclo_alfabetica.pdf", False),
+    "black": Variante("black", "black", "A", "catalogo_amaisciclo_bike_friday.pdf", False),
+}
+
+
+def variante_na_densidade(variante, densidade):
+    """A variante em outra grade de cards, gravada em um PDF próprio (catalogo_amaisciclo_5x8.pdf)."""
+    if densidade == variante.densidade:
+        return variante
+    nome, extensao = os.path.splitext(variante.pdf_path)
+    return variante._replace(densidade=densidade, pdf_path=f"{nome}_{densidade}{extensao}")
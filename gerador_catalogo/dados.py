@@ -0,0 +1,112 @@
+import math
+from collections import namedtuple
+from itertools import groupby
+
+import pandas as pd
+
+# Limite superior (em reais, pelo preço final) de cada faixa de preço; a última faixa não tem limite
+FAIXAS_PRECO = (50, 100, 250, 500, 1000)
+
+# Registro compacto de um produto, já normalizado para o desenho do card.
+# desconto é o percentual da promoção sobre o preço antigo (NaN sem promoção válida) e
+# faixa_preco o índice da faixa em FAIXAS_PRECO (-1 sem preço)
+Produto = namedtuple("Produto", [
+    "codigo", "descricao", "categoria",
+    "preco_antigo", "preco_promocao", "preco_antigo_txt", "preco_promocao_txt",
+    "desconto", "faixa_preco",
+])
+
+
+def _texto(df, coluna):
+    """Coluna como texto sem espaços nas pontas (vazia se a coluna não existir)."""
+    if coluna not in df.columns:
+        return pd.Series("", index=df.index)
+    return df[coluna].astype(str).str.strip()
+
+
+def _preco(df, coluna):
+    """Coluna numérica de preço (NaN onde vazia ou inválida)."""
+    if coluna not in df.columns:
+        return pd.Series(float("nan"), index=df.index)
+    return pd.to_numeric(df[coluna], errors="coerce")
+
+
+def formatar_brl(precos):
+    """Formata a coluna inteira como 'R$ 1.234,56'; vazio onde não há preço (NaN ou zero)."""
+    validos = precos.notna() & (precos != 0)
+    texto = pd.Series("", index=precos.index, dtype=object)
+    if validos.any():
+        numeros = precos[validos].map("{:,.2f}".format).str.translate(str.maketrans(",.", ".,"))
+        texto[validos] = "R$ " + numeros
+    return texto
+
+
+def calcular_precos(df):
+    """Etapa de preços, coluna a coluna sobre a planilha inteira.
+
+    Devolve um DataFrame com o mesmo índice: preços numéricos e formatados, o
+    desconto (%) de cada produto e a faixa de preço. Só há desconto quando a
+    promoção é positiva e menor que o preço antigo.
+    """
+    antigo = _preco(df, "Preço Antigo")
+    promocao = _preco(df, "Preço Promoção")
+    com_desconto = (antigo > 0) & (promocao > 0) & (promocao < antigo)
+    final = promocao.where(promocao > 0, antigo)
+    faixas = pd.cut(final, [0, *FAIXAS_PRECO, math.inf], labels=False)
+    return pd.DataFrame({
+        "preco_antigo": antigo,
+        "preco_promocao": promocao,
+        "preco_antigo_txt": formatar_brl(antigo),
+        "preco_promocao_txt": formatar_brl(promocao),
+        "desconto": ((1 - promocao / antigo) * 100).where(com_desconto),
+        "faixa_preco": faixas.fillna(-1).astype(int),
+    }, index=df.index)
+
+
+def preparar_produtos(df, precos=None):
+    """Normaliza a planilha coluna a coluna e devolve a lista de Produto na ordem do DataFrame.
+
+    precos é o resultado de calcular_precos, já na ordem de df; sem ele a etapa roda aqui.
+    """
+    if precos is None:
+        precos = calcular_precos(df)
+    codigos = _texto(df, "Código do Produto")
+    # Colapsa qualquer sequência de espaços/quebras de linha em um espaço só
+    descricoes = _texto(df, "Descrição").str.replace(r"\s+", " ", regex=True)
+    categorias = _texto(df, "Categoria")
+    return list(map(Produto._make, zip(
+        codigos, descricoes, categorias,
+        precos["preco_antigo"].tolist(), precos["preco_promocao"].tolist(),
+        precos["preco_antigo_txt"], precos["preco_promocao_txt"],
+        precos["desconto"].tolist(), precos["faixa_preco"].tolist(),
+    )))
+
+
+def chaves_ordenacao(df, precos, tipo_ordenacao, por_desconto=False):
+    """Chave de ordenação de cada linha, para ordenar os registros sem manter a planilha.
+
+    Mesmas colunas e mesmo resultado do sort_values da ordenação normal: vazios
+    por último e o desconto decrescente. Lista na ordem de df.
+    """
+    texto = 'Categoria' if tipo_ordenacao == 'C' else 'Descrição'
+    colunas = [df[texto], df['Código do Produto']]
+    if por_desconto:
+        colunas.insert(1 if tipo_ordenacao == 'C' else 0, -precos['desconto'])
+    partes = []
+    for coluna in colunas:
+        partes.append([(True, None) if nulo else (False, valor)
+                       for nulo, valor in zip(coluna.isna().tolist(), coluna.tolist())])
+    return list(zip(*partes))
+
+
+def desconto_maximo(produtos):
+    """Maior desconto entre os produtos, em % inteiro arredondado para baixo; None se nenhum tem promoção."""
+    descontos = [produto.desconto for produto in produtos if produto.desconto == produto.desconto]
+    return math.floor(round(max(descontos), 6)) if descontos else None
+
+
+def agrupar_produtos(produtos, por_categoria):
+    """Lista de (nome do grupo, produtos). Os produtos já devem estar ordenados por categoria."""
+    if not por_categoria:
+        return [("ALFABÉTICA GERAL", produtos)]
+    return [(categoria, list(itens)) for categoria, itens in groupby(produtos, key=lambda p: p.categoria)]
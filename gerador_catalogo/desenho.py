@@ -0,0 +1,415 @@
+import math
+from collections import namedtuple
+from datetime import date
+
+from reportlab.lib import colors
+from reportlab.lib.pagesizes import A4
+from reportlab.lib.styles import ParagraphStyle, getSampleStyleSheet
+from reportlab.lib.units import cm
+
+from gerador_catalogo.configuracao import DENSIDADE_PADRAO, DENSIDADES
+from gerador_catalogo.layout import Grade
+from gerador_catalogo.navegacao import destinos_categorias, link_destino
+from gerador_catalogo.temas import TEMAS
+from gerador_catalogo.texto import desenhar_centralizado, largura_texto, paragrafos
+from gerador_catalogo.xobjects import ImagensCompartilhadas
+
+# === CONFIGURAÇÕES GERAIS ===
+logo_path = "logo_amaisciclo.png"
+
+# Cores comuns a todos os temas
+COR_FUNDO_CARD = colors.white
+COR_TEXTO_CLARO = colors.white
+COR_FUNDO_CLARO = colors.Color(0.95, 0.97, 1.0)
+
+# === CONFIGURAÇÕES DE LAYOUT DO PRODUTO (BLOCO MENOR) ===
+largura, altura = A4
+
+ALTURA_RODAPE = 1.5 * cm
+ALTURA_CABECALHO = 1.5 * cm
+MARGEM_SUPERIOR = ALTURA_CABECALHO + 0.5 * cm
+
+y_inicio_produtos = altura - MARGEM_SUPERIOR
+x_inicio = 1.5 * cm
+altura_cod_btn = 0.4 * cm
+
+# Onde cada elemento de um card cai na página; calculado uma vez por card e usado
+# por todas as passadas do desenho da página
+Card = namedtuple("Card", [
+    "produto", "preparada", "x", "y_topo", "centro", "y_img_fundo", "y_preco_antigo", "y_preco_promo", "y_botao",
+])
+
+
+class Desenho:
+    """Desenho de um catálogo a partir de um tema (gerador_catalogo.temas) e de uma densidade.
+
+    A geometria e os estilos do tema são calculados uma vez, na criação. As
+    páginas de conteúdo são desenhadas em passadas (sombras, fundos, imagens,
+    preços, botões, descrições), de modo que cor, fonte e espessura de linha são
+    definidas uma vez por página e não uma vez por card. Os cards não se
+    sobrepõem, então o resultado é o mesmo de desenhar card a card. As partes
+    fixas (fundo do cabeçalho e do rodapé, moldura do card, botão do código,
+    área "Sem imagem") são Form XObjects gravados uma vez por PDF.
+    """
+
+    def __init__(self, tema, densidade=DENSIDADES[DENSIDADE_PADRAO]):
+        self.tema = tema
+        self.logo_path = logo_path
+        self.escala = e = densidade.escala
+        self.escala_texto = densidade.escala_texto
+        self.miniatura = densidade.miniatura
+        colunas = densidade.colunas
+        self.largura_bloco = (largura - 3 * cm - (colunas - 1) * densidade.espacamento_horizontal) / colunas
+        self.altura_bloco = densidade.altura_bloco
+        self.grade = Grade(densidade.colunas, x_inicio, y_inicio_produtos, self.largura_bloco, self.altura_bloco,
+                           densidade.espacamento_horizontal, self.altura_bloco + densidade.intervalo_vertical,
+                           ALTURA_RODAPE + 0.5 * cm)
+        self.max_altura_img_area = densidade.altura_imagem
+        self.largura_img_area = self.largura_bloco * tema.largura_imagem
+        self.largura_cod_btn = self.largura_bloco * tema.largura_botao
+        self.altura_cod_btn = altura_cod_btn * e
+        self.largura_desc_area = self.largura_bloco * 0.9
+        # Cada imagem distinta (logo, fotos repetidas) vira um único XObject no PDF
+        self.imagens_pdf = ImagensCompartilhadas()
+        # Estilo do Paragraph (descrição)
+        self.styleN = ParagraphStyle("descricao", parent=getSampleStyleSheet()["Normal"],
+                                     fontName="Helvetica", fontSize=tema.fonte_descricao * self.escala_texto,
+                                     leading=tema.entrelinha_descricao * self.escala_texto, alignment=1,
+                                     textColor=colors.black)
+
+    # === FORMULÁRIOS (PARTES FIXAS DESENHADAS UMA VEZ POR PDF) ===
+
+    def _formulario(self, c, nome, desenhar, caixa=None, x=0, y=0):
+        """Usa o Form XObject `nome`, criando-o com desenhar(c) na primeira vez neste PDF.
+
+        O conteúdo do formulário vai uma vez para o arquivo; cada uso custa só uma
+        referência (e a translação até x, y). caixa é a área do formulário, nas
+        coordenadas dele (padrão: a página).
+        """
+        if not c.hasForm(nome):
+            c.beginForm(nome, *(caixa or ()))
+            desenhar(c)
+            c.endForm()
+        if x or y:
+            c.saveState()
+            c.translate(x, y)
+            c.doForm(nome)
+            c.restoreState()
+        else:
+            c.doForm(nome)
+
+    def _fundo_cabecalho(self, c):
+        c.setFillColorRGB(0.95, 0.95, 0.95)
+        c.rect(0, altura - ALTURA_CABECALHO, largura, ALTURA_CABECALHO, fill=True, stroke=0)
+        try:
+            self.imagens_pdf.desenhar(c, self.logo_path, 2 * cm, altura - ALTURA_CABECALHO + 0.3 * cm, width=3.0 * cm,
+                                      preserveAspectRatio=True, mask='auto')
+        except:
+            pass
+        c.setFillColorRGB(0, 0, 0)
+        c.setFont("Helvetica-Bold", 18)
+        c.drawString(7 * cm, altura - ALTURA_CABECALHO + 0.5 * cm, "BIKE FRIDAY A+Ciclo")
+        c.setStrokeColorRGB(0.7, 0.7, 0.7)
+        c.setLineWidth(1)
+        c.line(1.5 * cm, altura - ALTURA_CABECALHO - 0.1 * cm, largura - 1.5 * cm, altura - ALTURA_CABECALHO - 0.1 * cm)
+
+    def _fundo_rodape(self, c):
+        c.setFillColorRGB(0.95, 0.95, 0.95)
+        c.rect(0, 0, largura, ALTURA_RODAPE, fill=True, stroke=0)
+        c.setFillColorRGB(0.2, 0.2, 0.2)
+        c.setFont("Helvetica", 8)
+        c.drawString(2 * cm, 0.5 * cm, "Acesse: b2b.amaisciclo.com.br")
+
+    def _moldura_card(self, c):
+        # Sombra e cartão, com o canto inferior esquerdo do cartão em (0, 0)
+        sombra_offset = 0.05 * cm * self.escala
+        raio = 0.2 * cm * self.escala
+        c.setFillColor(self.tema.cor_sombra)
+        c.roundRect(sombra_offset, sombra_offset, self.largura_bloco, self.altura_bloco, raio, fill=1, stroke=0)
+        c.setFillColor(COR_FUNDO_CARD)
+        c.setStrokeColor(self.tema.cor_sombra)
+        c.setLineWidth(0.5)
+        c.roundRect(0, 0, self.largura_bloco, self.altura_bloco, raio, fill=1, stroke=1)
+
+    def _sem_imagem(self, c):
+        # Área da imagem vazia, centralizada em x = 0 e com a base em y = 0
+        c.setFillColor(colors.lightgrey)
+        c.rect(-self.largura_img_area / 2, 0, self.largura_img_area, self.max_altura_img_area, fill=1, stroke=0)
+        c.setFillColor(colors.darkgrey)
+        c.setFont("Helvetica-Oblique", 8 * self.escala_texto)
+        c.drawCentredString(0, self.max_altura_img_area / 2, "Sem imagem")
+
+    def _botao(self, c):
+        # Fundo do botão do código, centralizado em x = 0 e com a base em y = 0
+        c.setFillColor(self.tema.cor_codigo)
+        c.roundRect(-self.largura_cod_btn / 2, 0, self.largura_cod_btn, self.altura_cod_btn, 0.15 * cm * self.escala,
+                    fill=1, stroke=0)
+
+    # === FUNÇÕES DE LAYOUT (CABECALHO/RODAPE/CAPA/INDICE) ===
+
+    def cabecalho(self, c, largura, altura, pagina, categoria_atual=""):
+        # Fundo, logo, título e linha vêm do formulário; só a categoria muda de página para página
+        self._formulario(c, "cabecalho", self._fundo_cabecalho)
+
+        # Adiciona a categoria atual no cabeçalho
+        if categoria_atual and self.tema.categoria_no_cabecalho:
+            c.setFillColorRGB(0, 0, 0)
+            c.setFont("Helvetica", 10)
+            c.drawRightString(largura - 2 * cm, altura - ALTURA_CABECALHO + 1.2 * cm, f"Categoria: {categoria_atual.upper()}")
+
+    def rodape(self, c, largura, altura, pagina):
+        self._formulario(c, "rodape", self._fundo_rodape)
+        c.setFillColorRGB(0.2, 0.2, 0.2)
+        c.setFont("Helvetica", 8)
+        c.drawRightString(largura - 2 * cm, 0.5 * cm, f"Página {pagina}")
+
+    def criar_capa(self, c, largura, altura, logo_path, tipo_ordenacao, desconto_maximo=None):
+        """Desenha a página de capa do catálogo, incluindo a data de geração e o maior desconto."""
+        tema = self.tema
+        data_geracao = date.today().strftime("%d/%m/%Y")
+
+        c.setFillColor(tema.cor_fundo_escuro)
+        c.rect(0, 0, largura, altura, fill=1, stroke=0)
+
+        faixa_altura = altura * 0.60
+        faixa_y = altura * 0.60
+        c.setFillColor(tema.cor_faixa_meio)
+        c.rect(0, faixa_y, largura, faixa_altura, fill=1, stroke=0)
+
+        try:
+            logo_capa_width = 13 * cm
+            logo_topo_y = altura * 0.65
+            self.imagens_pdf.desenhar(c, logo_path, (largura - logo_capa_width) / 2, logo_topo_y,
+                                      width=logo_capa_width, preserveAspectRatio=True, mask='auto')
+        except Exception:
+            c.setFillColor(COR_TEXTO_CLARO)
+            c.setFont("Helvetica-Bold", 40)
+            c.drawCentredString(largura / 2, altura * 0.82, "A+CICLO")
+
+        for linha in tema.capa:
+            if "{desconto_maximo}" in linha.texto and not desconto_maximo:
+                continue
+            c.setFillColor(linha.cor)
+            c.setFont(linha.fonte, linha.tamanho)
+            c.drawCentredString(largura / 2, altura * linha.altura, linha.texto.format(desconto_maximo=desconto_maximo))
+
+        box_largura = 12 * cm
+        box_altura = 1.2 * cm
+        box_x = (largura - box_largura) / 2
+        box_y = altura * 0.20
+
+        c.setFillColor(tema.cor_fundo_escuro)
+        c.roundRect(box_x, box_y, box_largura, box_altura, 0.5 * cm, fill=1, stroke=0)
+
+        c.setFillColor(COR_TEXTO_CLARO)
+        c.setFont("Helvetica", 10)
+        texto_data = tema.validade[tipo_ordenacao].format(data=data_geracao)
+        c.drawCentredString(largura / 2, box_y + 0.4 * cm, texto_data)
+
+        c.setFillColor(COR_TEXTO_CLARO)
+        c.setFont("Helvetica", 8)
+        c.drawCentredString(largura / 2, 1 * cm, "Catálogo Digital - Versão 2.0")
+
+        c.showPage()
+
+    def criar_indice(self, c, largura, altura, categorias_map, arquivos=None):
+        """Desenha a página de índice com links para as categorias.
+
+        Cada linha é um link para o destino nomeado no alto da primeira página da
+        categoria (gerador_catalogo.navegacao), que o PDF final resolve mesmo com o
+        índice desenhado à parte. Com arquivos (categoria -> caminho relativo do PDF
+        da categoria), a linha abre o arquivo da categoria na primeira página,
+        categorias_map traz a quantidade de páginas dele e as linhas seguem a ordem
+        de arquivos, a mesma dos números nos nomes dos PDFs.
+        """
+        tema = self.tema
+
+        c.setFillColor(tema.cor_faixa_meio)
+        c.rect(0, altura * 0.75, largura, altura * 0.25, fill=1, stroke=0)
+
+        c.setFillColor(COR_TEXTO_CLARO)
+        c.setFont("Helvetica-Bold", 24)
+        c.drawCentredString(largura / 2, altura * 0.88, "ÍNDICE DE CATEGORIAS")
+        c.setFont("Helvetica", 14)
+        c.drawCentredString(largura / 2, altura * 0.83, "Navegue pelas principais categorias de produtos")
+
+        categorias_ordenadas = sorted(categorias_map.keys()) if arquivos is None else list(arquivos)
+        destinos = destinos_categorias(categorias_map) if arquivos is None else {}
+        num_categorias = len(categorias_ordenadas)
+        meio = math.ceil(num_categorias / 2)
+
+        x_col1 = 2 * cm
+        x_col2 = largura / 2 + 0.5 * cm
+        y_start = altura * 0.70
+        y_step = 1.5 * cm
+
+        def desenhar_item_indice(c, num, nome, pagina, x, y):
+            c.setStrokeColor(colors.lightgrey)
+            c.setLineWidth(0.5)
+            c.rect(x - 0.2 * cm, y - 1.2 * cm, largura/2 - 2*cm, 1.2 * cm, fill=0, stroke=1)
+
+            c.setFillColor(colors.black)
+            c.setFont("Helvetica", 12)
+            c.drawString(x, y - 0.7 * cm, f"{num}. {nome.upper()}")
+
+            c.setFillColor(tema.cor_link)
+            c.setFont("Helvetica-Bold", 10)
+            area_link = (x - 0.2 * cm, y - 1.2 * cm, x + largura/2 - 2.2 * cm, y)
+            if arquivos is None:
+                c.drawString(x_col1 + largura/2 - 4.5 * cm, y - 0.7 * cm, f"Pág. {pagina}")
+                link_destino(c, destinos[nome], area_link)
+            else:
+                c.drawString(x_col1 + largura/2 - 4.5 * cm, y - 0.7 * cm, f"{pagina} pág.")
+                # GoToR: o leitor abre o PDF da categoria (/F, relativo ao mestre) na primeira página (/D);
+                # um link /URI dependeria do navegador e não funciona em todo visualizador
+                c.linkURL(arquivos[nome], area_link, relative=1, thickness=0, kind="GoToR")
+
+        for i in range(meio):
+            nome = categorias_ordenadas[i]
+            pagina = categorias_map[nome]
+            desenhar_item_indice(c, i + 1, nome, pagina, x_col1, y_start - i * y_step)
+
+        for j in range(num_categorias - meio):
+            nome = categorias_ordenadas[meio + j]
+            pagina = categorias_map[nome]
+            desenhar_item_indice(c, meio + j + 1, nome, pagina, x_col2, y_start - j * y_step)
+
+        box_largura_dica = largura - 4 * cm
+        box_altura_dica = 3 * cm
+        box_x_dica = 2 * cm
+        box_y_dica = 3 * cm
+
+        c.setFillColor(COR_FUNDO_CLARO)
+        c.setStrokeColor(tema.cor_link)
+        c.setLineWidth(1)
+        c.roundRect(box_x_dica, box_y_dica, box_largura_dica, box_altura_dica, 0.5 * cm, fill=1, stroke=1)
+
+        c.setFillColor(tema.cor_link)
+        c.setFont("Helvetica-Bold", 10)
+        c.drawString(box_x_dica + 0.5 * cm, box_y_dica + box_altura_dica - 0.5 * cm, "Dica de Navegação")
+
+        c.setFillColor(colors.darkgrey)
+        c.setFont("Helvetica", 8)
+        c.drawString(box_x_dica + 0.5 * cm, box_y_dica + box_altura_dica - 1.5 * cm, "Os produtos estão organizados por categorias para facilitar sua busca.")
+        c.drawString(box_x_dica + 0.5 * cm, box_y_dica + box_altura_dica - 2.2 * cm, "Use este índice como referência rápida para encontrar o que procura.")
+
+        c.showPage()
+
+    # === DESENHO DOS CARDS E DAS PÁGINAS DE CONTEÚDO ===
+
+    def _card(self, posicao, produto, preparada):
+        """Posições verticais de imagem, preços e botão do código de um card."""
+        e = self.escala
+        y_topo = posicao.y
+        y_img_fundo = y_topo - 0.3 * cm * e - self.max_altura_img_area
+        y_preco_antigo = y_preco_promo = None
+        y_botao = y_img_fundo - self.tema.botao_sem_precos * e
+
+        if self.tema.precos and produto.preco_promocao_txt:
+            # Preços logo abaixo da imagem; o código vai abaixo do último preço
+            y_atual = y_img_fundo - 0.2 * cm * e
+            if produto.preco_antigo_txt:
+                y_preco_antigo = y_atual
+                y_atual -= 0.35 * cm * e  # Espaço entre preços
+            y_preco_promo = y_atual
+            y_botao = y_atual - 0.6 * cm * e
+
+        return Card(produto, preparada, posicao.x, y_topo, posicao.x + self.largura_bloco / 2,
+                    y_img_fundo, y_preco_antigo, y_preco_promo, y_botao)
+
+    def _desenhar_imagens(self, c, cards):
+        """Fotos dos produtos e o espaço 'Sem imagem' dos que não têm. Retorna quantas faltaram."""
+        erros = 0
+        sem_imagem = []
+        for card in cards:
+            preparada = card.preparada
+            if preparada is None:
+                sem_imagem.append(card)
+                continue
+            try:
+                self.imagens_pdf.desenhar(c, preparada.caminho, card.centro - preparada.largura / 2,
+                                          card.y_img_fundo + (self.max_altura_img_area - preparada.altura) / 2,
+                                          width=preparada.largura, height=preparada.altura,
+                                          preserveAspectRatio=True, mask='auto')
+            except Exception:
+                erros += 1
+
+        # A caixa do formulário vai além do desenho para não cortar a borda dos traços
+        caixa = (-self.largura_bloco / 2, -1, self.largura_bloco / 2, self.max_altura_img_area + 1)
+        for card in sem_imagem:
+            self._formulario(c, "sem_imagem", self._sem_imagem, caixa, card.centro, card.y_img_fundo)
+        return erros + len(sem_imagem)
+
+    def _desenhar_precos(self, c, cards):
+        """Preço antigo (cinza e riscado) e preço promocional (vermelho e maior)."""
+        tamanho_antigo = 7 * self.escala_texto
+        tamanho_promo = 9 * self.escala_texto
+        antigos = [card for card in cards if card.y_preco_antigo is not None]
+        if antigos:
+            c.setFont("Helvetica", tamanho_antigo)
+            c.setFillColor(colors.grey)
+            for card in antigos:
+                desenhar_centralizado(c, card.centro, card.y_preco_antigo, card.produto.preco_antigo_txt, "Helvetica",
+                                      tamanho_antigo)
+            # Linha de risco sobre o preço antigo (largura memorizada, a mesma usada para centralizar)
+            c.setStrokeColor(colors.grey)
+            c.setLineWidth(0.5)
+            for card in antigos:
+                text_width = largura_texto(card.produto.preco_antigo_txt, "Helvetica", tamanho_antigo)
+                c.line(card.centro - text_width / 2, card.y_preco_antigo + 1,
+                       card.centro + text_width / 2, card.y_preco_antigo + 1)
+
+        promocoes = [card for card in cards if card.y_preco_promo is not None]
+        if promocoes:
+            c.setFont("Helvetica-Bold", tamanho_promo)
+            c.setFillColor(colors.red)
+            for card in promocoes:
+                desenhar_centralizado(c, card.centro, card.y_preco_promo, card.produto.preco_promocao_txt,
+                                      "Helvetica-Bold", tamanho_promo)
+
+    def desenhar_pagina_produtos(self, c, pagina, categoria_atual, itens, imagens_preparadas):
+        """Desenha cabeçalho, cards e rodapé de uma página de conteúdo. Retorna quantas imagens faltaram."""
+        self.cabecalho(c, largura, altura, pagina, categoria_atual)
+        cards = [self._card(posicao, produto, imagens_preparadas.get(produto.codigo)) for posicao, produto in itens]
+
+        # 1. Sombras e cartões (formulário; a caixa inclui a sombra e a borda do traço)
+        caixa = (-1, -1, self.largura_bloco + 1, self.altura_bloco + 1)
+        for card in cards:
+            self._formulario(c, "card", self._moldura_card, caixa, card.x, card.y_topo - self.altura_bloco)
+
+        # 2. Imagens e preços
+        erros = self._desenhar_imagens(c, cards)
+        if self.tema.precos:
+            self._desenhar_precos(c, cards)
+
+        # 3. Botão do código: fundo do formulário, código por cima
+        caixa = (-self.largura_bloco / 2, -1, self.largura_bloco / 2, self.altura_cod_btn + 1)
+        for card in cards:
+            self._formulario(c, "botao", self._botao, caixa, card.centro, card.y_botao)
+        tamanho_codigo = 6.5 * self.escala_texto
+        c.setFillColor(colors.white)
+        c.setFont("Helvetica-Bold", tamanho_codigo)
+        for card in cards:
+            desenhar_centralizado(c, card.centro, card.y_botao + self.tema.texto_botao * self.escala, card.produto.codigo,
+                                  "Helvetica-Bold", tamanho_codigo)
+
+        # 4. Descrições (fundo do card), já com os espaços normalizados (gerador_catalogo.dados)
+        paragrafos.desenhar_varios(c, self.styleN, [
+            (card.produto.descricao, card.centro - self.largura_desc_area / 2,
+             card.y_topo - self.altura_bloco + 0.2 * cm * self.escala, self.largura_desc_area)
+            for card in cards
+        ])
+
+        self.rodape(c, largura, altura, pagina)
+        c.showPage()
+        return erros
+
+
+_desenhos = {}
+
+
+def desenho_do_tema(nome, densidade=DENSIDADE_PADRAO):
+    """O Desenho do tema na densidade, criado uma vez por processo (os XObjects compartilhados ficam nele)."""
+    if (nome, densidade) not in _desenhos:
+        _desenhos[nome, densidade] = Desenho(TEMAS[nome], DENSIDADES[densidade])
+    return _desenhos[nome, densidade]
@@ -0,0 +1,144 @@
+import cProfile
+import os
+import pstats
+from datetime import datetime
+
+from gerador_catalogo.compactacao import configurar_compactacao
+from gerador_catalogo.configuracao import dpi_e_qualidade, img_dir
+from gerador_catalogo.geracao import EntradasCompartilhadas, areas_das_grades, gerar_dividido, gerar_variante
+from gerador_catalogo.imagens import imprimir_relatorio_imagens, relatorio_imagens
+from gerador_catalogo.instrumentacao import bytes_por_pagina, destaques_imagens, gravar_relatorio, pico_memoria_mb
+from gerador_catalogo.observacao import observar
+from gerador_catalogo.texto import paragrafos
+from gerador_catalogo.validacao import gravar_validacao, imprimir_validacao, validar_imagens
+
+
+def executar(args, variantes):
+    """Gera as variantes com as opções já validadas da linha de comando (gerador_catalogo.cli)."""
+    # Planilha, índice e imagens são carregados uma vez e servem a todas as variantes
+    # (as grades densas têm as miniaturas, à parte), sempre na maior área de foto
+    areas, areas_miniaturas = areas_das_grades()
+    # O modo compacto vale para todos os canvas deste processo e dos processos de trabalho
+    configurar_compactacao(args.compacto)
+    entradas = EntradasCompartilhadas(args.planilha, args.streaming, args.workers, areas,
+                                      args.desconto_minimo, args.ordenar_desconto,
+                                      *dpi_e_qualidade(args.compacto, args.dpi, args.qualidade_jpeg), areas_miniaturas)
+    comparar_tamanhos = args.compacto or args.linearizar
+
+    if args.validar_imagens:
+        # Mesma área que a geração usa, para as derivadas servirem a ela
+        largura_area, altura_area = max(area[0] for area in areas), max(area[1] for area in areas)
+        print(f"Validando as imagens de {img_dir} com {args.workers} processo(s)...")
+        with entradas.medicao.etapa("Validação de imagens"):
+            diagnosticos = validar_imagens(img_dir, entradas.cache_derivadas, largura_area, altura_area, args.workers)
+        imprimir_validacao(diagnosticos)
+        entradas.medicao.imprimir()
+        gravar_validacao(args.validar_imagens, diagnosticos, img_dir)
+        print(f"Relatório da validação gravado em {args.validar_imagens}")
+        return
+
+    if args.cache_texto:
+        paragrafos.carregar()
+
+    if args.observar:
+        def gerar():
+            for variante in variantes:
+                gerar_variante(variante, entradas, args.saida, args.workers, incremental=True)
+            print("Etapas compartilhadas:")
+            entradas.medicao.imprimir()
+            if args.cache_texto:
+                paragrafos.salvar()
+
+        try:
+            observar(gerar, entradas, args.planilha, img_dir, {variante.tipo_ordenacao for variante in variantes})
+        except KeyboardInterrupt:
+            print("\nObservação encerrada.")
+        return
+
+    perfil = cProfile.Profile() if args.profile else None
+    if perfil is not None:
+        perfil.enable()
+    try:
+        resultados = [gerar_dividido(variante, entradas, args.saida, args.workers, comparar_tamanhos, args.linearizar,
+                                     args.medir_sem_compactacao)
+                      if args.dividir and variante.tipo_ordenacao == 'C' and not args.paginas else
+                      gerar_variante(variante, entradas, args.saida, args.workers, args.paginas,
+                                     args.incremental, args.trechos, comparar_tamanhos, args.linearizar,
+                                     args.medir_sem_compactacao)
+                      for variante in variantes]
+    finally:
+        if perfil is not None:
+            perfil.disable()
+            perfil.dump_stats(args.profile)
+            print(f"\nPerfil gravado em {args.profile}. Funções mais caras (tempo acumulado):")
+            pstats.Stats(perfil).sort_stats("cumulative").print_stats(15)
+
+    if args.paginas or not entradas.medicao.etapas:
+        return
+    if args.cache_texto:
+        paragrafos.salvar()
+
+    # Custo de cada imagem: preparo (uma vez) mais o desenho em cada variante
+    custos = entradas.custos_imagens
+    for custo in custos.values():
+        custo["desenho_s"] = sum(r.segundos_imagens.get(custo["derivada"], 0.0) for r in resultados)
+    destaques = destaques_imagens(custos)
+
+    print("\n--- Geração Concluída ---")
+    cache_derivadas = entradas.cache_derivadas
+    print(f"Imagens: {cache_derivadas.geradas} reduzida(s) nesta execução, {cache_derivadas.reaproveitadas} reaproveitada(s) do cache.")
+    print(f"Descrições: {paragrafos.faltas} quebra(s) de linha calculada(s), {paragrafos.acertos} reaproveitada(s).")
+    if entradas.planilha_reaproveitada:
+        print("Planilha: snapshot reaproveitado (arquivo sem alterações).")
+    print("Etapas compartilhadas:")
+    entradas.medicao.imprimir()
+    if destaques["mais_lentas"]:
+        print("Imagens mais lentas (preparo + desenho):")
+        for custo in destaques["mais_lentas"][:3]:
+            print(f"   {custo['caminho']}: {(custo['segundos'] + custo['desenho_s']) * 1000:.0f} ms, "
+                  f"{custo['bytes_origem'] / 1024:.0f} KB")
+    memoria = pico_memoria_mb()
+    if memoria is not None:
+        print(f"Pico de memória: {memoria:.0f} MB (maior processo de trabalho: {pico_memoria_mb(filhos=True):.0f} MB)")
+    for caminho, erro in entradas.falhas_imagem.items():
+        print(f"   - {caminho}: {erro}")
+
+    codigos = [produto.codigo for produto in entradas.produtos(variantes[0].tipo_ordenacao)]
+    orfas, faltantes = relatorio_imagens(entradas.indice_imagens, codigos, img_dir)
+    imprimir_relatorio_imagens(orfas, faltantes)
+
+    if args.relatorio:
+        gravar_relatorio(args.relatorio, montar_relatorio(args, entradas, resultados, destaques, faltantes))
+        print(f"Relatório gravado em {args.relatorio}")
+
+
+def montar_relatorio(args, entradas, resultados, destaques, faltantes):
+    """Reúne etapas, imagens, memória e páginas de todas as variantes em um dicionário para o JSON."""
+    variantes = []
+    for resultado in resultados:
+        registro = {"nome": resultado.nome, "pdf": resultado.pdf_path, "paginas": resultado.paginas,
+                    "erros_imagem": resultado.erros_imagem, "etapas": resultado.medicao.etapas}
+        if resultado.pdf_path is not None:
+            registro["bytes"] = os.path.getsize(resultado.pdf_path)
+            registro["bytes_por_pagina"] = bytes_por_pagina(resultado.pdf_path)
+        if resultado.tamanhos is not None:
+            registro["tamanhos_por_grupo"] = resultado.tamanhos
+        variantes.append(registro)
+    cache_derivadas = entradas.cache_derivadas
+    return {
+        "gerado_em": datetime.now().isoformat(timespec="seconds"),
+        "argumentos": vars(args),
+        "planilha": {"caminho": entradas.planilha, "snapshot": entradas.planilha_reaproveitada},
+        "etapas": entradas.medicao.etapas,
+        "memoria": {"pico_rss_mb": pico_memoria_mb(), "pico_rss_processos_mb": pico_memoria_mb(filhos=True)},
+        "imagens": {
+            "preparadas": len(entradas.custos_imagens),
+            "geradas": cache_derivadas.geradas,
+            "reaproveitadas": cache_derivadas.reaproveitadas,
+            "faltantes": faltantes,
+            "falhas": entradas.falhas_imagem,
+            **destaques,
+        },
+        "texto": {"quebras_calculadas": paragrafos.faltas, "quebras_reaproveitadas": paragrafos.acertos},
+        "variantes": variantes,
+    }
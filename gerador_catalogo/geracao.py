@@ -0,0 +1,688 @@
+import io
+import os
+import re
+import shutil
+import tempfile
+import unicodedata
+from collections import namedtuple
+from contextlib import redirect_stdout
+from operator import itemgetter
+from datetime import date
+
+from reportlab.lib.pagesizes import A4
+from reportlab.pdfgen import canvas
+
+from gerador_catalogo.busca import IndiceBusca, caminho_indice_busca
+from gerador_catalogo.cache_imagens import DPI_MINIATURA, CacheDerivadas
+from gerador_catalogo.compactacao import (CAPA_E_INDICE, gravar_linha_de_base, imprimir_tamanhos,
+                                          ler_linha_de_base, linearizar, opcoes_reportlab, opcoes_reportlab_temporarias,
+                                          tamanhos_arquivos, tamanhos_por_grupo)
+from gerador_catalogo.dados import (agrupar_produtos, calcular_precos, chaves_ordenacao, desconto_maximo,
+                                    preparar_produtos)
+from gerador_catalogo.configuracao import (DENSIDADE_PADRAO, DENSIDADES, DPI_PADRAO, OPCOES_PADRAO, QUALIDADE_JPEG,
+                                           excel_path, img_dir, logo_path)
+from gerador_catalogo.desenho import desenho_do_tema
+from gerador_catalogo.imagens import construir_indice_imagens
+from gerador_catalogo.instrumentacao import Instrumentacao
+from gerador_catalogo.incremental import (ConstrucaoIncremental, chave_pagina, hash_registro, impressao_entradas,
+                                          impressao_variante, versao_gerador, versao_incremental)
+from gerador_catalogo.layout import agrupar_por_pagina, calcular_layout
+from gerador_catalogo.navegacao import calcular_navegacao, marcar_destinos, registrar_navegacao
+from gerador_catalogo.planilha import ler_planilha, ler_planilha_em_blocos
+from gerador_catalogo.preprocessamento import ajustar_na_area, preparar_imagens
+from gerador_catalogo.temas import TEMAS
+from gerador_catalogo.trechos import dividir_paginas, juntar_pdfs, renderizar_trechos
+
+# === CONFIGURAÇÕES GERAIS ===
+# (planilha, logo, pasta de imagens e as variantes ficam em gerador_catalogo.configuracao)
+# No modo streaming as páginas vão para o disco em lotes deste tamanho
+PAGINAS_POR_LOTE = 50
+
+# O que uma variante gerou, para o resumo e o relatório (pdf_path é None se nada foi gravado).
+# segundos_imagens é o tempo de desenho de cada derivada, somado entre os processos, e tamanhos,
+# quando comparados, os bytes por categoria na linha de base (sem compactação, ou antes da
+# linearização) e no PDF gerado ({"antes": ..., "depois": ...})
+ResultadoVariante = namedtuple("ResultadoVariante", [
+    "nome", "pdf_path", "paginas", "erros_imagem", "medicao", "segundos_imagens", "tamanhos",
+], defaults=(None,))
+
+# O que um trecho desenhado (talvez em outro processo) devolve: imagens que faltaram,
+# SHA-1 das imagens desenhadas, quantos usos e o tempo de desenho de cada derivada
+ResultadoTrecho = namedtuple("ResultadoTrecho", ["erros", "conteudos", "referencias", "segundos_imagens"])
+
+def desenho_da_variante(variante):
+    """O Desenho do tema da variante, na densidade dela."""
+    return desenho_do_tema(variante.tema, variante.densidade)
+
+
+def areas_das_grades():
+    """Áreas de foto do card de todos os temas em todas as densidades: (normais, miniaturas).
+
+    As derivadas são preparadas para a maior delas, e não só para as variantes
+    pedidas, para que gerar uma variante sozinha (-v black) use as mesmas
+    derivadas em cache de quando ela sai junto com as outras.
+    """
+    areas = []
+    areas_miniaturas = []
+    for tema in TEMAS:
+        for densidade in DENSIDADES:
+            desenho = desenho_do_tema(tema, densidade)
+            (areas_miniaturas if desenho.miniatura else areas).append((desenho.largura_img_area,
+                                                                       desenho.max_altura_img_area))
+    return areas, areas_miniaturas
+
+
+class EntradasCompartilhadas:
+    """Planilha, índice de imagens e imagens preparadas, carregados uma vez para todas as variantes.
+
+    Tudo é carregado sob demanda, então uma geração incremental em que nenhuma
+    variante mudou nem chega a ler a planilha. As imagens são reduzidas uma vez,
+    para a maior área de card (areas_das_grades), e só remedidas para as demais;
+    as grades densas usam miniaturas, preparadas à parte só quando alguma pede.
+    """
+
+    def __init__(self, planilha=excel_path, streaming=False, workers=None, areas=(), desconto_minimo=None,
+                 ordenar_por_desconto=False, dpi=DPI_PADRAO, qualidade=QUALIDADE_JPEG, areas_miniaturas=()):
+        self.planilha = planilha
+        self.streaming = streaming
+        self.workers = workers
+        self.areas = list(areas)
+        self.areas_miniaturas = list(areas_miniaturas)
+        self.desconto_minimo = desconto_minimo
+        self.ordenar_por_desconto = ordenar_por_desconto
+        self.medicao = Instrumentacao()
+        self.cache_derivadas = CacheDerivadas(dpi=dpi, qualidade=qualidade)
+        self.falhas_imagem = {}
+        self.custos_imagens = {}
+        self.planilha_reaproveitada = None
+        self._df = None
+        self._produtos = {}
+        self._indice_imagens = None
+        self._imagens = None
+        self._area = None
+        self._imagens_por_area = {}
+        # Imagens já preparadas por arquivo, mantidas entre rodadas do modo de observação
+        self._preparadas = {}
+        # O mesmo para as miniaturas (na maior área entre as grades densas)
+        self._miniaturas = None
+        self._area_miniaturas = None
+        self._miniaturas_preparadas = {}
+        self._sem_compactacao = None
+
+    @staticmethod
+    def _normalizar(df):
+        df['Categoria'] = df['Categoria'].fillna('Diversos').astype(str).str.strip()
+        return df
+
+    @property
+    def df(self):
+        """Planilha já lida, com a categoria normalizada (fora do modo streaming)."""
+        if self._df is None:
+            try:
+                with self.medicao.etapa("Leitura da planilha"):
+                    # Snapshot já interpretado da planilha; só relê o arquivo quando ele muda
+                    df, self.planilha_reaproveitada = ler_planilha(self.planilha)
+                    self._df = self._normalizar(df)
+            except FileNotFoundError:
+                print(f"ERRO: Arquivo Excel não encontrado em: {self.planilha}")
+                raise SystemExit(1)
+            except Exception as e:
+                print(f"ERRO: Falha ao ler o arquivo Excel: {e}")
+                raise SystemExit(1)
+        return self._df
+
+    def _blocos(self):
+        """Blocos da planilha com a categoria normalizada, para o modo streaming; nenhum fica guardado."""
+        try:
+            blocos, self.planilha_reaproveitada = ler_planilha_em_blocos(self.planilha)
+            for bloco in blocos:
+                yield self._normalizar(bloco)
+        except FileNotFoundError:
+            print(f"ERRO: Arquivo Excel não encontrado em: {self.planilha}")
+            raise SystemExit(1)
+        except Exception as e:
+            print(f"ERRO: Falha ao ler o arquivo Excel: {e}")
+            raise SystemExit(1)
+
+    def _produtos_em_blocos(self, tipo_ordenacao):
+        # Cada bloco vira registros (com a chave de ordenação) e é descartado; a
+        # planilha inteira nunca vira um DataFrame, mas todos os registros ficam na
+        # lista para a ordenação (nada de ordenação externa em disco)
+        registros = []
+        for bloco in self._blocos():
+            precos = calcular_precos(bloco)
+            if self.desconto_minimo is not None:
+                manter = precos['desconto'] >= self.desconto_minimo
+                bloco, precos = bloco[manter], precos[manter]
+            chaves = chaves_ordenacao(bloco, precos, tipo_ordenacao, self.ordenar_por_desconto)
+            registros.extend(zip(chaves, preparar_produtos(bloco, precos)))
+        registros.sort(key=itemgetter(0))
+        return [produto for _, produto in registros]
+
+    def produtos(self, tipo_ordenacao):
+        """Produtos na ordem da variante: por categoria e código ('C') ou por descrição e código ('A').
+
+        Com ordenar_por_desconto os maiores descontos vêm primeiro (dentro de cada
+        categoria em 'C'); com desconto_minimo só ficam os produtos com pelo menos
+        esse desconto (%). No modo streaming a planilha é lida bloco a bloco a cada
+        ordenação; os registros de todos os produtos continuam na memória, assim
+        como a paginação e as imagens preparadas que a geração monta a partir deles.
+        """
+        if tipo_ordenacao in self._produtos:
+            return self._produtos[tipo_ordenacao]
+        if self.streaming:
+            with self.medicao.etapa("Leitura e ordenação da planilha em blocos"):
+                self._produtos[tipo_ordenacao] = self._produtos_em_blocos(tipo_ordenacao)
+        else:
+            df = self.df
+            with self.medicao.etapa("Ordenação e normalização dos produtos"):
+                # Preços, descontos e faixas de uma vez, coluna a coluna, antes de filtrar e ordenar
+                precos = calcular_precos(df)
+                if self.desconto_minimo is not None:
+                    df = df[precos['desconto'] >= self.desconto_minimo]
+                if tipo_ordenacao == 'C':
+                    colunas = ['Categoria', 'Código do Produto']
+                else:
+                    colunas = ['Descrição', 'Código do Produto']
+                if self.ordenar_por_desconto:
+                    df = df.assign(_desconto=precos['desconto'])
+                    colunas.insert(1 if tipo_ordenacao == 'C' else 0, '_desconto')
+                    df = df.sort_values(by=colunas, ascending=[coluna != '_desconto' for coluna in colunas])
+                else:
+                    df = df.sort_values(by=colunas)
+                # Registros compactos, normalizados coluna a coluna; o desenho não toca mais no DataFrame
+                self._produtos[tipo_ordenacao] = preparar_produtos(df, precos.loc[df.index])
+        return self._produtos[tipo_ordenacao]
+
+    @property
+    def indice_imagens(self):
+        """Índice código -> arquivo de imagem (leitura única do diretório)."""
+        if self._indice_imagens is None:
+            with self.medicao.etapa("Índice de imagens"):
+                self._indice_imagens = construir_indice_imagens(img_dir)
+        return self._indice_imagens
+
+    def imagens(self, codigos, largura_area, altura_area, miniatura=False):
+        """Imagens preparadas dos códigos, medidas para a área do card da variante.
+
+        Com miniatura a derivada é outra, preparada em DPI_MINIATURA para a maior área
+        entre as grades densas, bem menor que a das fotos do card normal.
+        """
+        if miniatura:
+            return self._miniaturas_na_area(codigos, largura_area, altura_area)
+        if self._imagens is None:
+            areas = self.areas + [(largura_area, altura_area)]
+            self._area = (max(area[0] for area in areas), max(area[1] for area in areas))
+            indice_imagens = self.indice_imagens
+            print(f"Preparando imagens com {self.workers} processo(s)...")
+            with self.medicao.etapa("Pré-processamento de imagens"):
+                self._imagens, self.falhas_imagem = preparar_imagens(
+                    list(dict.fromkeys(codigos)), indice_imagens, self.cache_derivadas,
+                    self._area[0], self._area[1], workers=self.workers, custos=self.custos_imagens,
+                    memoria=self._preparadas)
+                self.cache_derivadas.salvar()
+        if (largura_area, altura_area) == self._area:
+            return self._imagens
+        if (largura_area, altura_area) not in self._imagens_por_area:
+            self._imagens_por_area[largura_area, altura_area] = ajustar_na_area(self._imagens, largura_area, altura_area)
+        return self._imagens_por_area[largura_area, altura_area]
+
+    def _miniaturas_na_area(self, codigos, largura_area, altura_area):
+        # Como as imagens normais: preparadas uma vez, para a maior área, e remedidas para as demais
+        if self._miniaturas is None:
+            areas = self.areas_miniaturas + [(largura_area, altura_area)]
+            self._area_miniaturas = (max(area[0] for area in areas), max(area[1] for area in areas))
+            dpi = min(DPI_MINIATURA, self.cache_derivadas.dpi)
+            indice_imagens = self.indice_imagens
+            print(f"Preparando miniaturas ({dpi} DPI) com {self.workers} processo(s)...")
+            with self.medicao.etapa("Pré-processamento de miniaturas"):
+                self._miniaturas, falhas = preparar_imagens(
+                    list(dict.fromkeys(codigos)), indice_imagens, self.cache_derivadas,
+                    self._area_miniaturas[0], self._area_miniaturas[1], workers=self.workers,
+                    memoria=self._miniaturas_preparadas, dpi=dpi)
+                self.falhas_imagem.update(falhas)
+                self.cache_derivadas.salvar()
+        if (largura_area, altura_area) == self._area_miniaturas:
+            return self._miniaturas
+        return ajustar_na_area(self._miniaturas, largura_area, altura_area)
+
+    @property
+    def compactas(self):
+        """True se a saída não é a padrão: opções do modo compacto ou imagens em outro DPI ou qualidade."""
+        return (opcoes_reportlab() != OPCOES_PADRAO
+                or (self.cache_derivadas.dpi, self.cache_derivadas.qualidade) != (DPI_PADRAO, QUALIDADE_JPEG))
+
+    def sem_compactacao(self):
+        """As mesmas entradas com as imagens no DPI e na qualidade padrão, para medir a linha de base.
+
+        Planilha, produtos e índice de imagens são os mesmos objetos; só as derivadas são outras.
+        """
+        if self._sem_compactacao is None:
+            outras = EntradasCompartilhadas(self.planilha, self.streaming, self.workers, self.areas,
+                                            self.desconto_minimo, self.ordenar_por_desconto,
+                                            areas_miniaturas=self.areas_miniaturas)
+            outras._df, outras._produtos, outras._indice_imagens = self._df, self._produtos, self._indice_imagens
+            self._sem_compactacao = outras
+        return self._sem_compactacao
+
+    def invalidar(self, planilha=False, imagens=()):
+        """Descarta só o que uma alteração deixou velho, para a próxima rodada (modo de observação).
+
+        Com a planilha alterada os produtos são relidos; com imagens alteradas o
+        índice é refeito e só esses arquivos são preparados de novo.
+        """
+        if planilha:
+            self._df = None
+            self._produtos = {}
+        if imagens:
+            self._indice_imagens = None
+            for caminho in imagens:
+                self._preparadas.pop(caminho, None)
+                self._miniaturas_preparadas.pop(caminho, None)
+        self._imagens = None
+        self._miniaturas = None
+        self._imagens_por_area = {}
+        self._sem_compactacao = None
+        self.falhas_imagem = {}
+        self.custos_imagens = {}
+        self.medicao = Instrumentacao()
+
+
+def renderizar_trecho(tema, caminho, paginas, tipo_ordenacao, imagens_preparadas, densidade=DENSIDADE_PADRAO,
+                      navegacao=None):
+    """Desenha um trecho de páginas de conteúdo em um PDF próprio; roda em um processo separado.
+
+    Com navegacao (um PDF que não vai ser juntado a outros) grava também os
+    destinos e o sumário. Retorna um ResultadoTrecho.
+    """
+    desenho = desenho_do_tema(tema, densidade)
+    desenho.imagens_pdf.novo_documento()
+    c = canvas.Canvas(caminho, pagesize=A4)
+    erros = 0
+    for pagina, grupo, itens in paginas:
+        categoria_atual = grupo if tipo_ordenacao == 'C' else ""
+        marcar_destinos(c, navegacao, pagina)
+        erros += desenho.desenhar_pagina_produtos(c, pagina, categoria_atual, itens, imagens_preparadas)
+    registrar_navegacao(c, navegacao)
+    c.save()
+    return uso_imagens(desenho.imagens_pdf, imagens_preparadas, erros)
+
+
+def uso_imagens(imagens_pdf, imagens_preparadas, erros=0):
+    """ResultadoTrecho com as imagens desenhadas até aqui no documento atual de imagens_pdf."""
+    segundos = {preparada.caminho: imagens_pdf.segundos_desenho(preparada.caminho)
+                for preparada in imagens_preparadas.values()}
+    return ResultadoTrecho(erros, imagens_pdf.conteudos_usados(), imagens_pdf.referencias, segundos)
+
+
+def somar_trechos(resultados, juntos):
+    """Soma os ResultadoTrecho; retorna (erros, imagens distintas, usos, segundos por derivada).
+
+    juntos diz se os trechos viram um PDF só, em que cada conteúdo é gravado uma
+    vez (juntar_pdfs); senão cada arquivo conta as suas imagens.
+    """
+    segundos = {}
+    for resultado in resultados:
+        for caminho, tempo in resultado.segundos_imagens.items():
+            segundos[caminho] = segundos.get(caminho, 0.0) + tempo
+    if juntos:
+        distintas = len(frozenset().union(*(resultado.conteudos for resultado in resultados)))
+    else:
+        distintas = sum(len(resultado.conteudos) for resultado in resultados)
+    return (sum(resultado.erros for resultado in resultados), distintas,
+            sum(resultado.referencias for resultado in resultados), segundos)
+
+
+def gerar_avulso(variante, entradas, produtos, grupo, pdf_path):
+    """Gera um PDF só com os produtos informados (uma categoria, um produto), sem capa e numerado desde 1.
+
+    Usa o tema da variante e mostra o grupo no cabeçalho. Retorna quantas imagens faltaram.
+    """
+    desenho = desenho_da_variante(variante)
+    # As imagens são preparadas para o catálogo todo: as entradas guardam o resultado da primeira chamada
+    todos = [produto.codigo for produto in entradas.produtos(variante.tipo_ordenacao)]
+    imagens_preparadas = entradas.imagens(todos, desenho.largura_img_area, desenho.max_altura_img_area,
+                                          desenho.miniatura)
+    layout = calcular_layout([(grupo, len(produtos))], desenho.grade)
+    return renderizar_trecho(variante.tema, pdf_path, agrupar_por_pagina(layout.posicoes, produtos), 'C',
+                             imagens_preparadas, variante.densidade).erros
+
+
+def linha_de_base(variante, entradas, pdf_path, medir, medir_se_faltar, *extras):
+    """Tamanhos da variante sem o modo compacto, para comparar com a saída compacta.
+
+    medir(entradas, pasta) gera a variante com as entradas sem compactação dentro
+    da pasta (temporária) e devolve os tamanhos; roda com as opções padrão do
+    reportlab e sem a saída no terminal. Como isso desenha o catálogo outra vez,
+    só roda com medir_se_faltar (--medir-sem-compactacao); sem ele vale a medição
+    registrada, que só é refeita quando a planilha, as imagens, o código ou a
+    variante mudam, e None se ainda não há uma.
+    """
+    chave = chave_pagina(versao_gerador(), variante, entradas.desconto_minimo, entradas.ordenar_por_desconto,
+                         date.today().isoformat(), impressao_entradas([entradas.planilha, logo_path], [img_dir]), extras)
+    tamanhos = ler_linha_de_base(pdf_path, chave)
+    if tamanhos is None and not medir_se_faltar:
+        print("Sem medição sem compactação para estas entradas: rode uma vez com --medir-sem-compactacao "
+              "para comparar os tamanhos.")
+    elif tamanhos is None:
+        print("Medindo o tamanho sem compactação (uma vez para estas entradas)...")
+        pasta = tempfile.mkdtemp(prefix=".linha_de_base_", dir=os.path.dirname(os.path.abspath(pdf_path)))
+        try:
+            with opcoes_reportlab_temporarias(OPCOES_PADRAO), redirect_stdout(io.StringIO()):
+                tamanhos = medir(entradas.sem_compactacao(), pasta)
+        finally:
+            shutil.rmtree(pasta, ignore_errors=True)
+        gravar_linha_de_base(pdf_path, chave, tamanhos)
+    return tamanhos
+
+
+def linearizar_pdfs(caminhos):
+    """Lineariza os PDFs gravados; avisa se não há pikepdf nem qpdf."""
+    for caminho in caminhos:
+        if not linearizar(caminho):
+            print("⚠️ Linearização indisponível: instale o pikepdf (pip install pikepdf) ou o qpdf.")
+            return
+
+
+def _titulo_comparacao(entradas):
+    return "sem compactação -> compacto" if entradas.compactas else "antes -> depois da linearização"
+
+
+def _nome_arquivo_categoria(numero, categoria):
+    """Nome do PDF de uma categoria: a ordem no índice e o nome sem acentos, em minúsculas."""
+    texto = unicodedata.normalize("NFKD", categoria).encode("ascii", "ignore").decode("ascii")
+    return f"{numero:02d}_{re.sub(r'[^a-z0-9]+', '_', texto.lower()).strip('_') or 'categoria'}.pdf"
+
+
+def gerar_dividido(variante, entradas, pasta_saida=".", workers=None, comparar_tamanhos=False, linearizar_pdf=False,
+                   medir_sem_compactacao=False):
+    """Gera um PDF por categoria, em paralelo, e um PDF mestre com a capa e o índice apontando para eles.
+
+    O mestre fica no lugar do catálogo de sempre e as categorias em uma pasta com
+    o mesmo nome ao lado dele; cada categoria é numerada desde 1 e só embute as
+    suas imagens, já preparadas uma vez para todas. O índice de busca, ao lado do
+    mestre, diz o arquivo de cada produto. Com comparar_tamanhos mostra o
+    tamanho de cada arquivo sem compactação (ou antes da linearização) e no
+    gerado; a versão sem compactação só é desenhada com medir_sem_compactacao
+    (linha_de_base). Retorna um ResultadoVariante.
+    """
+    desenho = desenho_da_variante(variante)
+    largura, altura = A4
+    pdf_path = os.path.join(pasta_saida, variante.pdf_path)
+    nome_pasta = os.path.splitext(variante.pdf_path)[0]
+    pasta = os.path.join(pasta_saida, nome_pasta)
+    os.makedirs(pasta, exist_ok=True)
+    print(f"\n=== Catálogo '{variante.nome}' (um PDF por categoria) ===")
+
+    produtos = entradas.produtos('C')
+    imagens_preparadas = entradas.imagens([produto.codigo for produto in produtos],
+                                          desenho.largura_img_area, desenho.max_altura_img_area, desenho.miniatura)
+
+    # Cada categoria é um documento próprio: layout desde a página 1 e só as imagens dela
+    tarefas = []
+    arquivos = {}
+    caminhos = {CAPA_E_INDICE: pdf_path}
+    paginas_por_grupo = {}
+    busca = IndiceBusca()
+    # A ordem do índice do mestre numera os arquivos; criar_indice segue a ordem de arquivos
+    grupos = sorted(agrupar_produtos(produtos, por_categoria=True), key=lambda grupo: grupo[0])
+    for numero, (nome, itens) in enumerate(grupos, 1):
+        layout = calcular_layout([(nome, len(itens))], desenho.grade)
+        paginas = agrupar_por_pagina(layout.posicoes, itens)
+        navegacao = calcular_navegacao(paginas, 'C', altura)
+        nome_arquivo = _nome_arquivo_categoria(numero, nome)
+        # Link relativo ao mestre, que fica na pasta de cima
+        arquivos[nome] = f"{nome_pasta}/{nome_arquivo}"
+        caminhos[nome] = os.path.join(pasta, nome_arquivo)
+        paginas_por_grupo[nome] = layout.ultima_pagina
+        busca.adicionar(paginas, navegacao, arquivos[nome])
+        imagens = {produto.codigo: imagens_preparadas[produto.codigo]
+                   for produto in itens if produto.codigo in imagens_preparadas}
+        tarefas.append((variante.tema, os.path.join(pasta, nome_arquivo), paginas, 'C', imagens, variante.densidade,
+                        navegacao))
+
+    mestre = []
+
+    def desenhar_mestre():
+        # Capa e índice no processo principal enquanto as categorias são desenhadas
+        desenho.imagens_pdf.novo_documento()
+        c = canvas.Canvas(pdf_path, pagesize=A4)
+        desenho.criar_capa(c, largura, altura, desenho.logo_path, 'C', desconto_maximo(produtos))
+        desenho.criar_indice(c, largura, altura, paginas_por_grupo, arquivos)
+        c.save()
+        mestre.append(uso_imagens(desenho.imagens_pdf, {}))
+
+    def medir(entradas_base, pasta_base):
+        gerar_dividido(variante, entradas_base, pasta_base, workers)
+        return tamanhos_arquivos({nome: os.path.join(pasta_base, os.path.relpath(caminho, pasta_saida))
+                                  for nome, caminho in caminhos.items()})
+
+    antes = None
+    if comparar_tamanhos and entradas.compactas:
+        antes = linha_de_base(variante, entradas, pdf_path, medir, medir_sem_compactacao, "dividido")
+    medicao = Instrumentacao()
+    print(f"Desenhando {len(tarefas)} categoria(s) com até {workers} processo(s)...")
+    with medicao.etapa("Renderização das páginas"):
+        resultados = renderizar_trechos(renderizar_trecho, tarefas, workers, desenhar_mestre)
+    # Cada categoria é um arquivo próprio, com as suas imagens
+    erros_imagem, distintas, referencias, segundos_imagens = somar_trechos(mestre + resultados, juntos=False)
+
+    # PDFs de categorias que saíram da planilha
+    gerados = {os.path.basename(tarefa[1]) for tarefa in tarefas}
+    for nome in os.listdir(pasta):
+        if nome.endswith(".pdf") and nome not in gerados:
+            os.remove(os.path.join(pasta, nome))
+    if linearizar_pdf:
+        if comparar_tamanhos and antes is None:
+            antes = tamanhos_arquivos(caminhos)
+        with medicao.etapa("Linearização"):
+            linearizar_pdfs(caminhos.values())
+    with medicao.etapa("Índice de busca"):
+        busca.gravar(caminho_indice_busca(pdf_path), pdf_path, 2 + sum(paginas_por_grupo.values()))
+
+    tamanhos = [os.path.getsize(tarefa[1]) for tarefa in tarefas]
+    print(f"✅ Catálogo gerado com sucesso: {pdf_path} ({os.path.getsize(pdf_path) / 1024:.0f} KB) "
+          f"e {len(tarefas)} PDF(s) de categoria em {pasta}")
+    if tamanhos:
+        print(f"Categorias: {sum(tamanhos) / 1024 / 1024:.1f} MB no total; "
+              f"a maior tem {max(tamanhos) / 1024 / 1024:.1f} MB e a média {sum(tamanhos) / len(tamanhos) / 1024:.0f} KB.")
+    print(f"Imagens nos PDFs: {distintas} gravada(s) para {referencias} uso(s).")
+    comparacao = None
+    if comparar_tamanhos:
+        comparacao = {"antes": antes, "depois": tamanhos_arquivos(caminhos)}
+        imprimir_tamanhos(comparacao["antes"], comparacao["depois"], _titulo_comparacao(entradas))
+    medicao.imprimir()
+    if erros_imagem > 0:
+        print(f"⚠️ {erros_imagem} imagem(ns) não encontrada(s) ou falhou no carregamento.")
+    return ResultadoVariante(variante.nome, pdf_path, 2 + sum(paginas_por_grupo.values()), erros_imagem, medicao,
+                             segundos_imagens, comparacao)
+
+
+def gerar_variante(variante, entradas, pasta_saida=".", workers=None, so_paginas=False, incremental=False, trechos=None,
+                   comparar_tamanhos=False, linearizar_pdf=False, medir_sem_compactacao=False):
+    """Gera o PDF de uma variante usando as entradas compartilhadas. Retorna um ResultadoVariante.
+
+    Com comparar_tamanhos mostra os bytes de cada categoria sem compactação (ou
+    antes da linearização) e no PDF gerado, com a versão sem compactação desenhada
+    só com medir_sem_compactacao (linha_de_base); com linearizar_pdf o PDF final é linearizado. O PDF sai com um destino
+    nomeado por produto e o sumário, e o índice de busca é gravado ao lado dele.
+    """
+    desenho = desenho_da_variante(variante)
+    TIPO_ORDENACAO = variante.tipo_ordenacao
+    pdf_path = os.path.join(pasta_saida, variante.pdf_path)
+    largura, altura = A4
+    print(f"\n=== Catálogo '{variante.nome}' ===")
+
+    # === GERAÇÃO INCREMENTAL: NADA MUDOU? ===
+    construcao = None
+    if incremental:
+        # As opções de saída do reportlab (modo compacto) e as derivadas mudam os bytes de cada página em cache
+        versao = versao_incremental(opcoes_reportlab(), entradas.cache_derivadas.dpi, entradas.cache_derivadas.qualidade)
+        data_geracao = date.today().isoformat()
+        impressao = impressao_variante(variante, entradas.planilha, versao, data_geracao,
+                                       entradas.desconto_minimo, entradas.ordenar_por_desconto)
+        construcao = ConstrucaoIncremental(pdf_path, impressao)
+        if construcao.nada_mudou():
+            print(f"✅ Nada mudou desde a última geração: {pdf_path}")
+            return ResultadoVariante(variante.nome, None, None, 0, Instrumentacao(), {})
+
+    produtos = entradas.produtos(TIPO_ORDENACAO)
+    grupos = agrupar_produtos(produtos, por_categoria=TIPO_ORDENACAO == 'C')
+    desconto_capa = desconto_maximo(produtos)
+
+    # === PAGINAÇÃO EXATA (SEM DESENHAR) ===
+    # Capa sem número; com índice ele é a página 1 e o conteúdo começa na 2
+    layout = calcular_layout([(nome, len(itens)) for nome, itens in grupos], desenho.grade,
+                             pagina_inicial=2 if variante.indice else 1,
+                             nova_pagina_por_grupo=TIPO_ORDENACAO == 'C')
+
+    if so_paginas:
+        if TIPO_ORDENACAO == 'C':
+            for nome, primeira in layout.paginas_grupos.items():
+                print(f"{nome}: página {primeira} ({layout.paginas_por_grupo[nome]} página(s))")
+        print(f"Total de páginas: {layout.ultima_pagina}")
+        return ResultadoVariante(variante.nome, None, layout.ultima_pagina, 0, Instrumentacao(), {})
+
+    # === PRÉ-PROCESSAMENTO PARALELO DAS IMAGENS (UMA VEZ PARA TODAS AS VARIANTES) ===
+    imagens_preparadas = entradas.imagens([produto.codigo for produto in produtos],
+                                          desenho.largura_img_area, desenho.max_altura_img_area, desenho.miniatura)
+
+    # Produtos na mesma ordem usada no cálculo do layout, agrupados por página
+    paginas_conteudo = agrupar_por_pagina(layout.posicoes, produtos)
+    # Destinos e sumário da mesma paginação, gravados do mesmo jeito em qualquer caminho de geração
+    navegacao = calcular_navegacao(paginas_conteudo, TIPO_ORDENACAO, altura)
+
+    # No modo streaming nenhum canvas guarda o catálogo inteiro: cada lote de
+    # páginas é gravado em um PDF próprio e a junção copia um lote de cada vez.
+    # A paginação (paginas_conteudo) e a navegação continuam inteiras na memória
+    if entradas.streaming and not trechos and construcao is None:
+        trechos = str(PAGINAS_POR_LOTE)
+
+    # Linha de base do modo compacto: a mesma variante gerada sem ele
+    antes = None
+    if comparar_tamanhos and entradas.compactas:
+        def medir(entradas_base, pasta_base):
+            resultado = gerar_variante(variante, entradas_base, pasta_base, workers, trechos=trechos)
+            return tamanhos_por_grupo(resultado.pdf_path, layout)
+
+        antes = linha_de_base(variante, entradas, pdf_path, medir, medir_sem_compactacao)
+
+    # --- INÍCIO DA GERAÇÃO DO PDF ---
+    medicao = Instrumentacao()
+    desenho.imagens_pdf.novo_documento()
+    erros_imagem = 0
+
+    if trechos:
+        # Posições e números de página já vêm do layout, então os trechos são independentes
+        divididos = dividir_paginas(paginas_conteudo, None if trechos == "categoria" else int(trechos))
+
+        def imagens_do_trecho(trecho):
+            codigos = (produto.codigo for _, _, itens in trecho for _, produto in itens)
+            return {codigo: imagens_preparadas[codigo] for codigo in codigos if codigo in imagens_preparadas}
+
+        pasta = tempfile.mkdtemp(prefix=".trechos_", dir=os.path.dirname(os.path.abspath(pdf_path)))
+        caminho_abertura = os.path.join(pasta, "abertura.pdf")
+
+        abertura = []
+
+        def desenhar_abertura():
+            # Capa (e índice) no processo principal enquanto os trechos são desenhados
+            c = canvas.Canvas(caminho_abertura, pagesize=A4)
+            desenho.criar_capa(c, largura, altura, desenho.logo_path, TIPO_ORDENACAO, desconto_capa)
+            if variante.indice:
+                desenho.criar_indice(c, largura, altura, layout.paginas_grupos)
+            c.save()
+            abertura.append(uso_imagens(desenho.imagens_pdf, {}))
+
+        tarefas = [(variante.tema, os.path.join(pasta, f"trecho_{n:04d}.pdf"), trecho, TIPO_ORDENACAO,
+                    imagens_do_trecho(trecho), variante.densidade)
+                   for n, trecho in enumerate(divididos)]
+        print(f"Desenhando {len(divididos)} trecho(s) com até {workers} processo(s)...")
+        with medicao.etapa("Renderização das páginas"):
+            resultados = renderizar_trechos(renderizar_trecho, tarefas, workers, desenhar_abertura)
+        # As imagens desenhadas nos outros processos; a junção grava cada conteúdo uma vez
+        erros_imagem, distintas, referencias, segundos_imagens = somar_trechos(abertura + resultados, juntos=True)
+
+        with medicao.etapa("Gravação do PDF"):
+            juntar_pdfs([caminho_abertura] + [tarefa[1] for tarefa in tarefas], pdf_path, navegacao)
+            shutil.rmtree(pasta, ignore_errors=True)
+    elif construcao is None:
+        c = canvas.Canvas(pdf_path, pagesize=A4)
+
+        with medicao.etapa("Renderização das páginas"):
+            # 1. Gerar a Capa (passando o tipo de ordenação para o texto)
+            print("Iniciando geração da Capa...")
+            desenho.criar_capa(c, largura, altura, desenho.logo_path, TIPO_ORDENACAO, desconto_capa)
+
+            # 2. Gerar o Índice (só nas variantes que têm índice)
+            if variante.indice:
+                # As páginas das categorias vêm da paginação exata calculada acima
+                print("Gerando Índice (Página 1)...")
+                desenho.criar_indice(c, largura, altura, layout.paginas_grupos)
+
+            # 3. Páginas de conteúdo
+            print("Iniciando conteúdo do catálogo...")
+            for pagina, grupo, itens in paginas_conteudo:
+                categoria_atual = grupo if TIPO_ORDENACAO == 'C' else ""
+                marcar_destinos(c, navegacao, pagina)
+                erros_imagem += desenho.desenhar_pagina_produtos(c, pagina, categoria_atual, itens, imagens_preparadas)
+
+        with medicao.etapa("Gravação do PDF"):
+            registrar_navegacao(c, navegacao)
+            c.save()
+    else:
+        # Cada página tem uma chave com tudo o que é desenhado nela; só as chaves novas são desenhadas
+        hashes_produtos = {}
+        with medicao.etapa("Renderização das páginas"):
+            construcao.pagina(0, chave_pagina(versao, "capa", TIPO_ORDENACAO, data_geracao, desconto_capa),
+                              lambda c: desenho.criar_capa(c, largura, altura, desenho.logo_path, TIPO_ORDENACAO, desconto_capa))
+            if variante.indice:
+                construcao.pagina(1, chave_pagina(versao, "indice", layout.paginas_grupos),
+                                  lambda c: desenho.criar_indice(c, largura, altura, layout.paginas_grupos))
+            for pagina, grupo, itens in paginas_conteudo:
+                categoria_atual = grupo if TIPO_ORDENACAO == 'C' else ""
+                codigos = [produto.codigo for _, produto in itens]
+                conteudo = []
+                for codigo, (posicao, produto) in zip(codigos, itens):
+                    hashes_produtos[codigo] = hash_registro(produto)
+                    conteudo.append((posicao.linha, posicao.coluna, hashes_produtos[codigo], imagens_preparadas.get(codigo)))
+                chave = chave_pagina(versao, "conteudo", pagina, categoria_atual, conteudo)
+                construcao.pagina(pagina, chave,
+                                  lambda c: desenho.desenhar_pagina_produtos(c, pagina, categoria_atual, itens, imagens_preparadas),
+                                  codigos)
+                erros_imagem += sum(1 for codigo in codigos if codigo not in imagens_preparadas)
+
+        with medicao.etapa("Gravação do PDF"):
+            # O nome da derivada já traz o hash da imagem original
+            imagens_usadas = {codigo: os.path.basename(preparada.caminho) for codigo, preparada in imagens_preparadas.items()}
+            alteradas = construcao.paginas_alteradas()
+            construcao.finalizar(hashes_produtos, imagens_usadas, navegacao)
+        print(f"Páginas: {construcao.renderizadas} desenhada(s), {construcao.reaproveitadas} reaproveitada(s) da última geração.")
+        if alteradas:
+            print(f"Páginas alteradas: {', '.join(str(p) for p in alteradas)}")
+
+    if linearizar_pdf:
+        if comparar_tamanhos and antes is None:
+            antes = tamanhos_por_grupo(pdf_path, layout)
+        with medicao.etapa("Linearização"):
+            linearizar_pdfs([pdf_path])
+    with medicao.etapa("Índice de busca"):
+        busca = IndiceBusca()
+        busca.adicionar(paginas_conteudo, navegacao)
+        busca.gravar(caminho_indice_busca(pdf_path), pdf_path, layout.ultima_pagina)
+
+    print(f"✅ Catálogo gerado com sucesso: {pdf_path} ({os.path.getsize(pdf_path) / 1024 / 1024:.1f} MB)")
+    print(f"Total de páginas: {layout.ultima_pagina}")
+    if not trechos:
+        _, distintas, referencias, segundos_imagens = somar_trechos([uso_imagens(desenho.imagens_pdf, imagens_preparadas)],
+                                                                    juntos=True)
+    print(f"Imagens no PDF: {distintas} distinta(s) para {referencias} uso(s).")
+    comparacao = None
+    if comparar_tamanhos:
+        comparacao = {"antes": antes, "depois": tamanhos_por_grupo(pdf_path, layout)}
+        imprimir_tamanhos(comparacao["antes"], comparacao["depois"], _titulo_comparacao(entradas))
+    medicao.imprimir()
+    if erros_imagem > 0:
+        print(f"⚠️ {erros_imagem} imagem(ns) não encontrada(s) ou falhou no carregamento.")
+    return ResultadoVariante(variante.nome, pdf_path, layout.ultima_pagina, erros_imagem, medicao, segundos_imagens,
+                             comparacao)
@@ -0,0 +1,86 @@
+import os
+import re
+
+# Extensões aceitas, em ordem de prioridade quando o mesmo código tem mais de um arquivo
+EXTENSOES_IMAGEM = (".jpg", ".jpeg", ".png", ".jfif", ".webp")
+
+
+# === FUNÇÃO DE NORMALIZAÇÃO DO CÓDIGO ===
+def normalize_code(code_str):
+    """Garante que o código exato seja a primeira tentativa de nome de arquivo."""
+    code_str = str(code_str).strip()
+    tentativas = [code_str]
+    cleaned_code = re.sub(r'[.,]', '', code_str)
+    if cleaned_code != code_str:
+        tentativas.append(cleaned_code)
+    underscore_code = code_str.replace('.', '_')
+    if underscore_code != code_str and underscore_code != cleaned_code:
+        tentativas.append(underscore_code)
+    return list(dict.fromkeys(tentativas))
+
+
+# === ÍNDICE DE IMAGENS ===
+def listar_imagens(img_dir):
+    """Lista (nome base, extensão, caminho) das imagens suportadas, sem diferenciar maiúsculas."""
+    arquivos = []
+    try:
+        entradas = os.scandir(img_dir)
+    except FileNotFoundError:
+        return arquivos
+    with entradas:
+        for entrada in entradas:
+            if not entrada.is_file():
+                continue
+            base, ext = os.path.splitext(entrada.name)
+            ext = ext.lower()
+            if ext in EXTENSOES_IMAGEM:
+                arquivos.append((base.strip().lower(), ext, entrada.path))
+    return arquivos
+
+
+def construir_indice_imagens(img_dir):
+    """Lê o diretório uma única vez e monta o dicionário código normalizado -> caminho."""
+    prioridade = {ext: i for i, ext in enumerate(EXTENSOES_IMAGEM)}
+    escolhidos = {}
+    for base, ext, caminho in listar_imagens(img_dir):
+        atual = escolhidos.get(base)
+        if atual is None or prioridade[ext] < prioridade[atual[0]]:
+            escolhidos[base] = (ext, caminho)
+    return {base: caminho for base, (ext, caminho) in escolhidos.items()}
+
+
+def localizar_imagem(indice, codigo):
+    """Retorna o caminho da imagem do produto ou None, testando as variações do código."""
+    if not codigo:
+        return None
+    for cod in normalize_code(codigo):
+        caminho = indice.get(cod.lower())
+        if caminho is not None:
+            return caminho
+    return None
+
+
+def relatorio_imagens(indice, codigos, img_dir):
+    """Retorna (imagens órfãs, códigos sem imagem) para os códigos informados."""
+    usados = set()
+    faltantes = []
+    for codigo in codigos:
+        caminho = localizar_imagem(indice, codigo)
+        if caminho is None:
+            faltantes.append(codigo)
+        else:
+            usados.add(caminho)
+    orfas = sorted(caminho for _, _, caminho in listar_imagens(img_dir) if caminho not in usados)
+    return orfas, faltantes
+
+
+def imprimir_relatorio_imagens(orfas, faltantes, limite=20):
+    """Mostra no console o resumo de imagens órfãs e códigos sem imagem."""
+    if faltantes:
+        print(f"⚠️ {len(faltantes)} código(s) sem imagem:")
+        for codigo in faltantes[:limite]:
+            print(f"   - {codigo}")
+        if len(faltantes) > limite:
+            print(f"   ... e mais {len(faltantes) - limite}")
+    if orfas:
+        print(f"ℹ️ {len(orfas)} imagem(ns) sem produto correspondente na planilha.")
@@ -0,0 +1,163 @@
+import glob
+import hashlib
+import json
+import os
+
+from reportlab.lib.pagesizes import A4
+
+from gerador_catalogo.configuracao import img_dir, logo_path
+
+# O canvas do reportlab e a junção (pypdf) só são importados ao desenhar ou juntar
+# páginas: a linha de comando usa este módulo para ver se nada mudou antes de
+# carregar o resto do pacote
+
+# === CONFIGURAÇÕES DA GERAÇÃO INCREMENTAL ===
+CACHE_PAGINAS = ".cache_paginas"
+PACOTE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+
+def _hash_json(valor):
+    return hashlib.sha1(json.dumps(valor, sort_keys=True, default=str).encode("utf-8")).hexdigest()
+
+
+def chave_pagina(*partes):
+    """Chave de cache de uma página: muda sempre que algo desenhado nela muda."""
+    return _hash_json(partes)
+
+
+def hash_registro(valores):
+    """Hash dos valores de um produto (registro ou linha da planilha).
+
+    Números são arredondados para que ruído de ponto flutuante ao salvar a
+    planilha (46.309999999999995 x 46.31) não invalide a página.
+    """
+    return _hash_json([str(round(v, 6)) if isinstance(v, float) else str(v) for v in valores])
+
+
+def versao_gerador(*arquivos):
+    """Hash do código que desenha as páginas (script + pacote), para invalidar o cache quando ele muda."""
+    h = hashlib.sha1()
+    for caminho in list(arquivos) + sorted(glob.glob(os.path.join(PACOTE_DIR, "*.py"))):
+        with open(caminho, "rb") as f:
+            h.update(f.read())
+    return h.hexdigest()
+
+
+def versao_incremental(opcoes, dpi, qualidade):
+    """Chave do que muda os bytes de toda página: código, opções do reportlab e DPI e qualidade das derivadas."""
+    return chave_pagina(versao_gerador(), opcoes, dpi, qualidade)
+
+
+def impressao_entradas(arquivos, diretorios=(), extras=()):
+    """Resumo barato (mtime e tamanho) das entradas, para saber sem ler a planilha se nada mudou."""
+    itens = []
+    for caminho in arquivos:
+        try:
+            info = os.stat(caminho)
+            itens.append((caminho, info.st_mtime_ns, info.st_size))
+        except FileNotFoundError:
+            itens.append((caminho, None, None))
+    for diretorio in diretorios:
+        with os.scandir(diretorio) as entradas:
+            for entrada in sorted(entradas, key=lambda e: e.name):
+                info = entrada.stat()
+                itens.append((entrada.path, info.st_mtime_ns, info.st_size))
+    itens.extend(extras)
+    return _hash_json(itens)
+
+
+def impressao_variante(variante, planilha, versao, data_geracao, desconto_minimo=None, ordenar_por_desconto=False):
+    """Impressão das entradas de uma variante na geração incremental (a do manifesto, se nada mudou).
+
+    versao é a de versao_incremental.
+    """
+    return impressao_entradas([planilha, logo_path], [img_dir],
+                              [versao, variante.nome, variante.tipo_ordenacao, data_geracao,
+                               desconto_minimo, ordenar_por_desconto])
+
+
+class ConstrucaoIncremental:
+    """Gera o PDF página a página, reaproveitando as páginas que não mudaram.
+
+    Cada página é gravada em um PDF de uma página só no cache, com nome igual à
+    sua chave. No fim as páginas são concatenadas no PDF final e o manifesto
+    (impressão das entradas, hash de cada produto e imagem e o layout das
+    páginas) fica ao lado do cache para a próxima execução. O cache de cada PDF
+    fica numa pasta com o nome dele e o hash do caminho absoluto, para que PDFs
+    de mesmo nome em outras pastas (--saida) não se sobrescrevam.
+    """
+
+    def __init__(self, pdf_path, impressao, cache_dir=CACHE_PAGINAS, pagesize=A4):
+        self.pdf_path = pdf_path
+        self.impressao = impressao
+        self.pagesize = pagesize
+        nome = os.path.splitext(os.path.basename(pdf_path))[0]
+        caminho = hashlib.sha1(os.path.abspath(pdf_path).encode("utf-8")).hexdigest()[:12]
+        self.cache_dir = os.path.join(cache_dir, f"{nome}_{caminho}")
+        self.caminho_manifesto = os.path.join(self.cache_dir, "manifesto.json")
+        os.makedirs(self.cache_dir, exist_ok=True)
+        try:
+            with open(self.caminho_manifesto, encoding="utf-8") as f:
+                self.anterior = json.load(f)
+        except (FileNotFoundError, ValueError):
+            self.anterior = {}
+        self.paginas = []
+        self.renderizadas = 0
+        self.reaproveitadas = 0
+
+    def nada_mudou(self):
+        """True se as entradas e o PDF final são os mesmos da última execução."""
+        try:
+            info = os.stat(self.pdf_path)
+        except FileNotFoundError:
+            return False
+        return (self.anterior.get("entradas") == self.impressao
+                and self.anterior.get("pdf") == [info.st_mtime_ns, info.st_size])
+
+    def paginas_alteradas(self):
+        """Números das páginas cuja chave mudou em relação à execução anterior."""
+        anteriores = {p["pagina"]: p["chave"] for p in self.anterior.get("paginas", [])}
+        return [p["pagina"] for p in self.paginas if anteriores.get(p["pagina"]) != p["chave"]]
+
+    def pagina(self, numero, chave, desenhar, produtos=()):
+        """Reaproveita a página do cache ou chama desenhar(c) em um canvas novo. Retorna True se desenhou."""
+        destino = os.path.join(self.cache_dir, f"{chave}.pdf")
+        self.paginas.append({"pagina": numero, "chave": chave, "produtos": list(produtos)})
+        if os.path.exists(destino):
+            self.reaproveitadas += 1
+            return False
+        from reportlab.pdfgen import canvas
+
+        temporario = f"{destino}.{os.getpid()}.tmp"
+        c = canvas.Canvas(temporario, pagesize=self.pagesize)
+        desenhar(c)
+        c.save()
+        os.replace(temporario, destino)
+        self.renderizadas += 1
+        return True
+
+    def finalizar(self, produtos, imagens, navegacao=None):
+        """Concatena as páginas no PDF final, grava o manifesto e apaga páginas que saíram do catálogo.
+
+        Os destinos e o sumário (navegacao) entram só na junção, fora das páginas em cache.
+        """
+        from gerador_catalogo.trechos import juntar_pdfs
+
+        juntar_pdfs([os.path.join(self.cache_dir, f"{registro['chave']}.pdf") for registro in self.paginas],
+                    self.pdf_path, navegacao)
+
+        usadas = {f"{registro['chave']}.pdf" for registro in self.paginas}
+        for nome in os.listdir(self.cache_dir):
+            if nome.endswith(".pdf") and nome not in usadas:
+                os.remove(os.path.join(self.cache_dir, nome))
+
+        info = os.stat(self.pdf_path)
+        manifesto = {
+            "entradas": self.impressao,
+            "pdf": [info.st_mtime_ns, info.st_size],
+            "produtos": produtos,
+            "imagens": imagens,
+            "paginas": self.paginas,
+        }
+        with open(self.caminho_manifesto, "w", encoding="utf-8") as f:
+            json.dump(manifesto, f, ensure_ascii=False)
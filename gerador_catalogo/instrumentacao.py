@@ -0,0 +1,121 @@
+import json
+import os
+import sys
+import time
+from contextlib import contextmanager
+
+from pypdf import PdfReader
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+
+def _cpu():
+    """CPU do processo e dos filhos já encerrados (usuário + sistema), em segundos."""
+    t = os.times()
+    return t.user + t.system, t.children_user + t.children_system
+
+
+class Instrumentacao:
+    """Tempo de parede e de CPU de cada etapa, na ordem em que as etapas rodaram.
+
+    A CPU dos processos de trabalho só é contada depois que o pool termina, por
+    isso aparece separada, como cpu_filhos_s.
+    """
+
+    def __init__(self):
+        self.etapas = {}
+
+    @contextmanager
+    def etapa(self, nome):
+        inicio = time.perf_counter()
+        cpu, cpu_filhos = _cpu()
+        try:
+            yield
+        finally:
+            fim_cpu, fim_cpu_filhos = _cpu()
+            registro = self.etapas.setdefault(nome, {"parede_s": 0.0, "cpu_s": 0.0, "cpu_filhos_s": 0.0})
+            registro["parede_s"] += time.perf_counter() - inicio
+            registro["cpu_s"] += fim_cpu - cpu
+            registro["cpu_filhos_s"] += fim_cpu_filhos - cpu_filhos
+
+    def imprimir(self):
+        for nome, registro in self.etapas.items():
+            cpu = f"CPU {registro['cpu_s']:.2f} s"
+            if registro["cpu_filhos_s"] >= 0.005:
+                cpu += f" + {registro['cpu_filhos_s']:.2f} s nos processos"
+            print(f"   {nome}: {registro['parede_s']:.2f} s ({cpu})")
+
+
+def pico_memoria_mb(filhos=False):
+    """Pico de memória residente (RSS) do processo, ou do maior processo filho, em MB."""
+    if resource is None:
+        return None
+    pico = resource.getrusage(resource.RUSAGE_CHILDREN if filhos else resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss vem em bytes no macOS e em KB no Linux
+    return pico / (1024 * 1024) if sys.platform == "darwin" else pico / 1024
+
+
+def _tamanho_bruto(objeto):
+    dados = getattr(objeto, "_data", None)
+    return len(dados) if dados is not None else 0
+
+
+def _bytes_xobjects(recursos, vistos):
+    """Bytes dos XObjects (imagens e formulários) ainda não contados em páginas anteriores."""
+    total = 0
+    xobjects = recursos.get("/XObject") if recursos else None
+    for referencia in (xobjects.get_object().values() if xobjects else ()):
+        chave = getattr(referencia, "idnum", id(referencia))
+        if chave in vistos:
+            continue
+        vistos.add(chave)
+        objeto = referencia.get_object()
+        total += _tamanho_bruto(objeto)
+        if objeto.get("/Subtype") == "/Form":
+            total += _bytes_xobjects(objeto.get("/Resources"), vistos)
+    return total
+
+
+def bytes_por_pagina(pdf_path):
+    """Estimativa do peso de cada página no PDF.
+
+    Conta o conteúdo (comprimido) da página e as imagens na primeira página em
+    que aparecem; as repetições seguintes não custam nada no arquivo.
+    """
+    vistos = set()
+    tamanhos = []
+    # Com o arquivo aberto (e não o caminho) o pypdf lê sob demanda, sem carregar o PDF inteiro
+    with open(pdf_path, "rb") as f:
+        reader = PdfReader(f)
+        for pagina in reader.pages:
+            conteudos = pagina.get("/Contents")
+            conteudos = conteudos.get_object() if conteudos is not None else []
+            if not isinstance(conteudos, list):
+                conteudos = [conteudos]
+            total = sum(_tamanho_bruto(conteudo.get_object()) for conteudo in conteudos)
+            recursos = pagina.get("/Resources")
+            total += _bytes_xobjects(recursos.get_object() if recursos is not None else None, vistos)
+            tamanhos.append(total)
+            # Os objetos já medidos não precisam ficar no cache do reader
+            reader.resolved_objects.clear()
+    return tamanhos
+
+
+def destaques_imagens(custos, quantidade=10):
+    """As imagens mais lentas (preparo + desenho) e as maiores (arquivo original), para o relatório."""
+    itens = [dict(custo, caminho=caminho) for caminho, custo in custos.items()]
+    return {
+        "mais_lentas": sorted(itens, key=lambda c: c["segundos"] + c.get("desenho_s", 0.0), reverse=True)[:quantidade],
+        "maiores": sorted(itens, key=lambda c: c["bytes_origem"], reverse=True)[:quantidade],
+    }
+
+
+def gravar_relatorio(caminho, relatorio):
+    """Grava o relatório da geração em JSON."""
+    temporario = f"{caminho}.{os.getpid()}.tmp"
+    with open(temporario, "w", encoding="utf-8") as f:
+        json.dump(relatorio, f, ensure_ascii=False, indent=2, default=str)
+    os.replace(temporario, caminho)
@@ -0,0 +1,69 @@
+import math
+from collections import namedtuple
+
+# Geometria da grade de cards de uma página (tudo em pontos)
+Grade = namedtuple("Grade", [
+    "produtos_por_linha", "x_inicio", "y_inicio", "largura_bloco", "altura_bloco",
+    "espacamento_horizontal", "espacamento_vertical", "limite_inferior",
+])
+
+# Posição exata de um card: página, linha e coluna na grade, e canto superior esquerdo
+Posicao = namedtuple("Posicao", ["pagina", "linha", "coluna", "x", "y", "grupo"])
+
+# Resultado da paginação: uma Posicao por produto (na ordem recebida), a primeira
+# página de cada grupo, as páginas de cada grupo e a última página de conteúdo
+Layout = namedtuple("Layout", ["posicoes", "paginas_grupos", "paginas_por_grupo", "ultima_pagina"])
+
+
+def linhas_por_pagina(grade):
+    """Quantas linhas de cards cabem acima do limite inferior (a primeira linha sempre cabe)."""
+    espaco = grade.y_inicio - grade.altura_bloco - grade.limite_inferior
+    return max(1, math.floor(espaco / grade.espacamento_vertical) + 1)
+
+
+def calcular_layout(grupos, grade, pagina_inicial=1, nova_pagina_por_grupo=True):
+    """Calcula a posição de cada card sem desenhar nada.
+
+    grupos é uma sequência de (nome, quantidade de produtos). Com
+    nova_pagina_por_grupo, cada grupo começa no topo de uma página nova, como no
+    modo por categoria; sem ele os grupos seguem na mesma grade.
+    """
+    por_linha = grade.produtos_por_linha
+    linhas = linhas_por_pagina(grade)
+    por_pagina = por_linha * linhas
+
+    posicoes = []
+    paginas_grupos = {}
+    paginas_por_grupo = {}
+    pagina = pagina_inicial
+    slot = 0  # posição do próximo card dentro da página atual
+
+    for nome, quantidade in grupos:
+        if nova_pagina_por_grupo and slot:
+            pagina += 1
+            slot = 0
+        paginas_grupos[nome] = pagina
+        primeira = pagina
+        for _ in range(quantidade):
+            if slot == por_pagina:
+                pagina += 1
+                slot = 0
+            linha, coluna = divmod(slot, por_linha)
+            x = grade.x_inicio + coluna * (grade.largura_bloco + grade.espacamento_horizontal)
+            y = grade.y_inicio - linha * grade.espacamento_vertical
+            posicoes.append(Posicao(pagina, linha, coluna, x, y, nome))
+            slot += 1
+        paginas_por_grupo[nome] = pagina - primeira + 1 if quantidade else 0
+
+    ultima_pagina = pagina if posicoes else pagina_inicial
+    return Layout(posicoes, paginas_grupos, paginas_por_grupo, ultima_pagina)
+
+
+def agrupar_por_pagina(posicoes, itens):
+    """Junta cada posição ao seu item e agrupa por página: lista de (página, grupo, [(posicao, item)])."""
+    paginas = []
+    for posicao, item in zip(posicoes, itens):
+        if not paginas or paginas[-1][0] != posicao.pagina:
+            paginas.append((posicao.pagina, posicao.grupo, []))
+        paginas[-1][2].append((posicao, item))
+    return paginas
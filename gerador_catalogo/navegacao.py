@@ -0,0 +1,229 @@
+import re
+import unicodedata
+from collections import namedtuple
+
+from pypdf.generic import Destination, Fit
+from reportlab.pdfbase.pdfdoc import LinkAnnotation, PDFArray, PDFDictionary, PDFString
+
+# Um destino nomeado do PDF: nome, página (o número impresso, que no catálogo com
+# capa é também a posição no arquivo) e a altura que fica no topo da tela
+Destino = namedtuple("Destino", ["nome", "pagina", "topo"])
+
+# Uma entrada do sumário (outline) do PDF: título, nome do destino, nível (0 é o de fora)
+# e se os filhos começam recolhidos
+EntradaSumario = namedtuple("EntradaSumario", ["titulo", "destino", "nivel", "fechada"], defaults=(False,))
+
+# Tudo o que o leitor usa para pular direto a um ponto do catálogo, calculado do
+# layout antes de desenhar: os destinos de cada página (página -> [Destino]) e o sumário
+Navegacao = namedtuple("Navegacao", ["destinos", "sumario"])
+
+
+def _ascii(texto):
+    return unicodedata.normalize("NFKD", str(texto)).encode("ascii", "ignore").decode("ascii")
+
+
+def destino_produto(codigo):
+    """Nome do destino do card de um produto: produto-01.0005 (o #nameddest= do link)."""
+    return "produto-" + re.sub(r"[^A-Za-z0-9._-]+", "_", _ascii(codigo))
+
+
+def destino_categoria(nome):
+    """Nome do destino da primeira página de uma categoria: categoria-freios_e_pastilhas."""
+    return "categoria-" + (re.sub(r"[^a-z0-9]+", "_", _ascii(nome).lower()).strip("_") or "sem_nome")
+
+
+def _sem_repetir(nome, usados):
+    # Nomes normalizados iguais (Freios e FREIOS, Câmaras e Camaras) ganham -2, -3...;
+    # o hífen não sai da normalização, então o sufixo não colide com outro nome
+    unico, n = nome, 1
+    while unico in usados:
+        n += 1
+        unico = f"{nome}-{n}"
+    usados.add(unico)
+    return unico
+
+
+def destinos_categorias(categorias):
+    """Categoria -> nome do destino, sem repetir nomes; na ordem das categorias no layout.
+
+    O índice (gerador_catalogo.desenho) e calcular_navegacao recebem as categorias
+    na mesma ordem, então chegam aos mesmos nomes.
+    """
+    usados = set()
+    return {categoria: _sem_repetir(destino_categoria(categoria), usados) for categoria in dict.fromkeys(categorias)}
+
+
+def destino_pagina(pagina):
+    """Nome do destino do alto de uma página de conteúdo: pagina-12 (o número impresso)."""
+    return f"pagina-{pagina}"
+
+
+def _inicial(descricao):
+    letra = _ascii(descricao).strip()[:1].upper()
+    return letra if letra.isalpha() else "#"
+
+
+def calcular_navegacao(paginas_conteudo, tipo_ordenacao, altura):
+    """Destinos e sumário a partir das páginas de agrupar_por_pagina, sem desenhar nada.
+
+    Toda página e todo card ganham um destino no seu topo. Por categoria ('C')
+    cada categoria tem um destino no alto da sua primeira página (o alvo dos links
+    do índice) e o sumário é a árvore categorias -> páginas; na ordem alfabética
+    ('A') as categorias se misturam e o sumário vai pela inicial da descrição, no
+    primeiro card de cada letra, com as páginas que começam nela.
+    """
+    destinos = {}
+    sumario = []
+    secao = None
+    categorias = destinos_categorias(grupo for _, grupo, _ in paginas_conteudo) if tipo_ordenacao == 'C' else {}
+    letras = set()
+    for pagina, grupo, itens in paginas_conteudo:
+        da_pagina = destinos.setdefault(pagina, [Destino(destino_pagina(pagina), pagina, altura)])
+        if tipo_ordenacao == 'C' and grupo != secao:
+            secao = grupo
+            nome = categorias[grupo]
+            da_pagina.append(Destino(nome, pagina, altura))
+            sumario.append(EntradaSumario(grupo, nome, 0, True))
+        for i, (posicao, produto) in enumerate(itens):
+            if tipo_ordenacao != 'C' and _inicial(produto.descricao) != secao:
+                secao = _inicial(produto.descricao)
+                # A mesma inicial volta depois de outras (minúsculas e acentos no fim da ordenação)
+                nome = _sem_repetir(f"letra-{secao}" if secao != "#" else "letra-outros", letras)
+                da_pagina.append(Destino(nome, pagina, posicao.y))
+                sumario.append(EntradaSumario(secao, nome, 0, True))
+            if i == 0:
+                sumario.append(EntradaSumario(f"Pág. {pagina}", destino_pagina(pagina), 1))
+            da_pagina.append(Destino(destino_produto(produto.codigo), pagina, posicao.y))
+    return Navegacao(destinos, sumario)
+
+
+def destinos_por_nome(navegacao):
+    """nome -> Destino; num nome repetido (códigos iguais na planilha) vale o primeiro."""
+    nomes = {}
+    for da_pagina in navegacao.destinos.values():
+        for destino in da_pagina:
+            nomes.setdefault(destino.nome, destino)
+    return nomes
+
+
+# === NO CANVAS DO REPORTLAB ===
+
+def marcar_destinos(c, navegacao, pagina):
+    """Marca os destinos da página; chamado antes de desenhá-la, enquanto ela é a página atual do canvas."""
+    if navegacao is None:
+        return
+    for destino in navegacao.destinos.get(pagina, ()):
+        c.bookmarkPage(destino.nome, fit="XYZ", top=destino.topo)
+
+
+def registrar_navegacao(c, navegacao):
+    """Grava o sumário e a árvore de destinos nomeados no canvas, antes do save().
+
+    O reportlab só escreve um bookmark onde ele é usado (sumário, links); os
+    nomes vão em /Names /Dests para que visualizadores e o site possam abrir o
+    PDF direto no card (catalogo.pdf#nameddest=produto-01.0005).
+    """
+    if navegacao is None:
+        return
+    for entrada in navegacao.sumario:
+        c.addOutlineEntry(entrada.titulo, entrada.destino, entrada.nivel, entrada.fechada)
+    if navegacao.sumario:
+        c.showOutline()
+    nomes = []
+    for nome in sorted(destinos_por_nome(navegacao)):
+        nomes += [PDFString(nome), c._bookmarkReference(nome)]
+    if nomes:
+        c._doc.Catalog.Names = PDFDictionary({"Dests": PDFDictionary({"Names": PDFArray(nomes)})})
+
+
+def link_destino(c, nome, retangulo):
+    """Link invisível na página atual para um destino nomeado.
+
+    Pelo nome, e não pela página, o link vale mesmo quando o destino está em
+    outro trecho ou página em cache: quem resolve é a árvore /Dests do PDF final.
+    """
+    c._addAnnotation(LinkAnnotation(retangulo, "", PDFString(nome), Border=PDFArray([0, 0, 0])))
+
+
+# === NA JUNÇÃO DE PDFS (gerador_catalogo.trechos) ===
+
+def _texto_pdf(texto):
+    # Texto com acentos: UTF-16BE com BOM, em hexadecimal
+    return b"<FEFF" + texto.encode("utf-16-be").hex().upper().encode("ascii") + b">"
+
+
+def _nome_pdf(nome):
+    return b"(" + nome.encode("ascii").replace(b"\\", b"\\\\").replace(b"(", b"\\(").replace(b")", b"\\)") + b")"
+
+
+def _arvore(sumario):
+    """Entradas em ordem com o nível de cada uma -> lista de (entrada, filhos)."""
+    raiz = []
+    pilha = [raiz]
+    for entrada in sumario:
+        del pilha[entrada.nivel + 1:]
+        filhos = []
+        pilha[-1].append((entrada, filhos))
+        pilha.append(filhos)
+    return raiz
+
+
+def _gravar_itens(gravador, nos, pai, destinos):
+    """Grava um nível do sumário; retorna (primeiro, último, itens visíveis).
+
+    Uma entrada fechada conta só ela mesma para o nível de cima e grava o total
+    dos filhos com sinal negativo, como pede o formato.
+    """
+    numeros = [gravador.reservar() for _ in nos]
+    visiveis = len(nos)
+    for i, ((entrada, filhos), numero) in enumerate(zip(nos, numeros)):
+        partes = [b"/Title " + _texto_pdf(entrada.titulo), b"/Parent %d 0 R" % pai, b"/Dest " + destinos[entrada.destino]]
+        if i > 0:
+            partes.append(b"/Prev %d 0 R" % numeros[i - 1])
+        if i + 1 < len(numeros):
+            partes.append(b"/Next %d 0 R" % numeros[i + 1])
+        if filhos:
+            primeiro, ultimo, total = _gravar_itens(gravador, filhos, numero, destinos)
+            partes.append(b"/First %d 0 R /Last %d 0 R /Count %d" % (primeiro, ultimo, -total if entrada.fechada else total))
+            if not entrada.fechada:
+                visiveis += total
+        gravador.gravar(b"<< " + b" ".join(partes) + b" >>", numero, deduplicar=False)
+    return numeros[0], numeros[-1], visiveis
+
+
+def gravar_navegacao(gravador, navegacao):
+    """Grava os destinos nomeados e o sumário no PDF juntado; retorna as entradas do catálogo.
+
+    As páginas dos destinos são posições no PDF final (gravador.paginas), que é
+    onde o layout já as colocou.
+    """
+    destinos = {nome: b"[%d 0 R /XYZ null %.2f null]" % (gravador.paginas[destino.pagina], destino.topo)
+                for nome, destino in destinos_por_nome(navegacao).items()}
+    if not destinos:
+        return b""
+    nomes = b" ".join(_nome_pdf(nome) + b" " + destinos[nome] for nome in sorted(destinos))
+    catalogo = b" /Names %d 0 R" % gravador.gravar(b"<< /Dests << /Names [ " + nomes + b" ] >> >>", deduplicar=False)
+    if navegacao.sumario:
+        numero = gravador.reservar()
+        primeiro, ultimo, total = _gravar_itens(gravador, _arvore(navegacao.sumario), numero, destinos)
+        gravador.gravar(b"<< /Type /Outlines /First %d 0 R /Last %d 0 R /Count %d >>" % (primeiro, ultimo, total),
+                        numero, deduplicar=False)
+        catalogo += b" /Outlines %d 0 R /PageMode /UseOutlines" % numero
+    return catalogo
+
+
+def gravar_navegacao_writer(writer, navegacao):
+    """O mesmo que gravar_navegacao, pela API pública do PdfWriter do pypdf (junção sem a cópia direta)."""
+    destinos = destinos_por_nome(navegacao)
+    for nome in sorted(destinos):
+        destino = destinos[nome]
+        writer.add_named_destination_object(Destination(nome, writer.pages[destino.pagina].indirect_reference,
+                                                        Fit.xyz(top=round(destino.topo, 2))))
+    pais = []
+    for entrada in navegacao.sumario:
+        del pais[entrada.nivel:]
+        destino = destinos[entrada.destino]
+        pais.append(writer.add_outline_item(entrada.titulo, destino.pagina, pais[-1] if pais else None,
+                                            fit=Fit.xyz(top=round(destino.topo, 2)), is_open=not entrada.fechada))
+    if navegacao.sumario:
+        writer.page_mode = "/UseOutlines"
@@ -0,0 +1,122 @@
+import os
+import time
+import traceback
+
+from gerador_catalogo.imagens import EXTENSOES_IMAGEM, localizar_imagem
+
+# === CONFIGURAÇÕES DO MODO DE OBSERVAÇÃO ===
+# Intervalo entre duas leituras do diretório e silêncio exigido depois da última alteração
+INTERVALO = 0.3
+ESPERA = 0.6
+
+
+def retrato(arquivos, diretorios):
+    """mtime e tamanho dos arquivos e das imagens dos diretórios: caminho -> (mtime_ns, tamanho).
+
+    Só stat, sem abrir nada; os arquivos temporários do Excel (~$...) ficam de fora.
+    """
+    itens = {}
+    for caminho in arquivos:
+        try:
+            info = os.stat(caminho)
+        except FileNotFoundError:
+            continue
+        itens[caminho] = (info.st_mtime_ns, info.st_size)
+    for diretorio in diretorios:
+        try:
+            entradas = os.scandir(diretorio)
+        except FileNotFoundError:
+            continue
+        with entradas:
+            for entrada in entradas:
+                if entrada.name.startswith("~$") or os.path.splitext(entrada.name)[1].lower() not in EXTENSOES_IMAGEM:
+                    continue
+                try:
+                    info = entrada.stat()
+                except FileNotFoundError:
+                    continue
+                itens[entrada.path] = (info.st_mtime_ns, info.st_size)
+    return itens
+
+
+def diferencas(antes, depois):
+    """Caminhos criados, apagados ou alterados entre dois retratos."""
+    return {caminho for caminho in antes.keys() | depois.keys() if antes.get(caminho) != depois.get(caminho)}
+
+
+class Observador:
+    """Verifica periodicamente a planilha e a pasta de imagens (polling, sem dependências).
+
+    Uma rajada de alterações (a planilha salva pelo Excel, várias fotos copiadas
+    de uma vez) vira uma só rodada: espera até que nada mude por `espera` segundos.
+    """
+
+    def __init__(self, arquivos, diretorios, intervalo=INTERVALO, espera=ESPERA):
+        self.arquivos = list(arquivos)
+        self.diretorios = list(diretorios)
+        self.intervalo = intervalo
+        self.espera = espera
+        self.atual = retrato(self.arquivos, self.diretorios)
+
+    def esperar(self):
+        """Bloqueia até a próxima rajada de alterações terminar e retorna os caminhos alterados."""
+        base = self.atual
+        while True:
+            time.sleep(self.intervalo)
+            novo = retrato(self.arquivos, self.diretorios)
+            if novo != base:
+                break
+        ultimo = time.monotonic()
+        while time.monotonic() - ultimo < self.espera:
+            time.sleep(self.intervalo)
+            seguinte = retrato(self.arquivos, self.diretorios)
+            if seguinte != novo:
+                novo = seguinte
+                ultimo = time.monotonic()
+        self.atual = novo
+        return diferencas(base, novo)
+
+
+def imagens_usadas(entradas, tipos_ordenacao):
+    """Arquivos de imagem que algum produto de alguma das ordenações usa, pelo índice atual."""
+    indice = entradas.indice_imagens
+    codigos = {produto.codigo for tipo in tipos_ordenacao for produto in entradas.produtos(tipo)}
+    usados = (localizar_imagem(indice, codigo) for codigo in codigos)
+    return {caminho for caminho in usados if caminho is not None}
+
+
+def observar(gerar, entradas, planilha, img_dir, tipos_ordenacao):
+    """Roda gerar() e depois a cada alteração na planilha ou nas imagens, até o Ctrl+C.
+
+    Planilha, índice, derivadas e caches de texto e desenho continuam quentes no
+    processo; cada rodada só descarta o que mudou, e o próprio gerar() (incremental)
+    só redesenha as páginas afetadas. Imagens que nenhum produto das variantes
+    geradas (tipos_ordenacao, as ordenações delas) usa não disparam rodada. Um
+    erro (planilha salva pela metade, por exemplo) não encerra a observação.
+    """
+    observador = Observador([planilha], [img_dir])
+    alteradas = None
+    while True:
+        inicio = time.perf_counter()
+        try:
+            gerar()
+            usadas = imagens_usadas(entradas, tipos_ordenacao)
+            if alteradas is not None:
+                print(f"\n⏱️ Catálogo atualizado em {time.perf_counter() - inicio:.2f} s.")
+        except (Exception, SystemExit) as e:
+            # Depois de uma falha qualquer alteração dispara uma nova tentativa
+            usadas = None
+            if not isinstance(e, SystemExit):  # a leitura da planilha já mostrou o erro
+                traceback.print_exc()
+            print("⚠️ A geração falhou; corrija e salve de novo.")
+
+        print(f"\n👀 Observando {planilha} e {img_dir}/ (Ctrl+C para sair)...")
+        while True:
+            alteradas = observador.esperar()
+            planilha_alterada = planilha in alteradas
+            imagens = alteradas - {planilha}
+            entradas.invalidar(planilha=planilha_alterada, imagens=imagens)
+            if usadas is None or planilha_alterada or imagens & (usadas | imagens_usadas(entradas, tipos_ordenacao)):
+                break
+            print(f"ℹ️ {len(imagens)} imagem(ns) alterada(s), mas nenhum produto as usa.")
+        print(f"\n🔄 Alterado: {', '.join(sorted(alteradas)[:5])}{' ...' if len(alteradas) > 5 else ''}")
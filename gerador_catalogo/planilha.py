@@ -0,0 +1,190 @@
+import json
+import os
+import pickle
+
+import pandas as pd
+
+from gerador_catalogo.cache_imagens import hash_arquivo
+
+# === CONFIGURAÇÕES DA LEITURA DA PLANILHA ===
+CACHE_PLANILHA = ".cache_planilha"
+MANIFESTO = "manifesto.json"
+# Muda quando a forma de ler a planilha muda, para não reaproveitar snapshots antigos
+VERSAO_SNAPSHOT = 1
+# Acima deste tamanho o .xlsx é lido em modo somente leitura, linha a linha (menos memória que o read_excel)
+LIMITE_STREAMING = 20 * 1024 * 1024
+TAMANHO_BLOCO = 5000
+COLUNA_CODIGO = "Código do Produto"
+
+
+def ler_csv(caminho, tamanho_bloco=None):
+    """Lê a planilha exportada em CSV (separador ';' com vírgula decimal, ou ',' com ponto).
+
+    Com tamanho_bloco devolve um iterador de DataFrames em vez de um DataFrame só.
+    """
+    with open(caminho, encoding="utf-8-sig") as f:
+        cabecalho = f.readline()
+    separador = ";" if cabecalho.count(";") > cabecalho.count(",") else ","
+    return pd.read_csv(caminho, sep=separador, decimal="," if separador == ";" else ".",
+                       dtype={COLUNA_CODIGO: str}, encoding="utf-8-sig", chunksize=tamanho_bloco)
+
+
+def iterar_xlsx(caminho, tamanho_bloco=TAMANHO_BLOCO):
+    """Lê o .xlsx em modo somente leitura e devolve DataFrames de até tamanho_bloco linhas.
+
+    O openpyxl em read_only não carrega a planilha inteira na memória; só o bloco
+    atual é convertido em DataFrame.
+    """
+    from openpyxl import load_workbook
+
+    livro = load_workbook(caminho, read_only=True, data_only=True)
+    try:
+        linhas = livro.worksheets[0].iter_rows(values_only=True)
+        colunas = [str(valor) if valor is not None else f"Unnamed: {i}"
+                   for i, valor in enumerate(next(linhas, ()))]
+        indice_codigo = colunas.index(COLUNA_CODIGO) if COLUNA_CODIGO in colunas else None
+        bloco = []
+        entregues = 0
+        for linha in linhas:
+            if all(valor is None for valor in linha):
+                continue
+            linha = list(linha) + [None] * (len(colunas) - len(linha))
+            if indice_codigo is not None and linha[indice_codigo] is not None:
+                # Igual ao dtype=str do read_excel: preserva zeros à esquerda de códigos em texto
+                linha[indice_codigo] = str(linha[indice_codigo])
+            bloco.append(linha[:len(colunas)])
+            if len(bloco) == tamanho_bloco:
+                yield pd.DataFrame(bloco, columns=colunas)
+                entregues += 1
+                bloco = []
+        if bloco or not entregues:
+            yield pd.DataFrame(bloco, columns=colunas)
+    finally:
+        livro.close()
+
+
+def iterar_arquivo(caminho, tamanho_bloco=TAMANHO_BLOCO):
+    """Blocos de DataFrame direto do arquivo: o .xlsx em modo somente leitura, o .csv em partes."""
+    if caminho.lower().endswith(".csv"):
+        yield from ler_csv(caminho, tamanho_bloco)
+    else:
+        yield from iterar_xlsx(caminho, tamanho_bloco)
+
+
+def ler_arquivo(caminho, streaming=None):
+    """Lê a planilha (.xlsx ou .csv) direto do arquivo, sem snapshot, em um DataFrame só.
+
+    streaming=None escolhe sozinho: .xlsx maiores que LIMITE_STREAMING são lidos
+    em modo somente leitura, bloco a bloco, e os blocos são juntados no fim.
+    """
+    if caminho.lower().endswith(".csv"):
+        return ler_csv(caminho)
+    if streaming is None:
+        streaming = os.path.getsize(caminho) > LIMITE_STREAMING
+    if streaming:
+        blocos = list(iterar_xlsx(caminho))
+        return pd.concat(blocos, ignore_index=True) if len(blocos) > 1 else blocos[0]
+    return pd.read_excel(caminho, dtype={COLUNA_CODIGO: str})
+
+
+def _ler_manifesto(cache_dir):
+    try:
+        with open(os.path.join(cache_dir, MANIFESTO), encoding="utf-8") as f:
+            return json.load(f)
+    except (FileNotFoundError, ValueError):
+        return {}
+
+
+def _gravar_manifesto(cache_dir, manifesto):
+    destino = os.path.join(cache_dir, MANIFESTO)
+    temporario = f"{destino}.{os.getpid()}.tmp"
+    with open(temporario, "w", encoding="utf-8") as f:
+        json.dump(manifesto, f, ensure_ascii=False)
+    os.replace(temporario, destino)
+
+
+def _snapshots(sha):
+    # O DataFrame inteiro (ler_planilha) e os blocos (ler_planilha_em_blocos) da mesma planilha
+    return f"{sha}_v{VERSAO_SNAPSHOT}.pkl", f"{sha}_v{VERSAO_SNAPSHOT}_blocos.pkl"
+
+
+def _sha_planilha(caminho, cache_dir):
+    """SHA-1 da planilha, sem recalcular se mtime e tamanho batem com o manifesto.
+
+    Quando a planilha mudou, atualiza o manifesto e apaga os snapshots que
+    nenhuma entrada usa mais (versões antigas da planilha).
+    """
+    info = os.stat(caminho)
+    os.makedirs(cache_dir, exist_ok=True)
+    manifesto = _ler_manifesto(cache_dir)
+    chave = os.path.abspath(caminho)
+    registro = manifesto.get(chave)
+
+    if registro and registro[:2] == [info.st_mtime_ns, info.st_size]:
+        sha = registro[2]
+    else:
+        sha = hash_arquivo(caminho)
+
+    if registro != [info.st_mtime_ns, info.st_size, sha]:
+        manifesto[chave] = [info.st_mtime_ns, info.st_size, sha]
+        _gravar_manifesto(cache_dir, manifesto)
+        usados = {nome for registro in manifesto.values() for nome in _snapshots(registro[2])}
+        for nome in os.listdir(cache_dir):
+            if nome.endswith(".pkl") and nome not in usados:
+                os.remove(os.path.join(cache_dir, nome))
+    return sha
+
+
+def ler_planilha(caminho, cache_dir=CACHE_PLANILHA, streaming=None):
+    """Lê a planilha de produtos, reaproveitando o snapshot já interpretado quando ela não mudou.
+
+    O snapshot é o DataFrame em pickle, nomeado pelo SHA-1 da planilha. Se mtime
+    e tamanho batem com o manifesto nem o hash é recalculado; se só o mtime mudou
+    (planilha salva de novo sem alterações), o hash encontra o mesmo snapshot.
+    Retorna (df, reaproveitado).
+    """
+    snapshot = os.path.join(cache_dir, _snapshots(_sha_planilha(caminho, cache_dir))[0])
+    try:
+        return pd.read_pickle(snapshot), True
+    except (FileNotFoundError, EOFError, ValueError, pickle.UnpicklingError):
+        df = ler_arquivo(caminho, streaming)
+        temporario = f"{snapshot}.{os.getpid()}.tmp"
+        df.to_pickle(temporario)
+        os.replace(temporario, snapshot)
+        return df, False
+
+
+def _ler_blocos(snapshot):
+    with open(snapshot, "rb") as f:
+        while True:
+            try:
+                yield pickle.load(f)
+            except EOFError:
+                return
+
+
+def _gravar_blocos(blocos, snapshot):
+    # Grava cada bloco ao entregá-lo; o snapshot só vale se a leitura chegou ao fim
+    temporario = f"{snapshot}.{os.getpid()}.tmp"
+    try:
+        with open(temporario, "wb") as f:
+            for bloco in blocos:
+                pickle.dump(bloco, f, protocol=pickle.HIGHEST_PROTOCOL)
+                yield bloco
+        os.replace(temporario, snapshot)
+    finally:
+        if os.path.exists(temporario):
+            os.remove(temporario)
+
+
+def ler_planilha_em_blocos(caminho, cache_dir=CACHE_PLANILHA, tamanho_bloco=TAMANHO_BLOCO):
+    """Como ler_planilha, mas devolve (iterador de blocos de DataFrame, reaproveitado).
+
+    Nem a leitura nem o snapshot montam a planilha inteira: o snapshot é uma
+    sequência de pickles, um por bloco, gravada enquanto o arquivo é lido e
+    relida do mesmo jeito nas próximas execuções.
+    """
+    snapshot = os.path.join(cache_dir, _snapshots(_sha_planilha(caminho, cache_dir))[1])
+    if os.path.exists(snapshot):
+        return _ler_blocos(snapshot), True
+    return _gravar_blocos(iterar_arquivo(caminho, tamanho_bloco), snapshot), False
@@ -0,0 +1,117 @@
+import os
+import time
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor
+
+from PIL import Image
+
+from gerador_catalogo.cache_imagens import derivar_imagem, pixels_para
+from gerador_catalogo.imagens import localizar_imagem
+
+# Resultado pronto para o desenho: derivada no cache e tamanho final (em pontos) dentro da área do card
+ImagemPreparada = namedtuple("ImagemPreparada", ["caminho", "largura", "altura"])
+
+
+def medir_na_area(img_largura, img_altura, largura_area, altura_area):
+    """Ajusta a imagem à largura da área e, se passar da altura máxima, à altura (mantendo a proporção)."""
+    proporcao = img_largura / img_altura
+    largura_final = largura_area
+    altura_final = largura_final / proporcao
+    if altura_final > altura_area:
+        altura_final = altura_area
+        largura_final = altura_final * proporcao
+    return largura_final, altura_final
+
+
+def _preparar_imagem(caminho, registro, cache_dir, largura_px, altura_px, qualidade, largura_area, altura_area):
+    """Tarefa de um processo de trabalho: gera/reaproveita a derivada e mede o resultado.
+
+    Devolve também o custo da imagem: segundos gastos e tamanho do original e da derivada.
+    """
+    inicio = time.perf_counter()
+    try:
+        registro, destino, gerada = derivar_imagem(caminho, registro, cache_dir, largura_px, altura_px, qualidade)
+        with Image.open(destino) as img:
+            img_largura, img_altura = img.size
+        custo = (time.perf_counter() - inicio, registro[1], os.path.getsize(destino))
+    except Exception as e:
+        return caminho, None, None, False, f"{type(e).__name__}: {e}", None
+    largura_final, altura_final = medir_na_area(img_largura, img_altura, largura_area, altura_area)
+    return caminho, registro, ImagemPreparada(destino, largura_final, altura_final), gerada, None, custo
+
+
+def executar_em_processos(funcao, tarefas, workers=None):
+    """Roda funcao(*tarefa) para cada tarefa, em processos de trabalho quando compensa, mantendo a ordem."""
+    workers = workers or os.cpu_count() or 1
+    if workers <= 1 or len(tarefas) <= 1:
+        return [funcao(*tarefa) for tarefa in tarefas]
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        return list(executor.map(funcao, *zip(*tarefas), chunksize=max(1, len(tarefas) // (workers * 4))))
+
+
+def preparar_imagens(codigos, indice, cache, largura_area, altura_area, workers=None, custos=None, memoria=None,
+                     dpi=None):
+    """Resolve, reduz e mede as imagens de todos os códigos antes do desenho do PDF.
+
+    Retorna (dicionário código -> ImagemPreparada, dicionário caminho -> erro). Códigos
+    sem imagem ficam fora do dicionário. Cada arquivo é processado uma vez, mesmo que
+    vários códigos apontem para ele, e os que já falharam antes (e não mudaram
+    desde então) nem são abertos. Se custos for um dicionário, recebe o custo de
+    cada arquivo (caminho -> segundos, bytes do original e da derivada, se foi gerada).
+    Se memoria for um dicionário (caminho -> ImagemPreparada) da mesma área, os
+    arquivos que já estão nele são reaproveitados sem abrir nada e os novos são
+    acrescentados; quem o guarda tira dele os arquivos que mudaram. dpi troca o DPI do
+    cache só nesta preparação (miniaturas), com o mesmo manifesto de hashes.
+    """
+    caminhos_por_codigo = {}
+    for codigo in codigos:
+        caminho = localizar_imagem(indice, codigo)
+        if caminho is not None:
+            caminhos_por_codigo[codigo] = caminho
+
+    largura_px, altura_px = pixels_para(largura_area, altura_area, cache.dpi if dpi is None else dpi)
+    erros = {}
+    tarefas = []
+    preparadas = {}
+    for caminho in sorted(set(caminhos_por_codigo.values())):
+        if memoria is not None and caminho in memoria:
+            preparadas[caminho] = memoria[caminho]
+            continue
+        erro = cache.falha_conhecida(caminho)
+        if erro is not None:
+            erros[caminho] = erro
+            continue
+        tarefas.append((caminho, cache.manifesto.get(caminho), cache.cache_dir, largura_px, altura_px,
+                        cache.qualidade, largura_area, altura_area))
+
+    resultados = executar_em_processos(_preparar_imagem, tarefas, workers)
+
+    for caminho, registro, preparada, gerada, erro, custo in resultados:
+        if erro is not None:
+            erros[caminho] = erro
+            cache.registrar_falha(caminho, erro)
+            continue
+        cache.registrar(caminho, registro, gerada)
+        preparadas[caminho] = preparada
+        if memoria is not None:
+            memoria[caminho] = preparada
+        if custos is not None:
+            segundos, bytes_origem, bytes_derivada = custo
+            custos[caminho] = {"segundos": segundos, "bytes_origem": bytes_origem,
+                               "bytes_derivada": bytes_derivada, "gerada": gerada, "derivada": preparada.caminho}
+
+    por_codigo = {codigo: preparadas[caminho] for codigo, caminho in caminhos_por_codigo.items() if caminho in preparadas}
+    return por_codigo, erros
+
+
+def ajustar_na_area(preparadas, largura_area, altura_area):
+    """Reaproveita imagens já preparadas para outra área de card, só refazendo a medida.
+
+    As derivadas preparadas para a maior área servem para áreas menores; a
+    proporção vem do próprio tamanho final já medido.
+    """
+    ajustadas = {}
+    for codigo, preparada in preparadas.items():
+        largura, altura = medir_na_area(preparada.largura, preparada.altura, largura_area, altura_area)
+        ajustadas[codigo] = preparada._replace(largura=largura, altura=altura)
+    return ajustadas
@@ -0,0 +1,303 @@
+import asyncio
+import contextlib
+import hashlib
+import html
+import io
+import json
+import os
+import shutil
+import tempfile
+import time
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from datetime import date
+from urllib.parse import parse_qs, quote, unquote, urlsplit
+
+from gerador_catalogo.configuracao import ENDERECO, PORTA, VARIANTES, img_dir, logo_path
+from gerador_catalogo.geracao import EntradasCompartilhadas, areas_das_grades, gerar_avulso, gerar_variante
+from gerador_catalogo.incremental import impressao_entradas, versao_gerador
+
+# === CONFIGURAÇÕES DO SERVIDOR ===
+CACHE_SERVIDOR = ".cache_servidor"
+MAXIMO_MEMORIA = 64 * 1024 * 1024
+MAXIMO_DISCO = 512 * 1024 * 1024
+# Por quanto tempo a versão dos dados calculada vale antes de olhar os arquivos de novo
+VALIDADE_VERSAO = 1.0
+VARIANTE_PADRAO = "categoria"
+
+
+class CacheArtefatos:
+    """PDFs já gerados, em um LRU na memória e outro em disco, limitados em bytes.
+
+    A chave inclui a versão dos dados, então uma planilha ou imagem nova gera
+    chaves novas e as antigas só saem pelo LRU. O disco sobrevive a reinícios do
+    servidor; a ordem do LRU em disco é o mtime, renovado a cada acerto.
+    """
+
+    def __init__(self, cache_dir=CACHE_SERVIDOR, maximo_memoria=MAXIMO_MEMORIA, maximo_disco=MAXIMO_DISCO):
+        self.cache_dir = cache_dir
+        self.maximo_memoria = maximo_memoria
+        self.maximo_disco = maximo_disco
+        self._memoria = OrderedDict()
+        self._bytes_memoria = 0
+        os.makedirs(cache_dir, exist_ok=True)
+
+    def caminho(self, chave):
+        return os.path.join(self.cache_dir, hashlib.sha1(json.dumps(chave).encode("utf-8")).hexdigest() + ".pdf")
+
+    def da_memoria(self, chave):
+        dados = self._memoria.get(chave)
+        if dados is not None:
+            self._memoria.move_to_end(chave)
+        return dados
+
+    def do_disco(self, chave):
+        """Lê o artefato do disco (bloqueante: roda fora do loop de eventos)."""
+        caminho = self.caminho(chave)
+        try:
+            with open(caminho, "rb") as f:
+                dados = f.read()
+            os.utime(caminho)
+        except FileNotFoundError:
+            return None
+        return dados
+
+    def guardar(self, chave, dados):
+        """Põe o artefato na memória, tirando os usados há mais tempo se passar do limite."""
+        if chave in self._memoria:
+            return
+        self._memoria[chave] = dados
+        self._bytes_memoria += len(dados)
+        while self._bytes_memoria > self.maximo_memoria and len(self._memoria) > 1:
+            _, antigo = self._memoria.popitem(last=False)
+            self._bytes_memoria -= len(antigo)
+
+    def aparar_disco(self):
+        """Apaga do disco os artefatos usados há mais tempo até caber no limite (bloqueante)."""
+        arquivos = []
+        with os.scandir(self.cache_dir) as entradas:
+            for entrada in entradas:
+                if entrada.name.endswith(".pdf"):
+                    info = entrada.stat()
+                    arquivos.append((info.st_mtime, info.st_size, entrada.path))
+        total = sum(tamanho for _, tamanho, _ in arquivos)
+        for _, tamanho, caminho in sorted(arquivos):
+            if total <= self.maximo_disco:
+                break
+            with contextlib.suppress(FileNotFoundError):
+                os.remove(caminho)
+            total -= tamanho
+
+
+# === TRABALHO NOS PROCESSOS DO POOL ===
+# Cada processo guarda as entradas da última versão dos dados que atendeu
+_estado = {"versao": None, "entradas": None}
+
+
+def _entradas(planilha, versao):
+    if _estado["versao"] != versao:
+        areas, areas_miniaturas = areas_das_grades()
+        _estado["entradas"] = EntradasCompartilhadas(planilha, workers=1, areas=areas, areas_miniaturas=areas_miniaturas)
+        _estado["versao"] = versao
+    return _estado["entradas"]
+
+
+def _aquecer(planilha, versao):
+    """Inicializador do pool: o processo já lê a planilha e ordena os produtos ao subir, não no primeiro pedido."""
+    # Um erro aqui quebraria o pool inteiro; o pedido que precisar da planilha mostra o erro
+    with contextlib.suppress(Exception, SystemExit), contextlib.redirect_stdout(io.StringIO()):
+        _entradas(planilha, versao).produtos('C')
+
+
+def _avisar_falha(futuro):
+    if not futuro.cancelled() and futuro.exception() is not None:
+        print(f"⚠️ Falha ao aparar o cache em disco: {futuro.exception()}")
+
+
+def _categorias(planilha, versao):
+    """Categorias da planilha com a quantidade de produtos de cada uma."""
+    produtos = _entradas(planilha, versao).produtos('C')
+    contagem = OrderedDict()
+    for produto in produtos:
+        contagem[produto.categoria] = contagem.get(produto.categoria, 0) + 1
+    return list(contagem.items())
+
+
+def _renderizar(planilha, versao, tipo, nome_variante, alvo, destino):
+    """Gera o artefato pedido em destino. LookupError se a categoria ou o produto não existir."""
+    entradas = _entradas(planilha, versao)
+    variante = VARIANTES[nome_variante]
+    temporario = f"{destino}.{os.getpid()}.tmp"
+    # O gerador fala bastante no console; no servidor basta o log das requisições
+    with contextlib.redirect_stdout(io.StringIO()):
+        if tipo == "catalogo":
+            pasta = tempfile.mkdtemp(prefix=".catalogo_", dir=os.path.dirname(destino))
+            try:
+                resultado = gerar_variante(variante, entradas, pasta, workers=1)
+                os.replace(resultado.pdf_path, temporario)
+            finally:
+                shutil.rmtree(pasta, ignore_errors=True)
+        elif tipo == "categoria":
+            produtos = [p for p in entradas.produtos('C') if p.categoria.casefold() == alvo.casefold()]
+            if not produtos:
+                raise LookupError(f"Categoria não encontrada: {alvo}")
+            gerar_avulso(variante, entradas, produtos, produtos[0].categoria, temporario)
+        else:
+            produtos = [p for p in entradas.produtos('C') if p.codigo.casefold() == alvo.casefold()]
+            if not produtos:
+                raise LookupError(f"Produto não encontrado: {alvo}")
+            gerar_avulso(variante, entradas, produtos[:1], produtos[0].categoria, temporario)
+    os.replace(temporario, destino)
+
+
+class ServidorCatalogo:
+    """Servidor HTTP local (asyncio) que gera os catálogos sob demanda.
+
+    Rotas: /catalog.pdf, /category/<nome>.pdf e /product/<código>, todas com
+    ?variante= opcional, e / com a lista das categorias. A geração roda no pool
+    de processos, nunca no loop de eventos; pedidos simultâneos do mesmo
+    artefato esperam a mesma geração. Cada processo do pool tem a sua cópia
+    das entradas, carregada quando ele sobe e refeita quando os dados mudam.
+    """
+
+    def __init__(self, planilha, workers=None, cache=None):
+        self.planilha = planilha
+        self.workers = workers or os.cpu_count() or 1
+        self.cache = cache or CacheArtefatos()
+        self.versao_codigo = versao_gerador()
+        versao = self._calcular_versao()
+        self.pool = ProcessPoolExecutor(max_workers=self.workers, initializer=_aquecer, initargs=(planilha, versao))
+        self._versao = (versao, time.monotonic())
+        self._categorias = (None, None)
+        self._em_andamento = {}
+
+    def _calcular_versao(self):
+        # Entra a data porque a capa mostra a data de geração
+        return impressao_entradas([self.planilha, logo_path], [img_dir], [self.versao_codigo, date.today().isoformat()])
+
+    async def versao(self):
+        """Versão dos dados (planilha, logo, imagens, código e data), recalculada no máximo a cada segundo."""
+        versao, calculada = self._versao
+        if versao is None or time.monotonic() - calculada > VALIDADE_VERSAO:
+            versao = await asyncio.get_running_loop().run_in_executor(None, self._calcular_versao)
+            self._versao = (versao, time.monotonic())
+        return versao
+
+    async def artefato(self, tipo, variante, alvo=None):
+        """PDF pedido, da memória, do disco ou gerado agora. Retorna (bytes, origem)."""
+        chave = [await self.versao(), tipo, variante, alvo]
+        chave_texto = json.dumps(chave)
+        dados = self.cache.da_memoria(chave_texto)
+        if dados is not None:
+            return dados, "memória"
+        futuro = self._em_andamento.get(chave_texto)
+        if futuro is not None:
+            dados, _ = await asyncio.shield(futuro)
+            return dados, "aguardou"
+        futuro = asyncio.ensure_future(self._construir(chave_texto, chave))
+        self._em_andamento[chave_texto] = futuro
+        futuro.add_done_callback(lambda _: self._em_andamento.pop(chave_texto, None))
+        return await asyncio.shield(futuro)
+
+    async def _construir(self, chave_texto, chave):
+        loop = asyncio.get_running_loop()
+        dados = await loop.run_in_executor(None, self.cache.do_disco, chave)
+        origem = "disco"
+        if dados is None:
+            destino = self.cache.caminho(chave)
+            await loop.run_in_executor(self.pool, _renderizar, self.planilha, *chave, destino)
+            dados = await loop.run_in_executor(None, self.cache.do_disco, chave)
+            loop.run_in_executor(None, self.cache.aparar_disco).add_done_callback(_avisar_falha)
+            origem = "gerado"
+        self.cache.guardar(chave_texto, dados)
+        return dados, origem
+
+    async def categorias(self):
+        versao = await self.versao()
+        if self._categorias[0] != versao:
+            categorias = await asyncio.get_running_loop().run_in_executor(self.pool, _categorias, self.planilha, versao)
+            self._categorias = (versao, categorias)
+        return self._categorias[1]
+
+    async def responder(self, alvo):
+        """Resolve a rota. Retorna (status, tipo de conteúdo, corpo, origem)."""
+        partes = urlsplit(alvo)
+        caminho = unquote(partes.path)
+        variante = parse_qs(partes.query).get("variante", [VARIANTE_PADRAO])[0]
+        if variante not in VARIANTES:
+            return 404, "text/plain; charset=utf-8", f"Variante desconhecida: {variante}".encode("utf-8"), None
+        if caminho == "/":
+            return 200, "text/html; charset=utf-8", self._pagina_inicial(await self.categorias()), None
+        if caminho == "/catalog.pdf":
+            tipo, nome = "catalogo", None
+        elif caminho.startswith("/category/") and caminho.endswith(".pdf"):
+            tipo, nome = "categoria", caminho[len("/category/"):-len(".pdf")]
+        elif caminho.startswith("/product/"):
+            tipo, nome = "produto", caminho[len("/product/"):]
+            nome = nome[:-len(".pdf")] if nome.endswith(".pdf") else nome
+        else:
+            return 404, "text/plain; charset=utf-8", b"Rota desconhecida", None
+        try:
+            dados, origem = await self.artefato(tipo, variante, nome)
+        except LookupError as e:
+            return 404, "text/plain; charset=utf-8", str(e).encode("utf-8"), None
+        return 200, "application/pdf", dados, origem
+
+    @staticmethod
+    def _pagina_inicial(categorias):
+        linhas = [f'<li><a href="/category/{quote(nome)}.pdf">{html.escape(nome)}</a> ({quantidade})</li>'
+                  for nome, quantidade in categorias]
+        variantes = ", ".join(VARIANTES)
+        return (f'<!doctype html><meta charset="utf-8"><title>Catálogo</title>'
+                f'<p><a href="/catalog.pdf">Catálogo completo</a> (?variante= {variantes})</p>'
+                f'<p>Produto: /product/&lt;código&gt;</p><ul>{"".join(linhas)}</ul>').encode("utf-8")
+
+    async def atender(self, leitor, escritor):
+        """Uma requisição HTTP/1.1 por conexão: só GET e HEAD."""
+        inicio = time.perf_counter()
+        metodo, alvo = "?", "?"
+        try:
+            linha = (await leitor.readline()).decode("latin-1").strip()
+            while (await leitor.readline()) not in (b"\r\n", b"\n", b""):
+                pass
+            metodo, alvo, _ = linha.split(" ", 2)
+            if metodo not in ("GET", "HEAD"):
+                status, tipo, corpo, origem = 405, "text/plain; charset=utf-8", b"Use GET", None
+            else:
+                status, tipo, corpo, origem = await self.responder(alvo)
+        except ValueError:
+            status, tipo, corpo, origem = 400, "text/plain; charset=utf-8", b"Requisicao invalida", None
+        except Exception as e:
+            status, tipo, corpo, origem = 500, "text/plain; charset=utf-8", f"{type(e).__name__}: {e}".encode("utf-8"), None
+        motivo = {200: "OK", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed"}.get(status, "Error")
+        cabecalho = (f"HTTP/1.1 {status} {motivo}\r\nContent-Type: {tipo}\r\n"
+                     f"Content-Length: {len(corpo)}\r\nConnection: close\r\n\r\n").encode("latin-1")
+        try:
+            escritor.write(cabecalho if metodo == "HEAD" else cabecalho + corpo)
+            await escritor.drain()
+        except ConnectionError:
+            pass
+        finally:
+            escritor.close()
+        print(f"{metodo} {alvo} {status} {len(corpo) / 1024:.0f} KB {(time.perf_counter() - inicio) * 1000:.0f} ms"
+              + (f" ({origem})" if origem else ""))
+
+    async def servir(self, endereco=ENDERECO, porta=PORTA):
+        # Sobe os processos do pool (e o inicializador de cada um) antes do primeiro pedido
+        for _ in range(self.workers):
+            self.pool.submit(int)
+        servidor = await asyncio.start_server(self.atender, endereco, porta)
+        print(f"Servindo os catálogos em http://{endereco}:{porta}/ (Ctrl+C para sair)")
+        async with servidor:
+            await servidor.serve_forever()
+
+
+def servir(planilha, endereco=ENDERECO, porta=PORTA, workers=None):
+    """Sobe o servidor até o Ctrl+C."""
+    servidor = ServidorCatalogo(planilha, workers)
+    try:
+        asyncio.run(servidor.servir(endereco, porta))
+    except KeyboardInterrupt:
+        print("\nServidor encerrado.")
+    finally:
+        servidor.pool.shutdown(wait=False)
@@ -0,0 +1,77 @@
+from collections import namedtuple
+
+from reportlab.lib import colors
+from reportlab.lib.units import cm
+
+# Uma linha de texto da capa: fonte, tamanho, altura (fração da página) e cor. O texto
+# pode trazer {desconto_maximo}, o maior desconto do catálogo; sem promoções a linha some
+LinhaCapa = namedtuple("LinhaCapa", ["texto", "fonte", "tamanho", "altura", "cor"])
+
+# Tudo o que muda de um catálogo para outro. O desenho (gerador_catalogo.desenho)
+# é um só e lê daqui as cores, os textos da capa e o que cada card mostra.
+#   validade: texto da caixa da capa por tipo de ordenação ({data} é a data de geração)
+#   categoria_no_cabecalho: mostra "Categoria: X" no cabeçalho das páginas de conteúdo
+#   precos: bloco de preços (antigo riscado e promocional) acima do código
+#   largura_imagem / largura_botao: frações da largura do card
+#   botao_sem_precos: distância do fim da área da imagem até a base do botão do código
+#   texto_botao: altura do código dentro do botão
+Tema = namedtuple("Tema", [
+    "cor_codigo", "cor_sombra", "cor_fundo_escuro", "cor_faixa_meio", "cor_link",
+    "capa", "validade", "categoria_no_cabecalho",
+    "fonte_descricao", "entrelinha_descricao", "largura_imagem",
+    "precos", "largura_botao", "botao_sem_precos", "texto_botao",
+])
+
+PADRAO = Tema(
+    cor_codigo=colors.Color(0.25, 0.45, 0.85),
+    cor_sombra=colors.Color(0.9, 0.9, 0.9),
+    cor_fundo_escuro=colors.Color(red=28/255, green=35/255, blue=46/255),
+    cor_faixa_meio=colors.Color(red=39/255, green=47/255, blue=58/255),
+    cor_link=colors.Color(0.1, 0.3, 0.8),
+    capa=[
+        LinhaCapa("BIKE FRIDAY", "Helvetica-Bold", 35, 0.45, colors.white),
+        LinhaCapa("Peças e Acessórios para Ciclismo", "Helvetica", 22, 0.35, colors.white),
+    ],
+    validade={
+        "C": "Organizado por Categoria de {data} até 29/11/2025!",
+        "A": "Valido de {data} até 29/11/2025!",
+    },
+    categoria_no_cabecalho=True,
+    fonte_descricao=6,
+    entrelinha_descricao=8,
+    largura_imagem=0.95,
+    precos=False,
+    largura_botao=0.25,
+    botao_sem_precos=0.5 * cm,
+    texto_botao=0.15 * cm,
+)
+
+BLACK = Tema(
+    cor_codigo=colors.Color(red=0.8, green=0.0, blue=0.0),  # Vermelho Forte para o Código
+    cor_sombra=colors.Color(0.8, 0.8, 0.8),  # Sombra mais clara
+    cor_fundo_escuro=colors.Color(red=0.0, green=0.0, blue=0.0),  # Preto Absoluto para o fundo da capa
+    cor_faixa_meio=colors.Color(red=0.1, green=0.1, blue=0.1),  # Cinza Quase Preto para a faixa da capa/índice
+    cor_link=colors.Color(red=0.9, green=0.4, blue=0.1),  # Laranja Forte para Destaque/Links
+    capa=[
+        LinhaCapa("BIKE FRIDAY", "Helvetica-Bold", 48, 0.50, colors.white),
+        LinhaCapa("PRODUTOS COM ATÉ {desconto_maximo}% DE DESCONTO", "Helvetica", 22, 0.45, colors.red),
+        LinhaCapa("Peças e Acessórios para Ciclismo", "Helvetica", 14, 0.38, colors.white),
+    ],
+    validade={
+        "C": " Válido de {data} até 29/11/2025!",
+        "A": " Válido de {data} até 29/11/2025!",
+    },
+    categoria_no_cabecalho=False,
+    fonte_descricao=5.5,
+    entrelinha_descricao=6.5,
+    largura_imagem=0.8,
+    precos=True,
+    largura_botao=0.2,
+    botao_sem_precos=0.9 * cm,
+    texto_botao=0.10 * cm,
+)
+
+TEMAS = {
+    "padrao": PADRAO,
+    "black": BLACK,
+}
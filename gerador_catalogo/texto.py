@@ -0,0 +1,155 @@
+import json
+import os
+from collections import OrderedDict, namedtuple
+from functools import lru_cache
+
+import reportlab
+from reportlab.lib.enums import TA_CENTER, TA_LEFT, TA_RIGHT
+from reportlab.pdfbase.pdfmetrics import stringWidth
+from reportlab.platypus import Paragraph
+from reportlab.rl_config import paraFontSizeHeightOffset
+
+# === CONFIGURAÇÕES DO CACHE DE TEXTO ===
+CACHE_TEXTO = os.path.join(".cache_texto", "paragrafos.json")
+MAXIMO_PARAGRAFOS = 20000
+MAXIMO_LARGURAS = 50000
+
+# Parágrafo já quebrado: (texto, largura) de cada linha, altura total, distância do
+# topo até a primeira linha de base e entrelinha
+ParagrafoQuebrado = namedtuple("ParagrafoQuebrado", ["linhas", "altura", "primeira_base", "leading"])
+
+
+@lru_cache(maxsize=MAXIMO_LARGURAS)
+def largura_texto(texto, fonte, tamanho):
+    """c.stringWidth memorizado: preços e códigos são medidos uma vez por texto, fonte e tamanho."""
+    return stringWidth(texto, fonte, tamanho)
+
+
+def desenhar_centralizado(c, x, y, texto, fonte, tamanho):
+    """Equivalente a c.drawCentredString com a fonte atual, usando a largura memorizada."""
+    c.drawString(x - largura_texto(texto, fonte, tamanho) / 2, y, texto)
+
+
+class CacheParagrafos:
+    """Quebra de linhas dos Paragraphs, memorizada por texto, estilo e largura (LRU).
+
+    O reportlab só faz o layout na primeira vez que um texto aparece; depois o
+    card apenas repete as linhas guardadas com drawString. Textos com marcação
+    (mais de uma fonte na mesma linha), linhas que não couberam na largura e
+    alinhamento justificado continuam sendo desenhados pelo próprio Paragraph.
+    """
+
+    def __init__(self, maximo=MAXIMO_PARAGRAFOS):
+        self.maximo = maximo
+        self._itens = OrderedDict()
+        self.acertos = 0
+        self.faltas = 0
+
+    @staticmethod
+    def _chave(texto, estilo, largura):
+        return (texto, estilo.fontName, estilo.fontSize, estilo.leading, estilo.alignment, round(largura, 4))
+
+    @staticmethod
+    def _quebrar(texto, estilo, largura):
+        """Faz o layout com o Paragraph; None se o texto precisar do Paragraph para ser desenhado."""
+        if estilo.alignment not in (TA_LEFT, TA_CENTER, TA_RIGHT) or estilo.leftIndent or estilo.rightIndent:
+            return None
+        p = Paragraph(texto, estilo)
+        p.wrap(largura, estilo.leading)
+        if p.blPara.kind != 0:
+            return None
+        if any(sobra < -1e-8 and len(palavras) > 1 for sobra, palavras in p.blPara.lines):
+            # Linha que não coube: o reportlab aperta o espaço entre as palavras
+            return None
+        primeira_base = estilo.fontSize if paraFontSizeHeightOffset else getattr(p.blPara, "ascent", estilo.fontSize)
+        linhas = [(" ".join(palavras), largura - sobra) for sobra, palavras in p.blPara.lines]
+        return ParagrafoQuebrado(linhas, p.height, primeira_base, estilo.leading)
+
+    def quebrar(self, texto, estilo, largura):
+        chave = self._chave(texto, estilo, largura)
+        try:
+            quebrado = self._itens[chave]
+            self._itens.move_to_end(chave)
+            self.acertos += 1
+            return quebrado
+        except KeyError:
+            pass
+        self.faltas += 1
+        quebrado = self._quebrar(texto, estilo, largura)
+        self._itens[chave] = quebrado
+        if len(self._itens) > self.maximo:
+            self._itens.popitem(last=False)
+        return quebrado
+
+    def desenhar(self, c, texto, estilo, x, y, largura):
+        """Desenha o parágrafo com o canto inferior esquerdo em (x, y), como p.drawOn. Retorna (largura, altura)."""
+        quebrado = self.quebrar(texto, estilo, largura)
+        if quebrado is None:
+            return self._desenhar_paragraph(c, texto, estilo, x, y, largura)
+        c.setFillColor(estilo.textColor)
+        c.setFont(estilo.fontName, estilo.fontSize)
+        return self._desenhar_linhas(c, quebrado, estilo, x, y, largura)
+
+    def desenhar_varios(self, c, estilo, itens):
+        """Desenha vários parágrafos do mesmo estilo, itens = [(texto, x, y, largura)].
+
+        Cor e fonte são definidas uma vez para todos; o Paragraph dos textos que
+        precisam dele salva e restaura o estado do canvas, então não atrapalha.
+        """
+        c.setFillColor(estilo.textColor)
+        c.setFont(estilo.fontName, estilo.fontSize)
+        for texto, x, y, largura in itens:
+            quebrado = self.quebrar(texto, estilo, largura)
+            if quebrado is None:
+                self._desenhar_paragraph(c, texto, estilo, x, y, largura)
+            else:
+                self._desenhar_linhas(c, quebrado, estilo, x, y, largura)
+
+    @staticmethod
+    def _desenhar_paragraph(c, texto, estilo, x, y, largura):
+        p = Paragraph(texto, estilo)
+        _, altura = p.wrapOn(c, largura, estilo.leading)
+        p.drawOn(c, x, y)
+        return largura, altura
+
+    @staticmethod
+    def _desenhar_linhas(c, quebrado, estilo, x, y, largura):
+        base = y + quebrado.altura - quebrado.primeira_base
+        for texto_linha, largura_linha in quebrado.linhas:
+            if estilo.alignment == TA_CENTER:
+                c.drawString(x + (largura - largura_linha) / 2, base, texto_linha)
+            elif estilo.alignment == TA_RIGHT:
+                c.drawString(x + largura - largura_linha, base, texto_linha)
+            else:
+                c.drawString(x, base, texto_linha)
+            base -= quebrado.leading
+        return largura, quebrado.altura
+
+    def carregar(self, caminho=CACHE_TEXTO):
+        """Lê as quebras gravadas por uma execução anterior (com a mesma versão do reportlab)."""
+        try:
+            with open(caminho, encoding="utf-8") as f:
+                dados = json.load(f)
+        except (FileNotFoundError, ValueError):
+            return
+        if dados.get("reportlab") != reportlab.Version:
+            return
+        for chave, linhas, altura, primeira_base, leading in dados.get("paragrafos", []):
+            quebrado = ParagrafoQuebrado([tuple(linha) for linha in linhas], altura, primeira_base, leading)
+            self._itens.setdefault(tuple(chave), quebrado)
+        while len(self._itens) > self.maximo:
+            self._itens.popitem(last=False)
+
+    def salvar(self, caminho=CACHE_TEXTO):
+        """Grava as quebras em JSON para a próxima execução."""
+        os.makedirs(os.path.dirname(caminho) or ".", exist_ok=True)
+        paragrafos = [[list(chave), quebrado.linhas, quebrado.altura, quebrado.primeira_base, quebrado.leading]
+                      for chave, quebrado in self._itens.items() if quebrado is not None]
+        temporario = f"{caminho}.{os.getpid()}.tmp"
+        with open(temporario, "w", encoding="utf-8") as f:
+            json.dump({"reportlab": reportlab.Version, "paragrafos": paragrafos}, f, ensure_ascii=False)
+        os.replace(temporario, caminho)
+
+
+# Cache único do processo, compartilhado por todas as variantes
+paragrafos = CacheParagrafos()
@@ -0,0 +1,222 @@
+import hashlib
+import os
+from concurrent.futures import ProcessPoolExecutor
+from io import BytesIO
+
+import pypdf
+from pypdf import PdfReader, PdfWriter
+from pypdf.generic import ArrayObject, DictionaryObject, IndirectObject, NameObject, NumberObject, StreamObject
+
+from gerador_catalogo.compactacao import aplicar_opcoes_reportlab, opcoes_reportlab
+from gerador_catalogo.navegacao import gravar_navegacao, gravar_navegacao_writer
+
+# A cópia direta (_GravadorPdf) lê os bytes crus dos streams (_data) e esvazia o
+# cache de objetos do reader (resolved_objects), internos do pypdf conferidos só
+# nestas versões; nas outras a junção usa a API pública do PdfWriter, que monta o
+# PDF inteiro na memória
+VERSOES_PYPDF_CONFERIDAS = (5, 6)
+COPIA_DIRETA = int(pypdf.__version__.split(".")[0]) in VERSOES_PYPDF_CONFERIDAS
+
+
+def dividir_paginas(paginas, paginas_por_trecho=None):
+    """Divide as páginas de conteúdo em trechos independentes.
+
+    paginas é a lista de (página, grupo, itens) de agrupar_por_pagina. Sem
+    paginas_por_trecho cada grupo (categoria) vira um trecho; com ele, os trechos
+    têm no máximo esse número de páginas.
+    """
+    trechos = []
+    for registro in paginas:
+        if not trechos:
+            trechos.append([registro])
+        elif paginas_por_trecho is None and trechos[-1][-1][1] != registro[1]:
+            trechos.append([registro])
+        elif paginas_por_trecho is not None and len(trechos[-1]) >= paginas_por_trecho:
+            trechos.append([registro])
+        else:
+            trechos[-1].append(registro)
+    return trechos
+
+
+def renderizar_trechos(funcao, tarefas, workers=None, antes_de_esperar=None):
+    """Executa funcao(*tarefa) para cada trecho em processos separados e retorna os resultados em ordem.
+
+    antes_de_esperar, se informado, roda no processo principal enquanto os trechos
+    são desenhados (por exemplo, a capa e o índice). Os processos recebem as
+    opções de saída do reportlab do processo principal (modo compacto).
+    """
+    workers = min(workers or os.cpu_count() or 1, max(1, len(tarefas)))
+    if workers <= 1:
+        if antes_de_esperar is not None:
+            antes_de_esperar()
+        return [funcao(*tarefa) for tarefa in tarefas]
+    with ProcessPoolExecutor(max_workers=workers, initializer=aplicar_opcoes_reportlab,
+                             initargs=(opcoes_reportlab(),)) as executor:
+        futuros = [executor.submit(funcao, *tarefa) for tarefa in tarefas]
+        if antes_de_esperar is not None:
+            antes_de_esperar()
+        return [futuro.result() for futuro in futuros]
+
+
+class _GravadorPdf:
+    """Escreve um PDF objeto a objeto, direto no arquivo, sem montar o documento na memória.
+
+    Objetos de conteúdo idêntico (logo, fontes, fotos repetidas em trechos
+    diferentes) são gravados uma vez só: cada objeto é serializado depois dos
+    que ele referencia e o SHA-1 dos bytes decide se já existe.
+    """
+
+    def __init__(self, arquivo, cabecalho):
+        self.arquivo = arquivo
+        self.posicoes = [None, None, None]  # 0 é o objeto livre; 1 e 2 ficam para o catálogo e a árvore de páginas
+        self.paginas = []
+        self._por_hash = {}
+        self._md5 = hashlib.md5()
+        self._escrever(cabecalho.encode("latin-1") + b"\n%\xe2\xe3\xcf\xd3\n")
+
+    def _escrever(self, dados):
+        self.arquivo.write(dados)
+        self._md5.update(dados)
+
+    def reservar(self):
+        self.posicoes.append(None)
+        return len(self.posicoes) - 1
+
+    def gravar(self, corpo, numero=None, deduplicar=True):
+        """Grava o objeto serializado e devolve seu número (o de um idêntico, se já houver)."""
+        chave = hashlib.sha1(corpo).digest() if deduplicar else None
+        if chave in self._por_hash:
+            return self._por_hash[chave]
+        if numero is None:
+            numero = self.reservar()
+        self.posicoes[numero] = self.arquivo.tell()
+        self._escrever(b"%d 0 obj\n" % numero + corpo + b"\nendobj\n")
+        if chave is not None:
+            self._por_hash[chave] = numero
+        return numero
+
+    def finalizar(self, info=None, catalogo=b""):
+        """Grava o catálogo (com as entradas extras em catalogo), a árvore de páginas, a xref e o trailer."""
+        kids = b" ".join(b"%d 0 R" % numero for numero in self.paginas)
+        self.gravar(b"<< /Type /Catalog /Pages 2 0 R%s >>" % catalogo, 1, deduplicar=False)
+        self.gravar(b"<< /Type /Pages /Count %d /Kids [ %s ] >>" % (len(self.paginas), kids), 2, deduplicar=False)
+        inicio_xref = self.arquivo.tell()
+        linhas = [b"xref", b"0 %d" % len(self.posicoes), b"0000000000 65535 f "]
+        linhas += [b"%010d 00000 n " % posicao for posicao in self.posicoes[1:]]
+        identificador = self._md5.hexdigest().encode()
+        trailer = b"<< /Size %d /Root 1 0 R /ID [ <%s> <%s> ]" % (len(self.posicoes), identificador, identificador)
+        if info is not None:
+            trailer += b" /Info %d 0 R" % info
+        linhas += [b"trailer", trailer + b" >>", b"startxref", b"%d" % inicio_xref, b"%%EOF", b""]
+        self.arquivo.write(b"\n".join(linhas))
+
+
+class _CopiaTrecho:
+    """Copia as páginas de um PDF para o _GravadorPdf, renumerando as referências."""
+
+    def __init__(self, gravador, reader):
+        self.gravador = gravador
+        self.reader = reader
+        self._numeros = {}
+
+    def _valor(self, valor):
+        if isinstance(valor, IndirectObject):
+            numero = self._numeros.get(valor.idnum)
+            if numero is None:
+                if valor.idnum in self._numeros:
+                    raise ValueError(f"referência circular no objeto {valor.idnum} de {self.reader.stream.name}")
+                self._numeros[valor.idnum] = None
+                numero = self._numeros[valor.idnum] = self._objeto(valor.get_object())
+            return IndirectObject(numero, 0, None)
+        if isinstance(valor, DictionaryObject):
+            return DictionaryObject((chave, self._valor(item)) for chave, item in valor.items())
+        if isinstance(valor, ArrayObject):
+            return ArrayObject(self._valor(item) for item in valor)
+        return valor
+
+    @staticmethod
+    def _serializar(objeto):
+        saida = BytesIO()
+        objeto.write_to_stream(saida)
+        return saida.getvalue()
+
+    def _objeto(self, objeto):
+        copia = self._valor(objeto)
+        if isinstance(objeto, StreamObject):
+            # Os dados vão como estão no arquivo, ainda comprimidos: o get_data() público
+            # descomprime, e recomprimir fontes e fotos de cada trecho custaria caro e mudaria
+            # os bytes (_data é interno do pypdf: ver COPIA_DIRETA)
+            dados = objeto._data
+            copia[NameObject("/Length")] = NumberObject(len(dados))
+            return self.gravador.gravar(self._serializar(copia) + b"\nstream\n" + dados + b"\nendstream")
+        return self.gravador.gravar(self._serializar(copia))
+
+    def copiar(self):
+        # Números das páginas reservados antes, para links e destinos entre páginas do trecho
+        paginas = [(pagina, self.gravador.reservar()) for pagina in self.reader.pages]
+        for pagina, numero in paginas:
+            self._numeros[pagina.indirect_reference.idnum] = numero
+        for pagina, numero in paginas:
+            copia = self._valor(DictionaryObject((chave, valor) for chave, valor in pagina.items() if chave != "/Parent"))
+            copia[NameObject("/Parent")] = IndirectObject(2, 0, None)
+            self.gravador.gravar(self._serializar(copia), numero, deduplicar=False)
+            self.gravador.paginas.append(numero)
+
+    def info(self):
+        """Número do dicionário /Info (produtor, datas) no PDF de destino, ou None."""
+        info = self.reader.trailer.get("/Info")
+        if info is None:
+            return None
+        copia = self._valor(info)
+        return copia.idnum if isinstance(copia, IndirectObject) else self.gravador.gravar(self._serializar(copia))
+
+
+def juntar_pdfs(caminhos, destino, navegacao=None):
+    """Concatena os PDFs na ordem dada e grava o resultado em destino.
+
+    As páginas são copiadas um arquivo de cada vez, direto para o destino, então
+    a memória fica limitada ao maior trecho e não ao catálogo inteiro. Os
+    destinos e o sumário (gerador_catalogo.navegacao) são gravados no fim, já
+    com as páginas do PDF final. Fora das versões do pypdf em COPIA_DIRETA, junta
+    com o PdfWriter.
+    """
+    temporario = f"{destino}.{os.getpid()}.tmp"
+    if not COPIA_DIRETA:
+        _juntar_com_writer(caminhos, temporario, navegacao)
+        os.replace(temporario, destino)
+        return
+    info = None
+    with open(temporario, "wb") as f:
+        gravador = None
+        for caminho in caminhos:
+            with open(caminho, "rb") as origem:
+                reader = PdfReader(origem)
+                if gravador is None:
+                    gravador = _GravadorPdf(f, reader.pdf_header)
+                copia = _CopiaTrecho(gravador, reader)
+                copia.copiar()
+                if info is None:
+                    info = copia.info()
+                # As páginas e o reader se referenciam; sem isto o trecho só sai da memória no
+                # próximo gc (resolved_objects também é interno: ver COPIA_DIRETA)
+                reader.resolved_objects.clear()
+        gravador.finalizar(info, gravar_navegacao(gravador, navegacao) if navegacao is not None else b"")
+    os.replace(temporario, destino)
+
+
+def _juntar_com_writer(caminhos, destino, navegacao=None):
+    """Junção só com a API pública do pypdf: o mesmo PDF de juntar_pdfs, mas montado na memória."""
+    writer = PdfWriter()
+    for i, caminho in enumerate(caminhos):
+        reader = PdfReader(caminho)
+        if i == 0:
+            writer.add_metadata(reader.metadata or {})
+        # add_page e não append: o append descarta os links para destinos nomeados que ainda não existem
+        for pagina in reader.pages:
+            writer.add_page(pagina)
+    if navegacao is not None:
+        gravar_navegacao_writer(writer, navegacao)
+    # Logo, fontes e fotos repetidas em trechos diferentes ficam uma vez só
+    writer.compress_identical_objects(remove_duplicates=True, remove_unreferenced=True)
+    with open(destino, "wb") as f:
+        writer.write(f)
@@ -0,0 +1,161 @@
+import csv
+import json
+import os
+import time
+import warnings
+from collections import Counter, namedtuple
+from datetime import datetime
+
+from PIL import Image
+
+from gerador_catalogo.cache_imagens import derivar_imagem, pixels_para
+from gerador_catalogo.imagens import listar_imagens
+from gerador_catalogo.preprocessamento import executar_em_processos
+
+# === CRITÉRIOS DA VALIDAÇÃO ===
+# Original com mais pixels que isto vezes a derivada só custa decodificação (4x em cada lado)
+FATOR_EXCESSO = 16
+# Modos que a derivada converte sem perda de sentido; os demais (CMYK, 16 bits, LAB...) são apontados
+MODOS_ESPERADOS = ("RGB", "L", "P", "RGBA", "LA", "1")
+FORMATOS_POR_EXTENSAO = {".jpg": "JPEG", ".jpeg": "JPEG", ".jfif": "JPEG", ".png": "PNG", ".webp": "WEBP"}
+
+# Problemas apontados no relatório:
+#   falha_decodificacao: o arquivo não abre ou está truncado (fica fora do catálogo)
+#   dimensoes_excessivas: bem maior que o tamanho do card no DPI do cache
+#   alfa_desnecessario: tem canal alfa, mas nenhum pixel transparente
+#   modo_de_cor: modo fora de MODOS_ESPERADOS, convertido para RGB na derivada
+#   extensao_divergente: o conteúdo é de outro formato que o da extensão
+DiagnosticoImagem = namedtuple("DiagnosticoImagem", [
+    "caminho", "extensao", "formato", "modo", "largura", "altura", "bytes",
+    "problemas", "acao", "derivada", "segundos", "erro",
+])
+
+
+def _alfa_desnecessario(img):
+    """True se a imagem tem canal alfa, mas é toda opaca."""
+    if img.mode == "P" and "transparency" in img.info:
+        img = img.convert("RGBA")
+    if img.mode not in ("RGBA", "LA"):
+        return False
+    return img.getchannel("A").getextrema()[0] == 255
+
+
+def _validar_imagem(caminho, registro, cache_dir, largura_px, altura_px, qualidade):
+    """Tarefa de um processo de trabalho: decodifica o original inteiro, aponta os problemas
+    e já deixa a derivada normalizada (RGB, sem alfa, reduzida) no cache.
+
+    Retorna (caminho, registro do original, se a derivada foi gerada, DiagnosticoImagem).
+    """
+    inicio = time.perf_counter()
+    extensao = os.path.splitext(caminho)[1].lower()
+    tamanho = os.path.getsize(caminho)
+    formato = modo = largura = altura = None
+    problemas = []
+    try:
+        with warnings.catch_warnings():
+            # O aviso de "decompression bomb" vira o problema de dimensões excessivas
+            warnings.simplefilter("ignore", Image.DecompressionBombWarning)
+            with Image.open(caminho) as img:
+                formato, modo = img.format, img.mode
+                largura, altura = img.size
+                # Arquivos truncados só falham quando os dados são decodificados de fato
+                img.load()
+                alfa_desnecessario = _alfa_desnecessario(img)
+    except Exception as e:
+        diagnostico = DiagnosticoImagem(caminho, extensao, formato, modo, largura, altura, tamanho,
+                                        ["falha_decodificacao"], "ignorada", None,
+                                        time.perf_counter() - inicio, f"{type(e).__name__}: {e}")
+        return caminho, None, False, diagnostico
+
+    if largura * altura > FATOR_EXCESSO * largura_px * altura_px:
+        problemas.append("dimensoes_excessivas")
+    if alfa_desnecessario:
+        problemas.append("alfa_desnecessario")
+    if modo not in MODOS_ESPERADOS:
+        problemas.append("modo_de_cor")
+    if FORMATOS_POR_EXTENSAO.get(extensao) != formato:
+        problemas.append("extensao_divergente")
+
+    try:
+        registro, destino, gerada = derivar_imagem(caminho, registro, cache_dir, largura_px, altura_px, qualidade)
+    except Exception as e:
+        diagnostico = DiagnosticoImagem(caminho, extensao, formato, modo, largura, altura, tamanho,
+                                        problemas + ["falha_decodificacao"], "ignorada", None,
+                                        time.perf_counter() - inicio, f"{type(e).__name__}: {e}")
+        return caminho, None, False, diagnostico
+    diagnostico = DiagnosticoImagem(caminho, extensao, formato, modo, largura, altura, tamanho, problemas,
+                                    "gerada" if gerada else "reaproveitada", destino,
+                                    time.perf_counter() - inicio, None)
+    return caminho, registro, gerada, diagnostico
+
+
+def validar_imagens(img_dir, cache, largura_area, altura_area, workers=None):
+    """Valida todas as imagens do diretório em paralelo, normalizando cada uma no cache de derivadas.
+
+    As derivadas têm o mesmo tamanho que a geração usa para a área informada, então
+    a próxima geração só as reaproveita; os arquivos que falharam ficam registrados
+    no cache e não são abertos de novo enquanto não mudarem. Retorna a lista de
+    DiagnosticoImagem, com os problemáticos primeiro e os mais lentos antes.
+    """
+    largura_px, altura_px = pixels_para(largura_area, altura_area, cache.dpi)
+    tarefas = [(caminho, cache.manifesto.get(caminho), cache.cache_dir, largura_px, altura_px, cache.qualidade)
+               for caminho in sorted(caminho for _, _, caminho in listar_imagens(img_dir))]
+
+    diagnosticos = []
+    for caminho, registro, gerada, diagnostico in executar_em_processos(_validar_imagem, tarefas, workers):
+        if diagnostico.erro is not None:
+            cache.registrar_falha(caminho, diagnostico.erro)
+        else:
+            cache.registrar(caminho, registro, gerada)
+        diagnosticos.append(diagnostico)
+    cache.salvar()
+    diagnosticos.sort(key=lambda d: (not d.problemas, -d.segundos))
+    return diagnosticos
+
+
+def resumo_validacao(diagnosticos):
+    """Quantidade de imagens por problema e por ação tomada."""
+    return {
+        "imagens": len(diagnosticos),
+        "problemas": dict(Counter(p for d in diagnosticos for p in d.problemas).most_common()),
+        "acoes": dict(Counter(d.acao for d in diagnosticos).most_common()),
+        "segundos": sum(d.segundos for d in diagnosticos),
+    }
+
+
+def gravar_validacao(caminho, diagnosticos, img_dir):
+    """Grava o relatório da validação em CSV (uma linha por imagem) ou em JSON, conforme a extensão."""
+    temporario = f"{caminho}.{os.getpid()}.tmp"
+    if caminho.lower().endswith(".csv"):
+        with open(temporario, "w", encoding="utf-8", newline="") as f:
+            escritor = csv.writer(f)
+            escritor.writerow(DiagnosticoImagem._fields)
+            for d in diagnosticos:
+                escritor.writerow(d._replace(problemas=";".join(d.problemas), segundos=f"{d.segundos:.4f}"))
+    else:
+        relatorio = {
+            "gerado_em": datetime.now().isoformat(timespec="seconds"),
+            "diretorio": img_dir,
+            "resumo": resumo_validacao(diagnosticos),
+            "imagens": [d._asdict() for d in diagnosticos],
+        }
+        with open(temporario, "w", encoding="utf-8") as f:
+            json.dump(relatorio, f, ensure_ascii=False, indent=2)
+    os.replace(temporario, caminho)
+
+
+def imprimir_validacao(diagnosticos, limite=10):
+    """Mostra no console o resumo da validação e as imagens com falha."""
+    resumo = resumo_validacao(diagnosticos)
+    print(f"{resumo['imagens']} imagem(ns) validada(s) em {resumo['segundos']:.1f} s de processamento.")
+    for acao, quantidade in resumo["acoes"].items():
+        print(f"   derivada {acao}: {quantidade}")
+    for problema, quantidade in resumo["problemas"].items():
+        print(f"   {problema}: {quantidade}")
+    falhas = [d for d in diagnosticos if d.erro is not None]
+    if falhas:
+        print(f"⚠️ {len(falhas)} imagem(ns) não puderam ser lidas:")
+        for d in falhas[:limite]:
+            print(f"   - {d.caminho}: {d.erro}")
+        if len(falhas) > limite:
+            print(f"   ... e mais {len(falhas) - limite}")
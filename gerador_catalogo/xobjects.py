@@ -0,0 +1,88 @@
+import os
+import time
+
+from PIL import Image
+
+from gerador_catalogo.cache_imagens import hash_arquivo
+
+# O reportlab só lê JPEG como está, sem canal alfa
+EXTENSOES_SEM_ALFA = (".jpg", ".jpeg")
+
+
+class ImagensCompartilhadas:
+    """Garante que cada imagem distinta seja gravada uma única vez no PDF.
+
+    O reportlab reaproveita o XObject quando recebe o mesmo nome de arquivo, mas
+    nomeia pelo caminho. Aqui o caminho é trocado pelo do primeiro arquivo com o
+    mesmo conteúdo (SHA-1), de modo que fotos repetidas sob códigos diferentes e o
+    logo de todos os cabeçalhos apontem para o mesmo XObject. Passar o caminho em
+    vez de um ImageReader também evita que o reportlab decodifique a imagem só
+    para calcular a assinatura.
+
+    mask='auto' vira uma SMask do tamanho da imagem sempre que o arquivo tem canal
+    alfa, mesmo que nenhum pixel seja transparente; nesses arquivos a máscara é
+    retirada (verificado uma vez por conteúdo).
+    """
+
+    def __init__(self):
+        self._canonico = {}
+        self._por_hash = {}
+        self._transparente = {}
+        self._usadas = set()
+        self.referencias = 0
+        self.segundos = {}
+
+    def novo_documento(self):
+        """Zera as contagens para um novo PDF; os hashes já calculados continuam valendo."""
+        self._usadas = set()
+        self.referencias = 0
+        self.segundos = {}
+
+    def canonico(self, caminho):
+        """Retorna o caminho que representa o conteúdo deste arquivo no PDF."""
+        canonico = self._canonico.get(caminho)
+        if canonico is None:
+            canonico = self._por_hash.setdefault(hash_arquivo(caminho), caminho)
+            self._canonico[caminho] = canonico
+        return canonico
+
+    def transparente(self, caminho):
+        """True se a imagem (caminho canônico) tem algum pixel transparente de fato."""
+        transparente = self._transparente.get(caminho)
+        if transparente is None:
+            transparente = False
+            if os.path.splitext(caminho)[1].lower() not in EXTENSOES_SEM_ALFA:
+                with Image.open(caminho) as img:
+                    if img.mode == "P" and "transparency" in img.info:
+                        img = img.convert("RGBA")
+                    if img.mode in ("RGBA", "LA", "PA"):
+                        transparente = img.getchannel("A").getextrema()[0] < 255
+            self._transparente[caminho] = transparente
+        return transparente
+
+    def desenhar(self, c, caminho, x, y, width=None, height=None, mask=None, **kwargs):
+        """Equivalente a c.drawImage, reaproveitando o XObject de conteúdo idêntico."""
+        self.referencias += 1
+        canonico = self.canonico(caminho)
+        self._usadas.add(canonico)
+        inicio = time.perf_counter()
+        try:
+            if mask == "auto" and not self.transparente(canonico):
+                mask = None
+            return c.drawImage(canonico, x, y, width=width, height=height, mask=mask, **kwargs)
+        finally:
+            # O primeiro uso paga a leitura do arquivo e a criação do XObject
+            self.segundos[canonico] = self.segundos.get(canonico, 0.0) + time.perf_counter() - inicio
+
+    def segundos_desenho(self, caminho):
+        """Tempo gasto desenhando a imagem (todas as vezes) neste documento."""
+        canonico = self._canonico.get(caminho)
+        return self.segundos.get(canonico, 0.0) if canonico is not None else 0.0
+
+    def conteudos_usados(self):
+        """SHA-1 das imagens desenhadas neste documento (comparáveis entre processos, os caminhos canônicos não)."""
+        return frozenset(sha1 for sha1, canonico in self._por_hash.items() if canonico in self._usadas)
+
+    @property
+    def distintas(self):
+        return len(self._usadas)
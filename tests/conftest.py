@@ -0,0 +1,46 @@
+import os
+import shutil
+
+import pytest
+
+from gerador_catalogo.cli import main
+from gerador_catalogo.configuracao import excel_path, img_dir, logo_path
+from gerador_catalogo.imagens import construir_indice_imagens, localizar_imagem
+from gerador_catalogo.planilha import COLUNA_CODIGO, ler_planilha
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+@pytest.fixture(scope="session")
+def amostra(tmp_path_factory):
+    """Pasta com a planilha de exemplo do repositório, o logo e só as imagens que ela usa.
+
+    Uma geração já rodou nela, então as derivadas das imagens e o snapshot da
+    planilha estão no cache e os testes não repetem esse trabalho.
+    """
+    pasta = tmp_path_factory.mktemp("amostra")
+    shutil.copy2(os.path.join(RAIZ, excel_path), pasta)
+    shutil.copy2(os.path.join(RAIZ, logo_path), pasta)
+    os.makedirs(pasta / img_dir)
+    df, _ = ler_planilha(os.path.join(RAIZ, excel_path), str(tmp_path_factory.mktemp("cache_planilha")))
+    indice = construir_indice_imagens(os.path.join(RAIZ, img_dir))
+    for codigo in df[COLUNA_CODIGO]:
+        caminho = localizar_imagem(indice, codigo)
+        if caminho is not None:
+            shutil.copy2(caminho, pasta / img_dir)
+    anterior = os.getcwd()
+    os.chdir(pasta)
+    try:
+        main(["-v", "categoria", "--workers", "1"])
+    finally:
+        os.chdir(anterior)
+    return pasta
+
+
+@pytest.fixture
+def pasta_catalogo(amostra, tmp_path, monkeypatch):
+    """Cópia da amostra só deste teste, já como diretório atual (os caches são relativos a ele)."""
+    pasta = tmp_path / "catalogo"
+    shutil.copytree(amostra, pasta)
+    monkeypatch.chdir(pasta)
+    return pasta
@@ -0,0 +1,67 @@
+import json
+
+from gerador_catalogo.busca import IndiceBusca, caminho_indice_busca, termos
+from gerador_catalogo.dados import Produto
+from gerador_catalogo.layout import Grade, agrupar_por_pagina, calcular_layout
+from gerador_catalogo.navegacao import calcular_navegacao
+
+# 2 cards por página (uma coluna, duas linhas)
+GRADE = Grade(1, 50, 700, 150, 100, 20, 300, 50)
+
+
+def _produto(codigo, descricao, categoria):
+    return Produto(codigo, descricao, categoria, 10.0, None, "R$ 10,00", "", float("nan"), 0)
+
+
+def _paginas(produtos):
+    grupos = {}
+    for produto in produtos:
+        grupos[produto.categoria] = grupos.get(produto.categoria, 0) + 1
+    layout = calcular_layout(list(grupos.items()), GRADE, pagina_inicial=2)
+    return agrupar_por_pagina(layout.posicoes, produtos)
+
+
+def test_termos_sem_acentos_repeticoes_nem_palavras_curtas():
+    assert termos("Câmara de AR 29 e câmara ARO 7") == ["camara", "29", "aro", "7"]
+
+
+def test_indice_leva_codigos_e_termos_as_paginas_do_layout(tmp_path):
+    produtos = [
+        _produto("01.0001", "PNEU ARO 29", "Pneus"), _produto("01.0002", "Câmara aro 29", "Pneus"),
+        _produto("01.0003", "PNEU ARO 26", "Pneus"), _produto("02.0001", "Selim gel", "Selins"),
+    ]
+    paginas = _paginas(produtos)
+    busca = IndiceBusca()
+    busca.adicionar(paginas, calcular_navegacao(paginas, 'C', 842))
+
+    assert busca.produtos["01.0003"] == {"descricao": "PNEU ARO 26", "categoria": "Pneus", "pagina": 3,
+                                         "destino": "produto-01.0003"}
+    assert busca.produtos["02.0001"]["pagina"] == 4
+    assert busca.termos["aro"] == ["01.0001", "01.0002", "01.0003"]
+    assert busca.termos["camara"] == ["01.0002"]
+    assert [(entrada["titulo"], entrada["nivel"], entrada["pagina"]) for entrada in busca.sumario] == [
+        ("Pneus", 0, 2), ("Pág. 2", 1, 2), ("Pág. 3", 1, 3), ("Selins", 0, 4), ("Pág. 4", 1, 4),
+    ]
+
+    caminho = caminho_indice_busca(str(tmp_path / "catalogo.pdf"))
+    assert caminho == str(tmp_path / "catalogo_busca.json")
+    busca.gravar(caminho, str(tmp_path / "catalogo.pdf"), 4)
+    with open(caminho, encoding="utf-8") as f:
+        dados = json.load(f)
+    assert (dados["pdf"], dados["paginas"]) == ("catalogo.pdf", 4)
+    assert list(dados["termos"]) == sorted(dados["termos"])
+    assert dados["produtos"] == busca.produtos
+
+
+def test_codigo_repetido_fica_na_primeira_pagina_e_arquivo_por_categoria():
+    busca = IndiceBusca()
+    for arquivo, produtos in (("catalogo/01_pneus.pdf", [_produto("01.0001", "PNEU", "Pneus")] * 3),
+                              ("catalogo/02_selins.pdf", [_produto("02.0001", "SELIM", "Selins")])):
+        paginas = _paginas(produtos)
+        busca.adicionar(paginas, calcular_navegacao(paginas, 'C', 842), arquivo)
+
+    assert busca.produtos["01.0001"]["pagina"] == 2
+    assert busca.produtos["01.0001"]["arquivo"] == "catalogo/01_pneus.pdf"
+    assert busca.produtos["02.0001"]["arquivo"] == "catalogo/02_selins.pdf"
+    assert busca.termos["pneu"] == ["01.0001"]
+    assert {entrada["arquivo"] for entrada in busca.sumario if entrada["titulo"] == "Selins"} == {"catalogo/02_selins.pdf"}
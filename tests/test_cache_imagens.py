@@ -0,0 +1,11 @@
+import re
+
+from gerador_catalogo.cli import main
+
+
+def test_variante_sozinha_usa_as_derivadas_de_todas_juntas(pasta_catalogo, capsys):
+    # A amostra já gerou o catálogo por categoria; o tema black tem o card mais estreito
+    main(["-v", "black", "--workers", "1"])
+    geradas, reaproveitadas = re.search(r"Imagens: (\d+) reduzida\(s\).*?(\d+) reaproveitada",
+                                        capsys.readouterr().out).groups()
+    assert (int(geradas), int(reaproveitadas) > 0) == (0, True)
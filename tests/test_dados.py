@@ -0,0 +1,55 @@
+import math
+import random
+from bisect import bisect_left
+
+import pandas as pd
+
+from gerador_catalogo.dados import FAIXAS_PRECO, calcular_precos
+
+
+def _brl(valor):
+    # A formatação que cada card fazia antes
+    if not valor or math.isnan(valor):
+        return ""
+    return f"R$ {valor:,.2f}".replace(",", "X").replace(".", ",").replace("X", ".")
+
+
+def _por_linha(antigo, promocao):
+    """O cálculo de antes, um produto de cada vez: textos, desconto (%) e faixa de preço."""
+    desconto = (1 - promocao / antigo) * 100 if antigo > 0 and promocao > 0 and promocao < antigo else math.nan
+    final = promocao if promocao > 0 else antigo
+    faixa = bisect_left(FAIXAS_PRECO, final) if final > 0 else -1
+    return _brl(antigo), _brl(promocao), desconto, faixa
+
+
+def test_precos_por_coluna_iguais_ao_calculo_por_linha():
+    aleatorio = random.Random(7)
+    especiais = [math.nan, 0.0, -5.0, 50.0, 100.0, 1000.0, 1234567.891]
+    antigos, promocoes = [], []
+    for _ in range(500):
+        antigo = aleatorio.choice(especiais) if aleatorio.random() < 0.2 else round(aleatorio.uniform(1, 3000), 2)
+        promocao = aleatorio.choice([
+            math.nan, 0.0, antigo, round(antigo * aleatorio.uniform(0.3, 1.2), 2), aleatorio.choice(especiais),
+        ])
+        antigos.append(antigo)
+        promocoes.append(promocao)
+    df = pd.DataFrame({"Preço Antigo": antigos, "Preço Promoção": promocoes}, index=range(1000, 1500))
+
+    precos = calcular_precos(df)
+
+    assert list(precos.index) == list(df.index)
+    esperado = [_por_linha(antigo, promocao) for antigo, promocao in zip(antigos, promocoes)]
+    assert list(precos["preco_antigo_txt"]) == [linha[0] for linha in esperado]
+    assert list(precos["preco_promocao_txt"]) == [linha[1] for linha in esperado]
+    assert list(precos["faixa_preco"]) == [linha[3] for linha in esperado]
+    for calculado, (_, _, desconto, _) in zip(precos["desconto"], esperado):
+        assert (math.isnan(calculado) and math.isnan(desconto)) or math.isclose(calculado, desconto)
+    assert precos["desconto"].notna().any() and precos["desconto"].isna().any()
+
+
+def test_precos_sem_as_colunas_ou_com_texto():
+    precos = calcular_precos(pd.DataFrame({"Preço Antigo": ["10", "abc", None]}))
+    assert list(precos["preco_antigo_txt"]) == ["R$ 10,00", "", ""]
+    assert list(precos["preco_promocao_txt"]) == ["", "", ""]
+    assert list(precos["faixa_preco"]) == [0, -1, -1]
+    assert precos["desconto"].isna().all()
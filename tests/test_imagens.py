@@ -0,0 +1,40 @@
+import os
+
+from gerador_catalogo.imagens import construir_indice_imagens, localizar_imagem, relatorio_imagens
+
+
+def _arquivos(pasta, nomes):
+    for nome in nomes:
+        (pasta / nome).write_bytes(b"")
+
+
+def test_indice_prefere_extensao_e_ignora_maiusculas(tmp_path):
+    _arquivos(tmp_path, ["01.0005.PNG", "01.0005.jpg", "AB-12.Webp", "leiame.txt", "02.0001.jpeg"])
+    os.makedirs(tmp_path / "sub.jpg")
+
+    indice = construir_indice_imagens(str(tmp_path))
+
+    assert {base: os.path.basename(caminho) for base, caminho in indice.items()} == {
+        "01.0005": "01.0005.jpg", "ab-12": "AB-12.Webp", "02.0001": "02.0001.jpeg",
+    }
+    assert construir_indice_imagens(str(tmp_path / "nao_existe")) == {}
+
+
+def test_localizar_imagem_pelas_variacoes_do_codigo(tmp_path):
+    _arquivos(tmp_path, ["010005.png", "02_0001.JPG", "ab-12.webp", "03.0007.jpg"])
+    indice = construir_indice_imagens(str(tmp_path))
+
+    def nome(codigo):
+        caminho = localizar_imagem(indice, codigo)
+        return caminho and os.path.basename(caminho)
+
+    assert nome("01.0005") == "010005.png"
+    assert nome("02.0001") == "02_0001.JPG"
+    assert nome(" AB-12 ") == "ab-12.webp"
+    assert nome("03.0007") == "03.0007.jpg"
+    assert nome("04.0001") is None
+    assert nome("") is None
+
+    orfas, faltantes = relatorio_imagens(indice, ["01.0005", "AB-12", "04.0001"], str(tmp_path))
+    assert [os.path.basename(caminho) for caminho in orfas] == ["02_0001.JPG", "03.0007.jpg"]
+    assert faltantes == ["04.0001"]
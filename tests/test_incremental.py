@@ -0,0 +1,59 @@
+import json
+import os
+import re
+
+from openpyxl import load_workbook
+from pypdf import PdfReader
+
+from gerador_catalogo.busca import caminho_indice_busca
+from gerador_catalogo.cli import main
+from gerador_catalogo.configuracao import VARIANTES, excel_path
+from gerador_catalogo.incremental import ConstrucaoIncremental
+
+PDF = VARIANTES["categoria"].pdf_path
+
+
+def _gerar(capsys):
+    main(["-v", "categoria", "--incremental", "--workers", "1"])
+    return capsys.readouterr().out
+
+
+def _paginas(saida):
+    desenhadas, reaproveitadas = re.search(r"Páginas: (\d+) desenhada\(s\), (\d+) reaproveitada", saida).groups()
+    return int(desenhadas), int(reaproveitadas)
+
+
+def test_incremental_redesenha_so_a_pagina_alterada(pasta_catalogo, capsys):
+    desenhadas, reaproveitadas = _paginas(_gerar(capsys))
+    total = len(PdfReader(PDF).pages)
+    assert (desenhadas, reaproveitadas) == (total, 0)
+
+    assert "Nada mudou desde a última geração" in _gerar(capsys)
+
+    planilha = load_workbook(excel_path)
+    aba = planilha.active
+    codigo = str(aba.cell(2, 1).value)
+    aba.cell(2, 2).value = "PRODUTO ALTERADO NO TESTE"
+    planilha.save(excel_path)
+
+    assert _paginas(_gerar(capsys)) == (1, total - 1)
+    with open(caminho_indice_busca(PDF), encoding="utf-8") as f:
+        pagina = json.load(f)["produtos"][codigo]["pagina"]
+    assert "PRODUTO ALTERADO NO TESTE" in PdfReader(PDF).pages[pagina].extract_text()
+
+
+def test_cache_de_paginas_separado_por_pasta_de_saida(tmp_path):
+    uma = ConstrucaoIncremental(str(tmp_path / "a" / PDF), "x", cache_dir=str(tmp_path / "cache"))
+    outra = ConstrucaoIncremental(str(tmp_path / "b" / PDF), "x", cache_dir=str(tmp_path / "cache"))
+    assert uma.cache_dir != outra.cache_dir
+
+
+def test_incremental_redesenha_tudo_com_outro_dpi(pasta_catalogo, capsys):
+    _gerar(capsys)
+    tamanho = os.path.getsize(PDF)
+    main(["-v", "categoria", "--incremental", "--workers", "1", "--dpi", "60", "--qualidade-jpeg", "20"])
+    saida = capsys.readouterr().out
+    assert "Nada mudou" not in saida
+    desenhadas, reaproveitadas = _paginas(saida)
+    assert (desenhadas, reaproveitadas) == (len(PdfReader(PDF).pages), 0)
+    assert os.path.getsize(PDF) < tamanho / 2
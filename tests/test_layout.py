@@ -0,0 +1,44 @@
+from gerador_catalogo.layout import Grade, agrupar_por_pagina, calcular_layout, linhas_por_pagina
+
+# 3 colunas; (700 - 100 - 50) / 150 -> 3 linhas abaixo da primeira, 12 cards por página
+GRADE = Grade(3, 50, 700, 150, 100, 20, 150, 50)
+
+
+def test_linhas_por_pagina():
+    assert linhas_por_pagina(GRADE) == 4
+    assert linhas_por_pagina(GRADE._replace(limite_inferior=700)) == 1
+
+
+def test_layout_por_categoria_abre_pagina_nova_por_grupo():
+    layout = calcular_layout([("Freios", 13), ("Pneus", 2), ("Selins", 12)], GRADE, pagina_inicial=2)
+
+    assert layout.paginas_grupos == {"Freios": 2, "Pneus": 4, "Selins": 5}
+    assert layout.paginas_por_grupo == {"Freios": 2, "Pneus": 1, "Selins": 1}
+    assert layout.ultima_pagina == 5
+    assert len(layout.posicoes) == 27
+    # O 13º card de Freios vai para o topo da página seguinte
+    decimo_terceiro = layout.posicoes[12]
+    assert (decimo_terceiro.pagina, decimo_terceiro.linha, decimo_terceiro.coluna) == (3, 0, 0)
+    ultimo_da_pagina = layout.posicoes[11]
+    assert (ultimo_da_pagina.pagina, ultimo_da_pagina.linha, ultimo_da_pagina.coluna) == (2, 3, 2)
+    assert (ultimo_da_pagina.x, ultimo_da_pagina.y) == (50 + 2 * (150 + 20), 700 - 3 * 150)
+
+
+def test_layout_alfabetico_segue_na_mesma_grade():
+    layout = calcular_layout([("A", 10), ("B", 5)], GRADE, nova_pagina_por_grupo=False)
+
+    assert layout.paginas_grupos == {"A": 1, "B": 1}
+    assert layout.ultima_pagina == 2
+    primeiro_de_b = layout.posicoes[10]
+    assert (primeiro_de_b.pagina, primeiro_de_b.linha, primeiro_de_b.coluna, primeiro_de_b.grupo) == (1, 3, 1, "B")
+
+
+def test_layout_vazio_e_agrupamento_por_pagina():
+    vazio = calcular_layout([], GRADE, pagina_inicial=2)
+    assert (vazio.posicoes, vazio.ultima_pagina) == ([], 2)
+
+    layout = calcular_layout([("Freios", 14)], GRADE)
+    paginas = agrupar_por_pagina(layout.posicoes, [f"p{i}" for i in range(14)])
+    assert [(pagina, grupo, [item for _, item in itens][:2]) for pagina, grupo, itens in paginas] == [
+        (1, "Freios", ["p0", "p1"]), (2, "Freios", ["p12", "p13"]),
+    ]
@@ -0,0 +1,87 @@
+import json
+import os
+import re
+
+import pytest
+from openpyxl import load_workbook
+from pypdf import PdfReader
+
+from gerador_catalogo.busca import caminho_indice_busca
+from gerador_catalogo.cli import main
+from gerador_catalogo.configuracao import VARIANTES, excel_path
+from gerador_catalogo.dados import Produto
+from gerador_catalogo.layout import Grade, agrupar_por_pagina, calcular_layout
+from gerador_catalogo.navegacao import calcular_navegacao, destinos_categorias
+
+PDF = VARIANTES["categoria"].pdf_path
+
+
+def _conferir_links_do_indice():
+    reader = PdfReader(PDF)
+    with open(caminho_indice_busca(PDF), encoding="utf-8") as f:
+        indice = json.load(f)
+    # A primeira página com um produto da categoria, pelo layout (e não pelos destinos que o teste confere)
+    primeiras = {}
+    for produto in indice["produtos"].values():
+        primeiras[produto["categoria"]] = min(produto["pagina"], primeiras.get(produto["categoria"], produto["pagina"]))
+    categorias = {entrada["destino"]: primeiras[entrada["titulo"]] for entrada in indice["sumario"] if entrada["nivel"] == 0}
+
+    links = [anotacao.get_object()["/Dest"] for anotacao in reader.pages[1]["/Annots"]]
+    assert sorted(links) == sorted(categorias)
+    destinos = reader.named_destinations
+    for nome in links:
+        assert reader.get_destination_page_number(destinos[nome]) == categorias[nome]
+    return categorias
+
+
+@pytest.mark.parametrize("opcoes", [[], ["--incremental"], ["--trechos", "5"]], ids=["normal", "incremental", "trechos"])
+def test_links_do_indice_levam_a_primeira_pagina_da_categoria(pasta_catalogo, opcoes):
+    main(["-v", "categoria", "--workers", "1"] + opcoes)
+    _conferir_links_do_indice()
+
+
+def test_categorias_com_o_mesmo_nome_normalizado_tem_destinos_proprios(pasta_catalogo):
+    planilha = load_workbook(excel_path)
+    aba = planilha.active
+    coluna = next(celula.column for celula in aba[1] if celula.value == "Categoria")
+    for linha in range(2, 12):
+        aba.cell(linha, coluna).value = "DIVERSOS"
+    planilha.save(excel_path)
+
+    main(["-v", "categoria", "--workers", "1"])
+    assert sorted(_conferir_links_do_indice()) == ["categoria-diversos", "categoria-diversos-2"]
+
+
+def test_indice_do_mestre_na_ordem_dos_arquivos_das_categorias(pasta_catalogo):
+    planilha = load_workbook(excel_path)
+    aba = planilha.active
+    coluna = next(celula.column for celula in aba[1] if celula.value == "Categoria")
+    aba.cell(2, coluna).value = "zz última"
+    planilha.save(excel_path)
+
+    main(["-v", "categoria", "--workers", "1", "--dividir"])
+    reader = PdfReader(PDF)
+    arquivos = [anotacao.get_object()["/A"]["/F"] for anotacao in reader.pages[1]["/Annots"]]
+    linhas = [linha for linha in reader.pages[1].extract_text().splitlines() if re.match(r"\d+\. ", linha)]
+    linhas.sort(key=lambda linha: int(linha.split(".")[0]))
+
+    assert len(arquivos) == len(linhas) >= 2
+    assert [int(os.path.basename(arquivo)[:2]) for arquivo in arquivos] == list(range(1, len(arquivos) + 1))
+    assert linhas[-1] == f"{len(linhas)}. ZZ ÚLTIMA"
+    assert arquivos[-1].endswith("_zz_ultima.pdf")
+    pasta = os.path.dirname(PDF)
+    assert all(os.path.exists(os.path.join(pasta, arquivo)) for arquivo in arquivos)
+
+
+def test_destinos_sem_repetir_nomes():
+    assert destinos_categorias(["Câmaras", "Freios", "Camaras", "CAMARAS"]) == {
+        "Câmaras": "categoria-camaras", "Freios": "categoria-freios",
+        "Camaras": "categoria-camaras-2", "CAMARAS": "categoria-camaras-3",
+    }
+    produtos = [Produto(f"0{i}", descricao, "X", 1.0, None, "", "", None, 0)
+                for i, descricao in enumerate(["Aro", "Zeta", "aro", "Ácido"])]
+    layout = calcular_layout([("X", len(produtos))], Grade(1, 0, 700, 10, 10, 0, 20, 0), nova_pagina_por_grupo=False)
+    navegacao = calcular_navegacao(agrupar_por_pagina(layout.posicoes, produtos), 'A', 842)
+    assert [(entrada.titulo, entrada.destino) for entrada in navegacao.sumario if entrada.nivel == 0] == [
+        ("A", "letra-A"), ("Z", "letra-Z"), ("A", "letra-A-2"),
+    ]
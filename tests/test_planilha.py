@@ -0,0 +1,51 @@
+import os
+
+import pandas as pd
+
+from gerador_catalogo.planilha import COLUNA_CODIGO, ler_planilha
+
+
+def _planilha(caminho, *codigos):
+    pd.DataFrame({COLUNA_CODIGO: codigos, "Descrição": "PNEU", "Categoria": "Pneus",
+                  "Preço Antigo": 10.5, "Preço Promoção": None}).to_excel(caminho, index=False)
+    return str(caminho)
+
+
+def _snapshots(cache):
+    return sorted(nome for nome in os.listdir(cache) if nome.endswith(".pkl"))
+
+
+def test_snapshot_reaproveitado_ate_a_planilha_mudar(tmp_path):
+    cache = str(tmp_path / "cache")
+    planilha = _planilha(tmp_path / "produtos.xlsx", "01.0005")
+
+    df, reaproveitado = ler_planilha(planilha, cache)
+    assert not reaproveitado
+    assert list(df[COLUNA_CODIGO]) == ["01.0005"]
+    assert ler_planilha(planilha, cache)[1]
+
+    # Salva de novo sem mudar nada: mtime novo, mesmo conteúdo, mesmo snapshot
+    os.utime(planilha, ns=(os.stat(planilha).st_atime_ns, os.stat(planilha).st_mtime_ns + 10 ** 9))
+    assert ler_planilha(planilha, cache)[1]
+    antigos = _snapshots(cache)
+
+    _planilha(tmp_path / "produtos.xlsx", "01.0005", "02.0001")
+    df, reaproveitado = ler_planilha(planilha, cache)
+    assert not reaproveitado
+    assert list(df[COLUNA_CODIGO]) == ["01.0005", "02.0001"]
+    # O snapshot da versão anterior da planilha sai do cache
+    assert not set(antigos) & set(_snapshots(cache))
+
+
+def test_snapshot_corrompido_e_lido_de_novo(tmp_path):
+    cache = str(tmp_path / "cache")
+    planilha = _planilha(tmp_path / "produtos.xlsx", "01.0005")
+    ler_planilha(planilha, cache)
+    for nome in _snapshots(cache):
+        with open(os.path.join(cache, nome), "wb") as f:
+            f.write(b"lixo")
+
+    df, reaproveitado = ler_planilha(planilha, cache)
+    assert not reaproveitado
+    assert list(df[COLUNA_CODIGO]) == ["01.0005"]
+
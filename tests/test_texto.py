@@ -0,0 +1,91 @@
+import json
+from io import BytesIO
+
+from pypdf import PdfReader
+from reportlab.lib.enums import TA_CENTER
+from reportlab.lib.pagesizes import A4
+from reportlab.lib.styles import ParagraphStyle
+from reportlab.pdfgen import canvas
+from reportlab.platypus import Paragraph
+
+from gerador_catalogo.texto import CacheParagrafos
+
+ESTILO = ParagraphStyle("descricao", fontName="Helvetica", fontSize=8, leading=9.5, alignment=TA_CENTER)
+TEXTO = "PNEU ARO 29 PRETO COM VÁLVULA PRESTA E CÂMARA REFORÇADA PARA TRILHA"
+
+
+def test_chave_separa_texto_estilo_e_largura():
+    cache = CacheParagrafos()
+    cache.quebrar(TEXTO, ESTILO, 120)
+    cache.quebrar(TEXTO, ESTILO, 120.00001)
+    assert (cache.acertos, cache.faltas) == (1, 1)
+
+    cache.quebrar(TEXTO, ESTILO, 90)
+    cache.quebrar(TEXTO, ESTILO.clone("maior", fontSize=9), 120)
+    cache.quebrar(TEXTO, ESTILO.clone("negrito", fontName="Helvetica-Bold"), 120)
+    cache.quebrar(TEXTO.lower(), ESTILO, 120)
+    assert (cache.acertos, cache.faltas) == (1, 5)
+
+
+def test_lru_descarta_o_usado_ha_mais_tempo():
+    cache = CacheParagrafos(maximo=2)
+    for texto in ("A", "B", "A", "C"):
+        cache.quebrar(texto, ESTILO, 100)
+    cache.quebrar("A", ESTILO, 100)
+    cache.quebrar("B", ESTILO, 100)
+    assert (cache.acertos, cache.faltas) == (2, 4)
+
+
+def test_marcacao_fica_com_o_paragraph():
+    assert CacheParagrafos().quebrar("PNEU <b>ARO 29</b>", ESTILO, 100) is None
+
+
+def _posicoes(desenhar):
+    saida = BytesIO()
+    c = canvas.Canvas(saida, pagesize=A4)
+    desenhar(c)
+    c.save()
+    posicoes = []
+
+    def visitante(texto, matriz, tm, *args):
+        if texto.strip():
+            posicoes.append((texto.strip(), round(matriz[4] + tm[4], 2), round(matriz[5] + tm[5], 2)))
+
+    PdfReader(saida).pages[0].extract_text(visitor_text=visitante)
+    return posicoes
+
+
+def test_linhas_repetidas_nas_posicoes_do_paragraph():
+    def com_paragraph(c):
+        p = Paragraph(TEXTO, ESTILO)
+        p.wrapOn(c, 120, ESTILO.leading)
+        p.drawOn(c, 100, 500)
+
+    cache = CacheParagrafos()
+    esperado = _posicoes(com_paragraph)
+    assert len(esperado) > 1
+    assert _posicoes(lambda c: cache.desenhar(c, TEXTO, ESTILO, 100, 500, 120)) == esperado
+    assert _posicoes(lambda c: cache.desenhar(c, TEXTO, ESTILO, 100, 500, 120)) == esperado
+    assert cache.acertos == 1
+
+
+def test_quebras_gravadas_valem_so_para_a_mesma_versao_do_reportlab(tmp_path):
+    caminho = str(tmp_path / "paragrafos.json")
+    cache = CacheParagrafos()
+    cache.quebrar(TEXTO, ESTILO, 120)
+    cache.salvar(caminho)
+
+    outro = CacheParagrafos()
+    outro.carregar(caminho)
+    outro.quebrar(TEXTO, ESTILO, 120)
+    assert (outro.acertos, outro.faltas) == (1, 0)
+
+    with open(caminho, encoding="utf-8") as f:
+        dados = json.load(f)
+    dados["reportlab"] = "0.0"
+    with open(caminho, "w", encoding="utf-8") as f:
+        json.dump(dados, f)
+    antigo = CacheParagrafos()
+    antigo.carregar(caminho)
+    antigo.quebrar(TEXTO, ESTILO, 120)
+    assert (antigo.acertos, antigo.faltas) == (0, 1)
@@ -0,0 +1,69 @@
+import pytest
+from pypdf import PdfReader
+from reportlab.lib.pagesizes import A4
+from reportlab.pdfgen import canvas
+
+from gerador_catalogo.cli import main
+from gerador_catalogo.configuracao import VARIANTES
+from gerador_catalogo import trechos
+from gerador_catalogo.navegacao import Destino, EntradaSumario, Navegacao
+from gerador_catalogo.trechos import dividir_paginas, juntar_pdfs
+
+
+def _trecho(caminho, textos):
+    c = canvas.Canvas(str(caminho), pagesize=A4)
+    for texto in textos:
+        c.drawString(100, 700, texto)
+        c.showPage()
+    c.save()
+    return str(caminho)
+
+
+@pytest.mark.parametrize("copia_direta", [True, False], ids=["copia_direta", "pdfwriter"])
+def test_juntar_dois_trechos_mantem_paginas_e_destinos(tmp_path, monkeypatch, copia_direta):
+    monkeypatch.setattr(trechos, "COPIA_DIRETA", copia_direta)
+    caminhos = [_trecho(tmp_path / "a.pdf", ["capa"]), _trecho(tmp_path / "b.pdf", ["pág. 1", "pág. 2"])]
+    altura = A4[1]
+    navegacao = Navegacao(
+        {1: [Destino("pagina-1", 1, altura), Destino("categoria-freios", 1, altura)],
+         2: [Destino("pagina-2", 2, altura), Destino("produto-01.0005", 2, 500)]},
+        [EntradaSumario("Freios", "categoria-freios", 0, True),
+         EntradaSumario("Pág. 1", "pagina-1", 1), EntradaSumario("Pág. 2", "pagina-2", 1)],
+    )
+    destino = tmp_path / "catalogo.pdf"
+
+    juntar_pdfs(caminhos, str(destino), navegacao)
+
+    reader = PdfReader(str(destino))
+    assert len(reader.pages) == 3
+    destinos = reader.named_destinations
+    assert sorted(destinos) == ["categoria-freios", "pagina-1", "pagina-2", "produto-01.0005"]
+    paginas = {nome: reader.get_destination_page_number(d) for nome, d in destinos.items()}
+    assert paginas == {"categoria-freios": 1, "pagina-1": 1, "pagina-2": 2, "produto-01.0005": 2}
+    categoria, paginas_categoria = reader.outline
+    assert categoria.title == "Freios"
+    assert [item.title for item in paginas_categoria] == ["Pág. 1", "Pág. 2"]
+    assert "pág. 2" in reader.pages[2].extract_text()
+
+
+def test_dividir_paginas_por_categoria_e_por_tamanho():
+    paginas = [(2, "Freios", []), (3, "Freios", []), (4, "Freios", []), (5, "Pneus", [])]
+    por_categoria = dividir_paginas(paginas)
+    assert [[pagina for pagina, _, _ in trecho] for trecho in por_categoria] == [[2, 3, 4], [5]]
+    por_tamanho = dividir_paginas(paginas, 2)
+    assert [[pagina for pagina, _, _ in trecho] for trecho in por_tamanho] == [[2, 3], [4, 5]]
+
+
+def _navegacao(caminho):
+    reader = PdfReader(caminho)
+    destinos = {nome: reader.get_destination_page_number(d) for nome, d in reader.named_destinations.items()}
+    return len(reader.pages), destinos, [item.title for item in reader.outline if not isinstance(item, list)]
+
+
+def test_catalogo_em_trechos_igual_ao_normal(pasta_catalogo):
+    main(["-v", "categoria", "--workers", "1", "--saida", "normal"])
+    main(["-v", "categoria", "--workers", "1", "--saida", "trechos", "--trechos", "5"])
+    pdf = VARIANTES["categoria"].pdf_path
+    paginas, destinos, sumario = _navegacao(f"trechos/{pdf}")
+    assert paginas > 5
+    assert (paginas, destinos, sumario) == _navegacao(f"normal/{pdf}")